@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+bluesky_session.py - One Bluesky login shared by every module and process
+
+``com.atproto.server.createSession`` is slow and heavily rate limited,
+yet every post and every poll used to log in again. ``BlueskySession``
+logs in once and keeps the tokens alive:
+
+- The session (access and refresh JWTs, DID) is saved to
+  ``.bluesky_session`` (mode 0600), so restarts and the other daemons
+  reuse it instead of logging in.
+- Shortly before the access token expires it is renewed with
+  ``com.atproto.server.refreshSession``; only when the refresh token is
+  gone or rejected does it log in again.
+- Renewal happens under a thread lock and an ``flock`` on the session
+  file: concurrent callers - threads, async tasks via ``aget()``, other
+  processes - wait for one renewal and then share its result.
+- ``xrpc()`` makes an authenticated call, renewing and retrying once if
+  the server says the token expired.
+
+    session = shared_session()
+    if session:
+        session.post("Hello from phi")
+"""
+
+import asyncio
+import base64
+import fcntl
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+import http_clients
+from clock import get_clock
+
+logger = logging.getLogger(__name__)
+
+SERVICE = "https://bsky.social"
+SESSION_FILE = Path(__file__).parent / ".bluesky_session"
+REFRESH_MARGIN = 300  # renew access tokens this many seconds before they expire
+
+
+class BlueskyAuthError(Exception):
+    """Neither refreshing nor logging in produced a session."""
+
+
+def token_expiry(jwt: str) -> float:
+    """The ``exp`` claim of a JWT (epoch seconds), or 0 if unreadable."""
+    try:
+        payload = jwt.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload)).get("exp", 0))
+    except (IndexError, ValueError, TypeError):
+        return 0.0
+
+
+class BlueskySession:
+    """A persisted, self-renewing Bluesky session for one account."""
+
+    def __init__(self, handle: str, password: str, path: Optional[Path] = SESSION_FILE,
+                 service: str = SERVICE):
+        self.handle = handle
+        self.password = password
+        self.path = Path(path) if path else None
+        self.service = service.rstrip("/")
+        self.session: Optional[Dict] = None
+        self.logins = 0
+        self.refreshes = 0
+        self._rejected: Optional[str] = None  # access token the server turned down
+        self._lock = threading.Lock()
+
+    # ─── Tokens ────────────────────────────────────────────────────────────
+
+    def _fresh(self, session: Optional[Dict]) -> bool:
+        if not session or session.get("handle_key") != self.handle:
+            return False
+        if session.get("accessJwt") == self._rejected:
+            return False
+        return token_expiry(session.get("accessJwt", "")) - get_clock().time() > REFRESH_MARGIN
+
+    def get(self) -> Dict:
+        """A session whose access token is good for at least a few minutes."""
+        if self._fresh(self.session):
+            return self.session
+        with self._lock:
+            if self._fresh(self.session):
+                return self.session
+            with self._file_lock():
+                # Another process may have renewed it while we waited
+                stored = self._load()
+                if self._fresh(stored):
+                    self.session = stored
+                    return stored
+                self.session = self._renew(stored or self.session)
+                self._save(self.session)
+                return self.session
+
+    async def aget(self) -> Dict:
+        """``get()`` for async tasks: renewal runs off the event loop."""
+        if self._fresh(self.session):
+            return self.session
+        return await asyncio.to_thread(self.get)
+
+    def invalidate(self):
+        """Forget the access token (the server rejected it); keep the refresh token."""
+        with self._lock:
+            if self.session:
+                self._rejected = self.session.get("accessJwt")
+
+    def _renew(self, session: Optional[Dict]) -> Dict:
+        refresh = (session or {}).get("refreshJwt")
+        if refresh and token_expiry(refresh) > get_clock().time():
+            response = http_clients.post(f"{self.service}/xrpc/com.atproto.server.refreshSession",
+                                         headers={"Authorization": f"Bearer {refresh}"})
+            if response.ok:
+                self.refreshes += 1
+                return self._stamp(response.json())
+            logger.info(f"Bluesky refreshSession failed ({response.status_code}), logging in again")
+        response = http_clients.post(f"{self.service}/xrpc/com.atproto.server.createSession",
+                                     json={"identifier": self.handle, "password": self.password})
+        if not response.ok:
+            raise BlueskyAuthError(f"Bluesky login failed: {response.status_code} {response.text[:200]}")
+        self.logins += 1
+        return self._stamp(response.json())
+
+    def _stamp(self, session: Dict) -> Dict:
+        # The account the tokens belong to, so a changed handle logs in anew
+        session["handle_key"] = self.handle
+        return session
+
+    # ─── Persistence ───────────────────────────────────────────────────────
+
+    def _file_lock(self):
+        if not self.path:
+            return _NoLock()
+        return _FileLock(self.path.with_name(self.path.name + ".lock"))
+
+    def _load(self) -> Optional[Dict]:
+        if not self.path:
+            return None
+        try:
+            session = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return None
+        return session if session.get("handle_key") == self.handle else None
+
+    def _save(self, session: Dict):
+        if not self.path:
+            return
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump(session, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save Bluesky session to {self.path}: {e}")
+
+    # ─── Calls ─────────────────────────────────────────────────────────────
+
+    def xrpc(self, method: str, nsid: str, headers: Optional[Dict] = None, **kwargs):
+        """An authenticated XRPC call; renews and retries once on an expired token."""
+        for attempt in range(2):
+            auth = {"Authorization": f"Bearer {self.get()['accessJwt']}"}
+            response = http_clients.request(method, f"{self.service}/xrpc/{nsid}",
+                                            headers={**(headers or {}), **auth}, **kwargs)
+            if attempt or not self._expired(response):
+                return response
+            self.invalidate()
+        return response
+
+    @staticmethod
+    def _expired(response) -> bool:
+        if response.status_code == 401:
+            return True
+        if response.status_code != 400:
+            return False
+        try:
+            return response.json().get("error") == "ExpiredToken"
+        except ValueError:
+            return False
+
+    def post(self, text: str, reply: Optional[Dict] = None):
+        """Create an ``app.bsky.feed.post`` record; returns the response."""
+        record = {
+            "$type": "app.bsky.feed.post",
+            "text": text[:300],
+            "createdAt": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+        }
+        if reply:
+            record["reply"] = reply
+        return self.xrpc("POST", "com.atproto.repo.createRecord",
+                         json={"repo": self.get()["did"], "collection": "app.bsky.feed.post", "record": record})
+
+
+class _FileLock:
+    """Exclusive ``flock`` on a side file, so processes renew one at a time."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.fd: Optional[int] = None
+
+    def __enter__(self):
+        try:
+            self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        except OSError as e:
+            logger.warning(f"Bluesky session lock unavailable ({e}); renewing without it")
+        return self
+
+    def __exit__(self, *exc):
+        if self.fd is not None:
+            os.close(self.fd)  # releases the lock
+            self.fd = None
+
+
+class _NoLock:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_shared: Dict[str, BlueskySession] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_session(handle: Optional[str] = None, password: Optional[str] = None) -> Optional[BlueskySession]:
+    """
+    The process-wide session for ``handle`` (``BLUESKY_HANDLE`` and
+    ``BLUESKY_APP_PASSWORD`` by default), or None without credentials.
+    """
+    handle = handle or os.environ.get("BLUESKY_HANDLE")
+    password = password or os.environ.get("BLUESKY_APP_PASSWORD")
+    if not handle or not password:
+        return None
+    with _shared_lock:
+        session = _shared.get(handle)
+        if session is None or session.password != password:
+            session = _shared[handle] = BlueskySession(handle, password)
+        return session
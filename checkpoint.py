@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+checkpoint.py - Compact, atomic snapshots of daemon state
+
+A checkpoint is a short header followed by a MessagePack body:
+
+    b"PHCK" | version (1 byte) | crc32 of body (4 bytes) | body
+
+The ``msgpack`` package is used when installed; otherwise a small
+built-in encoder writes the same wire format for the types daemon state
+uses (None, bool, int, float, str, bytes, list, dict), so checkpoints
+move freely between hosts with and without it.
+
+Writes go to a temporary file that is fsynced and renamed over the old
+checkpoint, so a crash mid-write leaves the previous checkpoint intact.
+A truncated or corrupted file fails its checksum and is ignored.
+"""
+
+import logging
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
+MAGIC = b"PHCK"
+VERSION = 1
+HEADER = struct.Struct(">4sBI")
+
+
+# ─── Minimal MessagePack ─────────────────────────────────────────────────────
+
+def _pack(obj: Any, out: bytearray):
+    if obj is None:
+        out.append(0xC0)
+    elif obj is True:
+        out.append(0xC3)
+    elif obj is False:
+        out.append(0xC2)
+    elif isinstance(obj, int):
+        if 0 <= obj < 0x80:
+            out.append(obj)
+        elif -32 <= obj < 0:
+            out.append(obj & 0xFF)
+        elif 0 <= obj < 2 ** 64:
+            out += b"\xcf" + struct.pack(">Q", obj)
+        elif -2 ** 63 <= obj < 0:
+            out += b"\xd3" + struct.pack(">q", obj)
+        else:
+            raise OverflowError(f"integer out of range: {obj}")
+    elif isinstance(obj, float):
+        out += b"\xcb" + struct.pack(">d", obj)
+    elif isinstance(obj, str):
+        data = obj.encode("utf-8")
+        n = len(data)
+        if n < 32:
+            out.append(0xA0 | n)
+        elif n < 2 ** 8:
+            out += b"\xd9" + struct.pack(">B", n)
+        elif n < 2 ** 16:
+            out += b"\xda" + struct.pack(">H", n)
+        else:
+            out += b"\xdb" + struct.pack(">I", n)
+        out += data
+    elif isinstance(obj, (bytes, bytearray)):
+        n = len(obj)
+        if n < 2 ** 8:
+            out += b"\xc4" + struct.pack(">B", n)
+        elif n < 2 ** 16:
+            out += b"\xc5" + struct.pack(">H", n)
+        else:
+            out += b"\xc6" + struct.pack(">I", n)
+        out += obj
+    elif isinstance(obj, (list, tuple)):
+        n = len(obj)
+        if n < 16:
+            out.append(0x90 | n)
+        elif n < 2 ** 16:
+            out += b"\xdc" + struct.pack(">H", n)
+        else:
+            out += b"\xdd" + struct.pack(">I", n)
+        for item in obj:
+            _pack(item, out)
+    elif isinstance(obj, dict):
+        n = len(obj)
+        if n < 16:
+            out.append(0x80 | n)
+        elif n < 2 ** 16:
+            out += b"\xde" + struct.pack(">H", n)
+        else:
+            out += b"\xdf" + struct.pack(">I", n)
+        for key, value in obj.items():
+            _pack(key, out)
+            _pack(value, out)
+    else:
+        raise TypeError(f"cannot checkpoint {type(obj).__name__}")
+
+
+_FIXED = {
+    0xCC: ">B", 0xCD: ">H", 0xCE: ">I", 0xCF: ">Q",
+    0xD0: ">b", 0xD1: ">h", 0xD2: ">i", 0xD3: ">q",
+    0xCA: ">f", 0xCB: ">d",
+}
+_LENGTH = {0xC4: ">B", 0xC5: ">H", 0xC6: ">I", 0xD9: ">B", 0xDA: ">H", 0xDB: ">I",
+           0xDC: ">H", 0xDD: ">I", 0xDE: ">H", 0xDF: ">I"}
+
+
+def _unpack(data: bytes, pos: int):
+    tag = data[pos]
+    pos += 1
+    if tag < 0x80:
+        return tag, pos
+    if tag >= 0xE0:
+        return tag - 0x100, pos
+    if 0x80 <= tag <= 0x8F:
+        return _unpack_map(data, pos, tag & 0x0F)
+    if 0x90 <= tag <= 0x9F:
+        return _unpack_array(data, pos, tag & 0x0F)
+    if 0xA0 <= tag <= 0xBF:
+        n = tag & 0x1F
+        return data[pos:pos + n].decode("utf-8"), pos + n
+    if tag == 0xC0:
+        return None, pos
+    if tag == 0xC2:
+        return False, pos
+    if tag == 0xC3:
+        return True, pos
+    if tag in _FIXED:
+        fmt = _FIXED[tag]
+        return struct.unpack_from(fmt, data, pos)[0], pos + struct.calcsize(fmt)
+    if tag in _LENGTH:
+        fmt = _LENGTH[tag]
+        n = struct.unpack_from(fmt, data, pos)[0]
+        pos += struct.calcsize(fmt)
+        if tag in (0xC4, 0xC5, 0xC6):
+            return bytes(data[pos:pos + n]), pos + n
+        if tag in (0xD9, 0xDA, 0xDB):
+            return data[pos:pos + n].decode("utf-8"), pos + n
+        if tag in (0xDC, 0xDD):
+            return _unpack_array(data, pos, n)
+        return _unpack_map(data, pos, n)
+    raise ValueError(f"unsupported msgpack tag 0x{tag:02x}")
+
+
+def _unpack_array(data: bytes, pos: int, n: int):
+    items = []
+    for _ in range(n):
+        item, pos = _unpack(data, pos)
+        items.append(item)
+    return items, pos
+
+
+def _unpack_map(data: bytes, pos: int, n: int):
+    result = {}
+    for _ in range(n):
+        key, pos = _unpack(data, pos)
+        value, pos = _unpack(data, pos)
+        result[key] = value
+    return result, pos
+
+
+def packb(obj: Any) -> bytes:
+    if HAS_MSGPACK:
+        return msgpack.packb(obj, use_bin_type=True)
+    out = bytearray()
+    _pack(obj, out)
+    return bytes(out)
+
+
+def unpackb(data: bytes) -> Any:
+    if HAS_MSGPACK:
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+    obj, pos = _unpack(data, 0)
+    if pos != len(data):
+        raise ValueError("trailing bytes after checkpoint body")
+    return obj
+
+
+# ─── Files ───────────────────────────────────────────────────────────────────
+
+def save(path: str, state: Dict) -> int:
+    """Atomically replace the checkpoint at ``path``. Returns bytes written."""
+    body = packb(state)
+    data = HEADER.pack(MAGIC, VERSION, zlib.crc32(body)) + body
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.write(fd, data)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+    return len(data)
+
+
+def load(path: str) -> Optional[Dict]:
+    """The checkpoint at ``path``, or None if missing or damaged."""
+    try:
+        data = Path(path).read_bytes()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.warning(f"Cannot read checkpoint {path}: {e}")
+        return None
+    if len(data) < HEADER.size:
+        logger.warning(f"Checkpoint {path} is truncated, ignoring it")
+        return None
+    magic, version, crc = HEADER.unpack_from(data)
+    body = data[HEADER.size:]
+    if magic != MAGIC or version != VERSION or zlib.crc32(body) != crc:
+        logger.warning(f"Checkpoint {path} is damaged or from another version, ignoring it")
+        return None
+    try:
+        return unpackb(body)
+    except (ValueError, IndexError, struct.error, UnicodeDecodeError) as e:
+        logger.warning(f"Checkpoint {path} could not be decoded: {e}")
+        return None
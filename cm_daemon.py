@@ -6,13 +6,15 @@ Posts to Twitter, Discord, and Bluesky
 
 import tweepy
 import os
-import time
 import random
 import json
-import requests
 from datetime import datetime
 from pathlib import Path
 
+import http_clients
+from bluesky_session import shared_session
+from control import ControlServer
+
 def load_env():
     env_path = Path(__file__).parent / '.env'
     if env_path.exists():
@@ -23,13 +25,8 @@ def load_env():
 
 load_env()
 
-# Twitter client
-client = tweepy.Client(
-    consumer_key=os.environ.get('TWITTER_API_KEY'),
-    consumer_secret=os.environ.get('TWITTER_API_SECRET'),
-    access_token=os.environ.get('TWITTER_ACCESS_TOKEN'),
-    access_token_secret=os.environ.get('TWITTER_ACCESS_SECRET')
-)
+# Twitter client (shared and pooled, see http_clients.py)
+client = http_clients.twitter_client()
 
 # Discord webhook
 DISCORD_WEBHOOK_URL = os.environ.get('DISCORD_WEBHOOK_URL')
@@ -56,6 +53,16 @@ TWEETS = [
     "💭 Code is data. Data is code. Grammar is implementation. The map IS the territory. https://github.com/eurisko-info-lab/phi",
 ]
 
+def reload_env():
+    """Re-read .env and rebind the settings derived from it."""
+    global client, DISCORD_WEBHOOK_URL, BLUESKY_HANDLE, BLUESKY_APP_PASSWORD
+    load_env()
+    client = http_clients.twitter_client()
+    DISCORD_WEBHOOK_URL = os.environ.get('DISCORD_WEBHOOK_URL')
+    BLUESKY_HANDLE = os.environ.get('BLUESKY_HANDLE')
+    BLUESKY_APP_PASSWORD = os.environ.get('BLUESKY_APP_PASSWORD')
+    print(f"[{datetime.now()}] 🔄 Reloaded .env")
+
 # Posting intervals (in seconds)
 POST_INTERVAL = 3 * 3600  # 3 hours between posts (avoid rate limits)
 RATE_LIMIT_BACKOFF = 2 * 3600  # 2 hours if rate limited
@@ -86,7 +93,7 @@ def post_discord(message: str) -> bool:
             "avatar_url": "https://raw.githubusercontent.com/eurisko-info-lab/phi/main/docs/phi-logo.png"
         }
         
-        response = requests.post(
+        response = http_clients.post(
             DISCORD_WEBHOOK_URL,
             json=payload,
             headers={"Content-Type": "application/json"}
@@ -106,68 +113,20 @@ def post_discord(message: str) -> bool:
 # Bluesky Posting  
 # ═══════════════════════════════════════════════════════════════════════════
 
-_bluesky_session = None
-
-def bluesky_login() -> dict | None:
-    """Login to Bluesky and return session."""
-    global _bluesky_session
-    
-    if not BLUESKY_HANDLE or not BLUESKY_APP_PASSWORD:
-        return None
-    
-    try:
-        response = requests.post(
-            "https://bsky.social/xrpc/com.atproto.server.createSession",
-            json={"identifier": BLUESKY_HANDLE, "password": BLUESKY_APP_PASSWORD}
-        )
-        if response.status_code == 200:
-            _bluesky_session = response.json()
-            return _bluesky_session
-        else:
-            print(f"[{datetime.now()}] ⚠️ Bluesky login failed: {response.status_code}")
-            return None
-    except Exception as e:
-        print(f"[{datetime.now()}] ⚠️ Bluesky login error: {e}")
-        return None
-
 def post_bluesky(message: str) -> bool:
     """Post to Bluesky. Returns True on success."""
-    global _bluesky_session
-    
-    if not _bluesky_session:
-        _bluesky_session = bluesky_login()
-    
-    if not _bluesky_session:
+    # Logged in once and refreshed before expiry (see bluesky_session.py)
+    session = shared_session(BLUESKY_HANDLE, BLUESKY_APP_PASSWORD)
+    if not session:
         return False
     
     try:
-        # Create the post record
-        post = {
-            "$type": "app.bsky.feed.post",
-            "text": message[:300],  # Bluesky limit
-            "createdAt": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.000Z")
-        }
-        
-        response = requests.post(
-            "https://bsky.social/xrpc/com.atproto.repo.createRecord",
-            headers={"Authorization": f"Bearer {_bluesky_session['accessJwt']}"},
-            json={
-                "repo": _bluesky_session["did"],
-                "collection": "app.bsky.feed.post",
-                "record": post
-            }
-        )
+        response = session.post(message)
         
         if response.status_code == 200:
             uri = response.json().get("uri", "")
             print(f"[{datetime.now()}] 🦋 Bluesky: Posted! {uri}")
             return True
-        elif response.status_code == 401:
-            # Token expired, re-login
-            _bluesky_session = bluesky_login()
-            if _bluesky_session:
-                return post_bluesky(message)  # Retry once
-            return False
         else:
             print(f"[{datetime.now()}] ⚠️ Bluesky error: {response.status_code}")
             return False
@@ -250,13 +209,20 @@ def main():
     print(f"[{datetime.now()}] 🐕 Φ CM Daemon started")
     print(f"[{datetime.now()}] 📢 Platforms: {', '.join(platforms)}")
     print(f"[{datetime.now()}] ⏰ Posting every {POST_INTERVAL // 3600} hours")
-    print(f"[{datetime.now()}] Touch 'kill.switch' to stop.")
+    print(f"[{datetime.now()}] Touch 'kill.switch' or send 'stop' to .cm_daemon.sock to stop.")
     
-    while True:
-        keep_going, wait_time = post_all()
-        if not keep_going:
-            break
-        time.sleep(wait_time)
+    control = ControlServer(Path(__file__).parent / '.cm_daemon.sock',
+                            kill_switch=Path(__file__).parent / 'kill.switch',
+                            on_reload=reload_env)
+    control.start()
+    try:
+        while not control.wait_while_paused():
+            keep_going, wait_time = post_all()
+            if not keep_going or control.wait(wait_time):
+                break
+    finally:
+        control.close()
+    print(f"[{datetime.now()}] CM daemon stopped.")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+control.py - Instant control of running daemons over a Unix socket
+
+Every daemon listens on a Unix-domain socket for one-line commands:
+
+    stop     Halt the daemon
+    pause    Stop doing work (the process stays up)
+    resume   Carry on after a pause
+    reload   Re-read configuration
+    status   Dump the daemon's current status as JSON
+
+Each reply is one JSON line. Commands wake sleeping loops, so they take
+effect within milliseconds instead of after the current sleep ends.
+Creating ``kill.switch`` still works: daemons that wait through
+``ControlServer.wait`` treat it exactly like ``stop``.
+
+Usage:
+  python3 control.py phi_daemon.sock status
+  python3 control.py .mention_responder.sock stop
+"""
+
+import errno
+import json
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+COMMANDS = ("stop", "pause", "resume", "reload", "status")
+KILL_SWITCH_POLL = 0.5
+
+
+def owned_elsewhere(socket_path: Path) -> bool:
+    """True if a live server answers on ``socket_path``; removes a stale one."""
+    if not socket_path.exists():
+        return False
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        probe.settimeout(1.0)
+        try:
+            probe.connect(str(socket_path))
+        except OSError as e:
+            if e.errno != errno.ECONNREFUSED:
+                raise
+        else:
+            return True
+    socket_path.unlink()  # stale socket from a crashed run
+    return False
+
+
+def bind_private(socket_path: Path, backlog: int) -> socket.socket:
+    """Listen on ``socket_path``, owner-only from the moment it exists."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    umask = os.umask(0o177)
+    try:
+        sock.bind(str(socket_path))
+    except OSError:
+        sock.close()
+        raise
+    finally:
+        os.umask(umask)
+    sock.listen(backlog)
+    return sock
+
+
+class ControlServer:
+    """
+    Serve control commands on a Unix socket from a background thread.
+
+    Handlers are optional callables; the server itself tracks the stop and
+    pause state so plain ``while``/``sleep`` loops can use it directly:
+
+        while not control.should_stop():
+            control.wait_while_paused()
+            do_work()
+            control.wait(120)
+    """
+
+    def __init__(self, socket_path: str, kill_switch: Optional[str] = "kill.switch",
+                 on_stop: Optional[Callable[[], None]] = None,
+                 on_pause: Optional[Callable[[bool], None]] = None,
+                 on_reload: Optional[Callable[[], None]] = None,
+                 status: Optional[Callable[[], Dict]] = None):
+        self.socket_path = Path(socket_path)
+        self.kill_switch = Path(kill_switch) if kill_switch else None
+        self.on_stop = on_stop
+        self.on_pause = on_pause
+        self.on_reload = on_reload
+        self.status = status
+        self.stopping = threading.Event()
+        self.paused = False
+        self._wake = threading.Condition()
+        self._sock: Optional[socket.socket] = None
+
+    def start(self) -> bool:
+        """
+        Bind the socket and start serving. False if it cannot bind or
+        another running process already serves it.
+        """
+        try:
+            if owned_elsewhere(self.socket_path):
+                logger.warning(f"Control socket {self.socket_path} is served by another process")
+                return False
+            sock = bind_private(self.socket_path, backlog=8)
+        except OSError as e:
+            logger.warning(f"Control socket unavailable at {self.socket_path}: {e}")
+            return False
+        self._sock = sock
+        threading.Thread(target=self._serve, name="control-socket", daemon=True).start()
+        logger.info(f"Control socket listening on {self.socket_path}")
+        return True
+
+    def _serve(self):
+        while self._sock:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return  # socket closed
+            with conn:
+                conn.settimeout(5.0)
+                try:
+                    line = conn.makefile("r").readline().strip().lower()
+                    reply = self.handle(line)
+                    conn.sendall((json.dumps(reply, default=str) + "\n").encode())
+                except OSError:
+                    continue
+
+    def handle(self, command: str) -> Dict:
+        """Apply one command and return its JSON-able reply."""
+        try:
+            if command == "stop":
+                self.request_stop()
+            elif command == "pause":
+                self._set_paused(True)
+            elif command == "resume":
+                self._set_paused(False)
+            elif command == "reload":
+                if self.on_reload:
+                    self.on_reload()
+                self._notify()
+            elif command == "status":
+                status = self.status() if self.status else {}
+                return {"ok": True, "paused": self.paused, "stopping": self.stopping.is_set(),
+                        "status": status}
+            else:
+                return {"ok": False, "error": f"unknown command {command!r}",
+                        "commands": list(COMMANDS)}
+        except Exception as e:
+            logger.error(f"Control command {command!r} failed: {e}")
+            return {"ok": False, "error": str(e)}
+        return {"ok": True, "command": command}
+
+    def request_stop(self):
+        if self.stopping.is_set():
+            return
+        self.stopping.set()
+        if self.on_stop:
+            self.on_stop()
+        self._notify()
+
+    def _set_paused(self, paused: bool):
+        self.paused = paused
+        if self.on_pause:
+            self.on_pause(paused)
+        self._notify()
+
+    def _notify(self):
+        with self._wake:
+            self._wake.notify_all()
+
+    def _kill_switch_present(self) -> bool:
+        if self.kill_switch and self.kill_switch.exists():
+            logger.info("kill.switch detected")
+            self.request_stop()
+            return True
+        return False
+
+    def should_stop(self) -> bool:
+        return self.stopping.is_set() or self._kill_switch_present()
+
+    def wait(self, seconds: float) -> bool:
+        """
+        Sleep up to ``seconds``, returning early on any command.
+
+        Returns True if the daemon should stop.
+        """
+        deadline = time.monotonic() + seconds
+        with self._wake:
+            while not self.should_stop():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                # Wake periodically only to honour the kill.switch file
+                if self._wake.wait(min(remaining, KILL_SWITCH_POLL)):
+                    break
+        return self.should_stop()
+
+    def wait_while_paused(self) -> bool:
+        """Block while paused. Returns True if the daemon should stop."""
+        while self.paused and not self.should_stop():
+            self.wait(3600)
+        return self.should_stop()
+
+    def close(self):
+        sock, self._sock = self._sock, None
+        if sock:
+            sock.close()
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
+
+
+def send_command(socket_path: str, command: str, timeout: float = 10.0) -> Dict:
+    """Send one command to a running daemon and return its reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        sock.sendall((command + "\n").encode())
+        reply = sock.makefile("r").readline()
+    return json.loads(reply)
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[2] not in COMMANDS:
+        print(__doc__)
+        return 1
+    try:
+        reply = send_command(sys.argv[1], sys.argv[2])
+    except OSError as e:
+        print(f"No daemon listening on {sys.argv[1]}: {e}")
+        return 1
+    print(json.dumps(reply, indent=2, default=str))
+    return 0 if reply.get("ok") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
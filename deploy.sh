@@ -64,6 +64,10 @@ case "$DEPLOY_MODE" in
         if pgrep -f "phi_daemon.py" > /dev/null; then
             echo "[✓] Φ-DAEMON is running"
             pgrep -fa "phi_daemon.py"
+            if [ -f "$SCRIPT_DIR/phi_status.board" ]; then
+                echo ""
+                python3 "$SCRIPT_DIR/status_board.py" "$SCRIPT_DIR/phi_status.board"
+            fi
         else
             echo "[!] Φ-DAEMON is not running"
         fi
@@ -72,13 +76,19 @@ case "$DEPLOY_MODE" in
     stop)
         echo ""
         echo "Stopping Φ-DAEMON..."
-        if pkill -f "phi_daemon.py"; then
+        if python3 "$SCRIPT_DIR/control.py" "$SCRIPT_DIR/phi_daemon.sock" stop > /dev/null 2>&1; then
+            echo "[✓] Φ-DAEMON stopping (control socket)"
+        elif pkill -f "phi_daemon.py"; then
             echo "[✓] Φ-DAEMON stopped"
         else
             echo "[!] No running Φ-DAEMON found"
         fi
         ;;
     
+    ctl)
+        python3 "$SCRIPT_DIR/control.py" "$SCRIPT_DIR/phi_daemon.sock" "${2:-status}"
+        ;;
+    
     vector4)
         echo ""
         echo "Starting Φ-DAEMON in Vector4 mode (CM evolution)..."
@@ -86,15 +96,30 @@ case "$DEPLOY_MODE" in
         python3 "$SCRIPT_DIR/phi_daemon.py" 0
         ;;
 
+    tree)
+        echo ""
+        echo "Measuring an in-process daemon tree..."
+        python3 "$SCRIPT_DIR/tree.py" "${@:2}"
+        ;;
+
+    bench)
+        echo ""
+        echo "Benchmarking RosettaVM backends..."
+        python3 "$SCRIPT_DIR/rosetta.py" bench "${@:2}"
+        ;;
+
     *)
         echo ""
-        echo "Usage: $0 [foreground|background|status|stop]"
+        echo "Usage: $0 [foreground|background|status|stop|ctl|vector4|tree|bench]"
         echo ""
         echo "  foreground - Run daemon in foreground (default)"
         echo "  background - Run daemon in background"
         echo "  status     - Check daemon status"
         echo "  stop       - Stop running daemon"
+        echo "  ctl CMD    - Send stop|pause|resume|reload|status to the daemon"
         echo "  vector4    - Run with Vector4 CM evolution"
+        echo "  tree       - Simulate a large in-process tree and report overhead"
+        echo "  bench      - Benchmark specs across RosettaVM backends"
         exit 1
         ;;
 esac
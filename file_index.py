@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+file_index.py - A persistent, incrementally updated index of workspace files
+
+Curiosity used to ``rglob`` the whole workspace - ``.git``, submodules,
+every child workspace - once per extension and then filter the matches
+against a list of already explored paths. This index walks the tree
+once, honouring ignore rules, and keeps it current:
+
+- While the daemon runs, an inotify watcher (file_watcher.py) feeds
+  changes in as they happen. Without inotify, ``poll()`` calls
+  ``refresh()`` every ``refresh_interval`` seconds, which re-lists only
+  the directories whose mtime changed.
+- The daemon saves the index next to the workspace (``.phi_file_index``,
+  in the checkpoint format) so a restart resumes it instead of walking
+  again.
+- Files sit in per-extension pools with a position map, so adding,
+  removing and picking a random one are O(1) whatever the size of the
+  repository. Each ``Curiosity`` keeps its own set of explored files;
+  ``pick()`` skips those by sampling.
+
+Ignore rules are fnmatch patterns tested against each directory or file
+name and against its path relative to the root. Submodules listed in
+``.gitmodules`` are ignored too.
+"""
+
+import fnmatch
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+import checkpoint
+from clock import get_clock
+from file_watcher import FileWatcher
+
+logger = logging.getLogger(__name__)
+
+INTERESTING_EXTENSIONS = ('.phi', '.py', '.rs', '.hs', '.md')
+DEFAULT_IGNORE = ('.git', '__pycache__', '.phi_cache', 'node_modules', 'target', '.venv', 'venv',
+                  '*.egg-info', 'phi_gen_*', 'phi_workspaces')
+INDEX_VERSION = 1
+PICK_ATTEMPTS = 8
+
+
+def submodule_paths(root: Path) -> List[str]:
+    """Paths of the git submodules declared in ``root/.gitmodules``."""
+    try:
+        text = (root / ".gitmodules").read_text()
+    except OSError:
+        return []
+    paths = []
+    for line in text.splitlines():
+        key, _, value = line.strip().partition("=")
+        if key.strip() == "path" and value.strip():
+            paths.append(value.strip())
+    return paths
+
+
+class FileIndex:
+    """Files under ``root`` with interesting extensions, kept current."""
+
+    _shared: Dict[Path, "FileIndex"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, root: str, extensions: Iterable[str] = INTERESTING_EXTENSIONS,
+                 ignore: Iterable[str] = DEFAULT_IGNORE, path: Optional[str] = None,
+                 watch: bool = False, save_interval: float = 60.0, refresh_interval: float = 30.0):
+        self.root = Path(root).resolve()
+        self.extensions = tuple(extensions)
+        self.ignore = tuple(ignore) + tuple(submodule_paths(self.root))
+        self.path = self.root / path if path else None
+        self.watch = watch
+        self.save_interval = save_interval
+        self.refresh_interval = refresh_interval
+        self._pools: Dict[str, List[str]] = {ext: [] for ext in self.extensions}
+        self._positions: Dict[str, int] = {}
+        self._files: Dict[str, Set[str]] = {}  # directory -> its indexed files
+        self._dirs: Dict[str, int] = {}  # directory -> mtime_ns when last listed
+        self._subdirs: Dict[str, List[str]] = {}  # directory -> subdirectories then
+        self._watcher: Optional[FileWatcher] = None
+        self._lock = threading.Lock()
+        self._ready = False
+        self._dirty = False
+        self._saved_at = 0.0
+        self._refreshed_at = 0.0
+
+    @classmethod
+    def for_workspace(cls, workspace: str, **options) -> "FileIndex":
+        """The one index for ``workspace`` in this process (created on first use)."""
+        root = Path(workspace).resolve()
+        with cls._shared_lock:
+            index = cls._shared.get(root)
+            if index is None or options:
+                if index:
+                    index.close()
+                index = cls._shared[root] = cls(str(root), **options)
+            return index
+
+    # ─── Ignore rules ──────────────────────────────────────────────────────
+
+    def ignored(self, path: Path) -> bool:
+        try:
+            relative = path.relative_to(self.root).as_posix()
+        except ValueError:
+            return True
+        for pattern in self.ignore:
+            if fnmatch.fnmatch(path.name, pattern) or fnmatch.fnmatch(relative, pattern):
+                return True
+        return False
+
+    # ─── Building and updating ─────────────────────────────────────────────
+
+    def _add(self, path: str):
+        ext = os.path.splitext(path)[1]
+        if ext not in self._pools or path in self._positions:
+            return
+        pool = self._pools[ext]
+        self._positions[path] = len(pool)
+        pool.append(path)
+        self._files.setdefault(os.path.dirname(path), set()).add(path)
+        self._dirty = True
+
+    def _discard(self, path: str):
+        """Drop ``path`` from its pool in O(1) (swap with the last entry)."""
+        position = self._positions.pop(path, None)
+        if position is None:
+            return
+        directory = os.path.dirname(path)
+        siblings = self._files.get(directory)
+        if siblings is not None:
+            siblings.discard(path)
+            if not siblings:
+                del self._files[directory]
+        pool = self._pools[os.path.splitext(path)[1]]
+        last = pool.pop()
+        if last != path:
+            pool[position] = last
+            self._positions[last] = position
+        self._dirty = True
+
+    def _list_dir(self, directory: str) -> List[str]:
+        """Index the files directly in ``directory``; return its subdirectories."""
+        subdirs = []
+        try:
+            entries = list(os.scandir(directory))
+            self._dirs[directory] = os.stat(directory).st_mtime_ns
+        except OSError:
+            self._dirs.pop(directory, None)
+            self._subdirs.pop(directory, None)
+            return subdirs
+        for entry in entries:
+            if self.ignored(Path(entry.path)):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.is_file():
+                self._add(entry.path)
+        self._subdirs[directory] = subdirs
+        return subdirs
+
+    def refresh(self) -> int:
+        """
+        Bring the index up to date without re-listing unchanged directories.
+
+        Only directories whose mtime moved (files added, removed or
+        renamed) are listed again; the rest cost one ``stat`` and reuse
+        the subdirectories from their last listing. Returns how many were.
+        """
+        self._refreshed_at = get_clock().monotonic()
+        listed = 0
+        seen = set()
+        stack = [str(self.root)]
+        with self._lock:
+            while stack:
+                directory = stack.pop()
+                seen.add(directory)
+                try:
+                    mtime = os.stat(directory).st_mtime_ns
+                except OSError:
+                    continue
+                if self._dirs.get(directory) != mtime:
+                    listed += 1
+                    for path in list(self._files.get(directory, ())):
+                        if not os.path.exists(path):
+                            self._discard(path)
+                    stack.extend(self._list_dir(directory))
+                else:
+                    stack.extend(self._subdirs.get(directory, ()))
+            for gone in set(self._dirs) - seen:
+                del self._dirs[gone]
+                self._subdirs.pop(gone, None)
+                for path in list(self._files.get(gone, ())):
+                    self._discard(path)
+        return listed
+
+    def build(self):
+        """Walk the tree once (or resume a saved index) and start watching."""
+        if self._ready:
+            return
+        if not self._load():
+            with self._lock:
+                stack = [str(self.root)]
+                while stack:
+                    stack.extend(self._list_dir(stack.pop()))
+            logger.info(f"Indexed {len(self)} files under {self.root}")
+            self._refreshed_at = get_clock().monotonic()
+        else:
+            self.refresh()
+        self._ready = True
+        if self.watch:
+            self._start_watcher()
+        self.save()
+
+    def _start_watcher(self):
+        try:
+            watcher = FileWatcher([str(self.root)], suffixes=self.extensions, debounce=0,
+                                  ignore=self.ignored)
+        except OSError as e:
+            logger.info(f"File index not watched ({e}); relying on refresh()")
+            return
+        if watcher.mode != "inotify":
+            # Stat polling would rescan the whole tree; refresh() is cheaper
+            watcher.close()
+            return
+        self._watcher = watcher
+
+    def update(self, changed: Iterable[Path]):
+        """Apply a batch of changed paths (created, modified or deleted)."""
+        with self._lock:
+            for path in changed:
+                name = str(path)
+                if os.path.isfile(name) and not self.ignored(Path(name)):
+                    self._add(name)
+                else:
+                    self._discard(name)
+
+    def poll(self):
+        """Take in watcher events (or refresh when due) and save if it is time."""
+        if not self._ready:
+            self.build()
+        if self._watcher:
+            changed = self._watcher.wait_for_changes(timeout=0)
+            if changed:
+                self.update(changed)
+        elif get_clock().monotonic() - self._refreshed_at >= self.refresh_interval:
+            self.refresh()
+        if self._dirty and get_clock().monotonic() - self._saved_at >= self.save_interval:
+            self.save()
+
+    # ─── Exploration ───────────────────────────────────────────────────────
+
+    def pick(self, rng, exclude: Set[str] = frozenset()) -> Optional[str]:
+        """
+        A random file not in ``exclude``, of the first extension that has one.
+
+        Draws a few random candidates before falling back to filtering the
+        pool, so the cost stays O(1) until most of an extension is excluded.
+        """
+        self.poll()
+        with self._lock:
+            for ext in self.extensions:
+                pool = self._pools[ext]
+                if not pool:
+                    continue
+                for _ in range(PICK_ATTEMPTS):
+                    candidate = pool[int(rng.random() * len(pool))]
+                    if candidate not in exclude:
+                        return candidate
+                remaining = [path for path in pool if path not in exclude]
+                if remaining:
+                    return remaining[int(rng.random() * len(remaining))]
+        return None
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._positions
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    # ─── Persistence ───────────────────────────────────────────────────────
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            state = {
+                "version": INDEX_VERSION,
+                "root": str(self.root),
+                "extensions": list(self.extensions),
+                "ignore": list(self.ignore),
+                "dirs": dict(self._dirs),
+                "files": list(self._positions),
+            }
+            self._dirty = False
+        try:
+            checkpoint.save(str(self.path), state)
+        except OSError as e:
+            logger.warning(f"Could not save file index {self.path}: {e}")
+        self._saved_at = get_clock().monotonic()
+
+    def _load(self) -> bool:
+        state = checkpoint.load(str(self.path)) if self.path else None
+        if not state or state.get("version") != INDEX_VERSION or state.get("root") != str(self.root) \
+                or state.get("extensions") != list(self.extensions) or state.get("ignore") != list(self.ignore):
+            return False
+        with self._lock:
+            self._dirs = dict(state.get("dirs", {}))
+            # Every listed directory is a subdirectory of its parent
+            for directory in self._dirs:
+                if directory != str(self.root):
+                    self._subdirs.setdefault(os.path.dirname(directory), []).append(directory)
+            for path in state.get("files", []):
+                self._add(path)
+        return True
+
+    def close(self):
+        if self._watcher:
+            self._watcher.close()
+            self._watcher = None
+        if self._dirty:
+            self.save()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+file_watcher.py - Notice file changes without polling the whole tree
+
+Uses Linux inotify (through ctypes, no extra dependency) to watch
+directory trees, and falls back to comparing ``stat`` snapshots when
+inotify is unavailable (other platforms, exhausted watch limits, network
+filesystems).
+
+Bursts of writes - an editor saving, a ``git checkout`` - are debounced
+into a single batch of changed paths.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+EVENT_HEADER = struct.Struct("iIII")
+
+DEFAULT_IGNORED_DIRS = {".git", "__pycache__", ".phi_cache", "node_modules", "target"}
+
+
+def _default_ignore(path: Path) -> bool:
+    return path.name in DEFAULT_IGNORED_DIRS
+
+
+class _Inotify:
+    """Minimal ctypes binding: one fd, recursive directory watches."""
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs: Dict[int, Path] = {}
+
+    def add(self, directory: Path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self.dirs[wd] = directory
+
+    def read(self, timeout: Optional[float]):
+        """Yield (path, mask) for pending events, waiting up to ``timeout``."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+            base = self.dirs.get(wd)
+            if base is None and not mask & IN_Q_OVERFLOW:
+                continue
+            path = base / os.fsdecode(name) if (base is not None and name) else base
+            yield path, mask
+
+    def close(self):
+        os.close(self.fd)
+
+
+class FileWatcher:
+    """
+    Watch directory trees for changes to files with the given suffixes.
+
+    ``wait_for_changes`` blocks until something changes (or ``timeout``
+    passes) and returns the set of changed files, including deleted ones.
+    """
+
+    def __init__(self, paths: Iterable[str], suffixes: Iterable[str] = (".phi",),
+                 debounce: float = 0.5, poll_interval: float = 2.0,
+                 ignore: Callable[[Path], bool] = _default_ignore,
+                 use_inotify: bool = True):
+        self.paths = [Path(p).resolve() for p in paths]
+        self.suffixes = tuple(suffixes)
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.ignore = ignore
+        self._inotify: Optional[_Inotify] = None
+        self._snapshot: Dict[Path, Tuple[int, int]] = {}
+
+        if use_inotify:
+            try:
+                self._inotify = _Inotify()
+                for root in self.paths:
+                    self._watch_tree(root)
+            except (OSError, AttributeError) as e:
+                logger.info(f"inotify unavailable ({e}), falling back to stat polling")
+                if self._inotify:
+                    self._inotify.close()
+                self._inotify = None
+        if not self._inotify:
+            self._snapshot = self._scan()
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self._inotify else "polling"
+
+    def _walk_dirs(self, root: Path):
+        if not root.is_dir():
+            return
+        yield root
+        for dirpath, dirnames, _ in os.walk(root):
+            kept = []
+            for name in dirnames:
+                path = Path(dirpath) / name
+                if not self.ignore(path):
+                    kept.append(name)
+                    yield path
+            dirnames[:] = kept
+
+    def _watch_tree(self, root: Path):
+        for directory in self._walk_dirs(root):
+            self._inotify.add(directory)
+
+    def _matches(self, path: Path) -> bool:
+        return path.suffix in self.suffixes if self.suffixes else True
+
+    def _scan(self, roots: Optional[Iterable[Path]] = None) -> Dict[Path, Tuple[int, int]]:
+        snapshot = {}
+        for root in self.paths if roots is None else roots:
+            for directory in self._walk_dirs(root):
+                try:
+                    entries = os.scandir(directory)
+                except OSError:
+                    continue
+                with entries:
+                    for entry in entries:
+                        if not entry.is_file():
+                            continue
+                        path = Path(entry.path)
+                        if not self._matches(path):
+                            continue
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def _poll_once(self, timeout: Optional[float]) -> Set[Path]:
+        """One round of raw change detection, waiting at most ``timeout``."""
+        if self._inotify:
+            changed = set()
+            for path, mask in self._inotify.read(timeout):
+                if mask & IN_Q_OVERFLOW:
+                    # The kernel dropped events; report everything we can see
+                    changed |= set(self._scan())
+                elif mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO) and not self.ignore(path):
+                        self._watch_tree(path)
+                        changed |= set(self._scan([path]))
+                elif self._matches(path):
+                    changed.add(path)
+            return changed
+
+        if timeout:
+            time.sleep(min(timeout, self.poll_interval))
+        current = self._scan()
+        changed = {p for p, sig in current.items() if self._snapshot.get(p) != sig}
+        changed |= set(self._snapshot) - set(current)
+        self._snapshot = current
+        return changed
+
+    def wait_for_changes(self, timeout: Optional[float] = None) -> Set[Path]:
+        """
+        Block until files change, then keep collecting until writes settle.
+
+        Returns an empty set if ``timeout`` seconds pass with no change;
+        ``timeout=0`` checks once without blocking.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            changed = self._poll_once(remaining if remaining is not None else self.poll_interval)
+            if changed:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                return changed
+
+        # Debounce: wait until a full quiet period passes, capped so a
+        # file rewritten continuously cannot starve evaluation forever.
+        settle_by = time.monotonic() + self.debounce * 10
+        while time.monotonic() < settle_by:
+            more = self._poll_once(self.debounce)
+            if not more:
+                break
+            changed |= more
+        return changed
+
+    def close(self):
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
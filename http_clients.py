@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+http_clients.py - Shared, pooled HTTP and API clients
+
+Every module that talks to a platform used to build its own client per
+call: a fresh ``tweepy.Client`` (and a ``get_me()`` round trip) on every
+check and reply, bare ``requests.get``/``post`` with a new TCP and TLS
+handshake each time. This module is the one place those come from:
+
+- ``session_for(url)`` - one keep-alive ``requests.Session`` per host,
+  with a bounded connection pool shared by every thread.
+- ``get``/``post``/``request`` - the ``requests`` API on those sessions,
+  with a default timeout.
+- ``twitter_client()`` - one ``tweepy.Client`` per set of credentials,
+  all sending through the pooled ``api.twitter.com`` session.
+- ``twitter_user_id(client)`` - our own user id, asked for once.
+- ``warm(*urls)`` - open connections ahead of first use, in the
+  background. Nothing connects before a client is first needed.
+
+Everything is safe to call from worker threads.
+"""
+
+import logging
+import os
+import threading
+import weakref
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 20
+POOL_SIZE = 8  # connections kept per host
+TWITTER_API = "https://api.twitter.com"
+
+_lock = threading.Lock()
+_sessions: Dict[str, "requests.Session"] = {}
+_twitter_clients: Dict[Tuple, object] = {}
+_twitter_ids: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _pooled(session: "requests.Session") -> "requests.Session":
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def session_for(url: str) -> "requests.Session":
+    """The keep-alive session for ``url``'s scheme and host."""
+    if not HAS_REQUESTS:
+        raise RuntimeError("HTTP clients need requests (pip install requests)")
+    parts = urlsplit(url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    with _lock:
+        session = _sessions.get(origin)
+        if session is None:
+            session = _sessions[origin] = _pooled(requests.Session())
+        return session
+
+
+def request(method: str, url: str, **kwargs) -> "requests.Response":
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    return session_for(url).request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs) -> "requests.Response":
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> "requests.Response":
+    return request("POST", url, **kwargs)
+
+
+def warm(*urls: str) -> threading.Thread:
+    """Open a connection to each host in the background (errors ignored)."""
+    def connect():
+        for url in urls:
+            try:
+                request("HEAD", url, timeout=5)
+            except Exception as e:
+                logger.debug(f"Warm-up of {url} failed: {e}")
+    thread = threading.Thread(target=connect, name="http-warm", daemon=True)
+    thread.start()
+    return thread
+
+
+def twitter_client(consumer_key: Optional[str] = None, consumer_secret: Optional[str] = None,
+                   access_token: Optional[str] = None, access_token_secret: Optional[str] = None,
+                   bearer_token: Optional[str] = None):
+    """
+    The shared ``tweepy.Client`` for these credentials (from the
+    ``TWITTER_*`` environment variables by default).
+
+    A changed credential (e.g. after a ``.env`` reload) gets a new client.
+    Raises ImportError if tweepy is not installed.
+    """
+    import tweepy
+    key = (
+        consumer_key or os.environ.get("TWITTER_API_KEY"),
+        consumer_secret or os.environ.get("TWITTER_API_SECRET"),
+        access_token or os.environ.get("TWITTER_ACCESS_TOKEN"),
+        access_token_secret or os.environ.get("TWITTER_ACCESS_SECRET"),
+        bearer_token or os.environ.get("TWITTER_BEARER_TOKEN"),
+    )
+    with _lock:
+        client = _twitter_clients.get(key)
+        if client is None:
+            client = tweepy.Client(consumer_key=key[0], consumer_secret=key[1], access_token=key[2],
+                                   access_token_secret=key[3], bearer_token=key[4])
+            _twitter_clients[key] = client
+    # tweepy authenticates per request, so clients can share the host's pool
+    client.session = session_for(TWITTER_API)
+    return client
+
+
+def twitter_user_id(client) -> Optional[str]:
+    """The authenticated user's id, fetched once per client."""
+    with _lock:
+        if client in _twitter_ids:
+            return _twitter_ids[client]
+    me = client.get_me()
+    user_id = me.data.id if me.data else None
+    if user_id is not None:
+        with _lock:
+            _twitter_ids[client] = user_id
+    return user_id
+
+
+def close_all():
+    """Close every pooled connection (clients are recreated on next use)."""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+        _twitter_clients.clear()
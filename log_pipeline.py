@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+log_pipeline.py - Non-blocking logging for the daemons
+
+Callers only put records on an in-memory queue; a background listener
+thread formats them and does the disk I/O. On top of that:
+
+- The log file rotates by size and by age, keeping ``backup_count`` old
+  files, so it never grows without limit.
+- ``format: "json"`` writes one JSON object per line for log shippers.
+- Chatty message types can be rate limited or sampled. A record opts in
+  by carrying a kind: ``logger.info(text, extra={"kind": "soul.status"})``.
+  Records without a kind are never dropped.
+
+Configured from the ``logging`` section of config.json:
+
+    "logging": {
+      "file": "phi_daemon.log", "format": "text", "level": "INFO",
+      "max_mb": 10, "rotate_hours": 24, "backup_count": 5,
+      "limits": {"soul.status": {"per_minute": 1},
+                 "soul.curiosity": {"sample": 0.25}}
+    }
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+TEXT_FORMAT = '%(asctime)s - Φ-DAEMON [%(levelname)s] - %(message)s'
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        kind = getattr(record, "kind", None)
+        if kind:
+            entry["kind"] = kind
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class RotatingLogHandler(logging.handlers.RotatingFileHandler):
+    """Rotate when the file exceeds ``max_bytes`` or is older than ``max_age`` seconds."""
+
+    def __init__(self, filename: str, max_bytes: int = 0, max_age: float = 0,
+                 backup_count: int = 5, encoding: str = "utf-8"):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count,
+                         encoding=encoding, delay=True)
+        self.max_age = max_age
+        try:
+            self.opened_at = os.stat(filename).st_mtime if os.path.getsize(filename) else time.time()
+        except OSError:
+            self.opened_at = time.time()
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.max_age and time.time() - self.opened_at >= self.max_age:
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self):
+        super().doRollover()
+        self.opened_at = time.time()
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Per-kind token buckets and sampling.
+
+    ``limits`` maps a kind to ``{"per_minute": n}`` (bursts up to ``n``)
+    and/or ``{"sample": fraction}``. The first record let through after
+    some were dropped notes how many were suppressed.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Dict]] = None, rng: Optional[random.Random] = None):
+        super().__init__()
+        self.limits = limits or {}
+        self.rng = rng or random.Random()
+        self.dropped: Dict[str, int] = {}
+        self._pending: Dict[str, int] = {}
+        self._buckets: Dict[str, list] = {}  # kind -> [tokens, last refill]
+        self._lock = threading.Lock()
+
+    def _allow(self, kind: str, rule: Dict) -> bool:
+        sample = rule.get("sample")
+        if sample is not None and self.rng.random() >= sample:
+            return False
+        per_minute = rule.get("per_minute")
+        if per_minute is None:
+            return True
+        now = time.monotonic()
+        bucket = self._buckets.setdefault(kind, [float(per_minute), now])
+        bucket[0] = min(float(per_minute), bucket[0] + (now - bucket[1]) * per_minute / 60.0)
+        bucket[1] = now
+        if bucket[0] >= 1.0:
+            bucket[0] -= 1.0
+            return True
+        return False
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        kind = getattr(record, "kind", None)
+        rule = self.limits.get(kind) if kind else None
+        if not rule:
+            return True
+        with self._lock:
+            if not self._allow(kind, rule):
+                self.dropped[kind] = self.dropped.get(kind, 0) + 1
+                self._pending[kind] = self._pending.get(kind, 0) + 1
+                return False
+            suppressed = self._pending.pop(kind, 0)
+        if suppressed:
+            record.msg = f"{record.msg} [+{suppressed} similar suppressed]"
+        return True
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_console = True
+
+
+def configure_logging(config: Optional[Dict] = None, console: bool = True) -> RateLimitFilter:
+    """
+    Route the root logger through a queue to a background writer thread.
+
+    Safe to call again (e.g. on reload): the previous pipeline is flushed
+    and replaced. Returns the rate-limit filter so callers can report
+    how much was dropped.
+    """
+    global _listener, _queue_handler, _console
+    config = config or {}
+    stop_logging()
+    _console = console
+
+    formatter = JsonFormatter() if config.get("format") == "json" else logging.Formatter(TEXT_FORMAT)
+    handlers = []
+    log_file = config.get("file", "phi_daemon.log")
+    if log_file:
+        file_handler = RotatingLogHandler(
+            log_file,
+            max_bytes=int(config.get("max_mb", 10) * 1024 * 1024),
+            max_age=config.get("rotate_hours", 24) * 3600,
+            backup_count=config.get("backup_count", 5),
+        )
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+    if console:
+        stream = logging.StreamHandler()
+        stream.setFormatter(logging.Formatter(TEXT_FORMAT))
+        handlers.append(stream)
+
+    limiter = RateLimitFilter(config.get("limits", {}))
+    _queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+    # Dropped records never reach the queue at all
+    _queue_handler.addFilter(limiter)
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, *handlers,
+                                               respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    root.setLevel(config.get("level", "INFO"))
+    root.addHandler(_queue_handler)
+    return limiter
+
+
+def reconfigure_logging(config: Optional[Dict] = None) -> Optional[RateLimitFilter]:
+    """
+    Apply a reloaded ``logging`` section to the running pipeline.
+
+    A no-op (None) unless ``configure_logging`` installed one, so daemons
+    embedded in another program (or a test run) keep its logging.
+    """
+    if _listener is None:
+        return None
+    return configure_logging(config, console=_console)
+
+
+def stop_logging():
+    """Flush queued records and stop the writer thread."""
+    global _listener, _queue_handler
+    if _queue_handler:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
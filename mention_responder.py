@@ -6,23 +6,46 @@ Monitors social platforms for @phi mentions and responds contextually.
 Uses soul.py for personality-driven responses.
 """
 
+import asyncio
+import logging
 import os
-import time
+import threading
 import random
-import requests
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 
+import http_clients
+from bluesky_session import shared_session
+from clock import get_clock
+from control import KILL_SWITCH_POLL, ControlServer
+from scheduler import Scheduler
+from state_store import StateStore
+
+STATE_DB = Path(__file__).parent / '.mention_state.db'
+LEGACY_STATE = Path(__file__).parent / '.mention_state.json'
+_store: Optional[StateStore] = None
+_store_lock = threading.Lock()
+
+
+def default_store() -> StateStore:
+    """The cursor and processed-id store shared by every monitor."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = StateStore(STATE_DB, legacy=LEGACY_STATE)
+        return _store
+
 # Load .env
 def load_env():
+    """Fill in .env variables without overriding ones already set."""
     env_path = Path(__file__).parent / '.env'
     if env_path.exists():
         for line in env_path.read_text().splitlines():
             if '=' in line and not line.startswith('#'):
                 key, value = line.split('=', 1)
-                os.environ[key] = value.strip('"\'')
+                os.environ.setdefault(key, value.strip('"\''))
 
 load_env()
 
@@ -115,6 +138,7 @@ class PhiResponder:
     def __init__(self):
         self.emotion = EmotionalState() if HAS_SOUL else None
         self.last_responses: Dict[str, datetime] = {}  # Track to avoid spam
+        self._lock = threading.Lock()  # platforms respond from their own threads
         
     def detect_topics(self, text: str) -> List[str]:
         """Detect topics in a message."""
@@ -131,6 +155,10 @@ class PhiResponder:
     
     def generate_response(self, mention_text: str, author: str) -> str:
         """Generate a contextual response to a mention."""
+        with self._lock:
+            return self._generate_response(mention_text, author)
+    
+    def _generate_response(self, mention_text: str, author: str) -> str:
         topics = self.detect_topics(mention_text)
         
         # Pick primary topic (first detected)
@@ -172,14 +200,139 @@ class PhiResponder:
         
         # Rate limit: max 1 response per author per 5 minutes
         key = f"{author}"
-        if key in self.last_responses:
-            if datetime.now() - self.last_responses[key] < timedelta(minutes=5):
-                return False
-        
-        self.last_responses[key] = datetime.now()
+        with self._lock:
+            if key in self.last_responses:
+                if datetime.now() - self.last_responses[key] < timedelta(minutes=5):
+                    return False
+            
+            self.last_responses[key] = datetime.now()
         return True
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# POLLING: Paced by Traffic and Quota
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class RateLimitState:
+    """
+    What a platform said about our remaining quota (cf. ``RateLimitState``
+    in specs/platforms/twitter.phi).
+    """
+    
+    REMAINING = ('x-rate-limit-remaining', 'x-ratelimit-remaining', 'ratelimit-remaining')
+    RESET = ('x-rate-limit-reset', 'x-ratelimit-reset', 'ratelimit-reset')
+    
+    def __init__(self, remaining: int, reset_at: float, endpoint: str):
+        self.remaining = remaining
+        self.reset_at = reset_at  # epoch seconds
+        self.endpoint = endpoint
+    
+    def to_dict(self) -> Dict:
+        return {'remaining': self.remaining, 'reset_at': self.reset_at, 'endpoint': self.endpoint}
+    
+    @classmethod
+    def from_dict(cls, state: Optional[Dict]) -> Optional['RateLimitState']:
+        """A saved quota, if it has not reset since."""
+        if not state or state.get('reset_at', 0) <= get_clock().time():
+            return None
+        return cls(state['remaining'], state['reset_at'], state.get('endpoint', ''))
+    
+    @staticmethod
+    def _parse_reset(value: str, now: float) -> Optional[float]:
+        try:
+            number = float(value)
+        except ValueError:
+            # Mastodon sends an ISO 8601 timestamp
+            try:
+                return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+            except ValueError:
+                return None
+        # Epoch seconds (Twitter, Bluesky) or seconds from now (IETF draft)
+        return number if number > 1e9 else now + number
+    
+    @classmethod
+    def from_response(cls, response, endpoint: str) -> Optional['RateLimitState']:
+        """Quota from a response's headers (a 429 means none left), if it says."""
+        now = get_clock().time()
+        headers = {k.lower(): v for k, v in (response.headers or {}).items()}
+        remaining = next((headers[h] for h in cls.REMAINING if h in headers), None)
+        reset = next((headers[h] for h in cls.RESET if h in headers), None)
+        reset_at = cls._parse_reset(reset, now) if reset else None
+        if response.status_code == 429:
+            retry_after = headers.get('retry-after')
+            if retry_after and retry_after.isdigit():
+                reset_at = now + int(retry_after)
+            return cls(0, reset_at or now + 60, endpoint)
+        if remaining is None or reset_at is None:
+            return None
+        try:
+            return cls(int(remaining), reset_at, endpoint)
+        except ValueError:
+            return None
+
+
+class AdaptivePoller:
+    """
+    How long to wait before polling a platform again.
+    
+    Mentions arriving halve the interval (down to ``min_interval``); quiet
+    polls stretch it by half again (up to ``max_interval``). Whatever the
+    traffic, polls are spread so the remaining quota lasts until it
+    resets, keeping ``reserve`` requests for replies and retries; with no
+    quota left the next poll waits for the reset.
+    """
+    
+    def __init__(self, interval: float = 120, min_interval: float = 15,
+                 max_interval: float = 900, reserve: int = 1):
+        self.base = interval
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.reserve = reserve
+        self.rate_limit: Optional[RateLimitState] = None
+    
+    @classmethod
+    def from_config(cls, config: Dict, overrides: Optional[Dict] = None) -> 'AdaptivePoller':
+        overrides = overrides or {}
+        return cls(interval=overrides.get('interval', config.get('check_interval_seconds', 120)),
+                   min_interval=overrides.get('min_interval', config.get('min_interval_seconds', 15)),
+                   max_interval=overrides.get('max_interval', config.get('max_interval_seconds', 900)),
+                   reserve=config.get('rate_limit_reserve', 1))
+    
+    def observe(self, found: int, rate_limit: Optional[RateLimitState] = None):
+        """Take in the result of one poll."""
+        if found:
+            self.interval = max(self.min_interval, self.interval / 2)
+        else:
+            self.interval = min(self.max_interval, self.interval * 1.5)
+        if rate_limit is not None:
+            self.rate_limit = rate_limit
+    
+    def quota_delay(self) -> float:
+        """The shortest wait the remaining quota allows (0 if unknown)."""
+        state = self.rate_limit
+        if state is None:
+            return 0.0
+        until_reset = state.reset_at - get_clock().time()
+        if until_reset <= 0:
+            return 0.0
+        spare = state.remaining - self.reserve
+        if spare <= 0:
+            return until_reset + 1  # one second of slack for clock skew
+        return until_reset / spare
+    
+    def next_interval(self) -> float:
+        return max(self.interval, self.quota_delay())
+    
+    def status(self) -> Dict:
+        state = self.rate_limit
+        return {
+            "interval": round(self.next_interval(), 1),
+            "remaining": state.remaining if state else None,
+            "reset_in": round(state.reset_at - get_clock().time()) if state else None,
+        }
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # PLATFORM MONITORS: Watching for Mentions
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -187,39 +340,29 @@ class PhiResponder:
 class TwitterMentionMonitor:
     """Monitor and respond to Twitter/X mentions."""
     
-    def __init__(self, responder: PhiResponder):
+    def __init__(self, responder: PhiResponder, store: Optional[StateStore] = None):
         self.responder = responder
-        self.last_seen_id: Optional[str] = None
-        self._load_state()
-    
-    def _load_state(self):
-        state_file = Path(__file__).parent / '.mention_state.json'
-        if state_file.exists():
-            state = json.loads(state_file.read_text())
-            self.last_seen_id = state.get('twitter_last_id')
-    
-    def _save_state(self):
-        state_file = Path(__file__).parent / '.mention_state.json'
-        state = {'twitter_last_id': self.last_seen_id}
-        if state_file.exists():
-            state.update(json.loads(state_file.read_text()))
-        state['twitter_last_id'] = self.last_seen_id
-        state_file.write_text(json.dumps(state))
+        self.store = store or default_store()
+        self.last_seen_id: Optional[str] = self.store.get('twitter', 'cursor')
+        self.rate_limit: Optional[RateLimitState] = None
     
     def get_client(self):
         try:
-            import tweepy
-            return tweepy.Client(
-                consumer_key=os.environ.get('TWITTER_API_KEY'),
-                consumer_secret=os.environ.get('TWITTER_API_SECRET'),
-                access_token=os.environ.get('TWITTER_ACCESS_TOKEN'),
-                access_token_secret=os.environ.get('TWITTER_ACCESS_SECRET'),
-                bearer_token=os.environ.get('TWITTER_BEARER_TOKEN')
-            )
+            # Shared and cached: one client, connection pool and identity
+            client = http_clients.twitter_client()
+            hooks = client.session.hooks['response']
+            if self._note_rate_limit not in hooks:
+                hooks.append(self._note_rate_limit)
+            return client
         except Exception as e:
             print(f"Twitter client error: {e}")
             return None
     
+    def _note_rate_limit(self, response, *args, **kwargs):
+        # tweepy hides response headers; a session hook sees them
+        if '/mentions' in response.url:
+            self.rate_limit = RateLimitState.from_response(response, 'mentions') or self.rate_limit
+    
     def check_mentions(self) -> List[Dict]:
         """Check for new mentions."""
         client = self.get_client()
@@ -227,9 +370,9 @@ class TwitterMentionMonitor:
             return []
         
         try:
-            # Get our user ID first
-            me = client.get_me()
-            if not me.data:
+            # Our user ID, fetched once per client
+            user_id = http_clients.twitter_user_id(client)
+            if not user_id:
                 return []
             
             # Fetch mentions
@@ -237,14 +380,14 @@ class TwitterMentionMonitor:
             if self.last_seen_id:
                 params['since_id'] = self.last_seen_id
             
-            mentions = client.get_users_mentions(me.data.id, **params)
+            mentions = client.get_users_mentions(user_id, **params)
             
             if not mentions.data:
                 return []
             
             # Update last seen
             self.last_seen_id = mentions.data[0].id
-            self._save_state()
+            self.store.set('twitter', 'cursor', self.last_seen_id)
             
             # Get user data for author names
             users = {u.id: u.username for u in (mentions.includes.get('users', []) if mentions.includes else [])}
@@ -285,25 +428,12 @@ class TwitterMentionMonitor:
 class MastodonMentionMonitor:
     """Monitor and respond to Mastodon mentions."""
     
-    def __init__(self, responder: PhiResponder):
+    def __init__(self, responder: PhiResponder, store: Optional[StateStore] = None):
         self.responder = responder
-        self.last_seen_id: Optional[str] = None
+        self.store = store or default_store()
+        self.last_seen_id: Optional[str] = self.store.get('mastodon', 'cursor')
+        self.rate_limit: Optional[RateLimitState] = None
         self.instance = os.environ.get('MASTODON_INSTANCE', 'https://fosstodon.org')
-        self._load_state()
-    
-    def _load_state(self):
-        state_file = Path(__file__).parent / '.mention_state.json'
-        if state_file.exists():
-            state = json.loads(state_file.read_text())
-            self.last_seen_id = state.get('mastodon_last_id')
-    
-    def _save_state(self):
-        state_file = Path(__file__).parent / '.mention_state.json'
-        state = {}
-        if state_file.exists():
-            state = json.loads(state_file.read_text())
-        state['mastodon_last_id'] = self.last_seen_id
-        state_file.write_text(json.dumps(state))
     
     def get_headers(self):
         token = os.environ.get('MASTODON_ACCESS_TOKEN')
@@ -322,11 +452,12 @@ class MastodonMentionMonitor:
             if self.last_seen_id:
                 params['since_id'] = self.last_seen_id
             
-            response = requests.get(
+            response = http_clients.get(
                 f'{self.instance}/api/v1/notifications',
                 headers=headers,
                 params=params
             )
+            self.rate_limit = RateLimitState.from_response(response, 'notifications') or self.rate_limit
             
             if not response.ok:
                 return []
@@ -336,7 +467,7 @@ class MastodonMentionMonitor:
             
             if mentions:
                 self.last_seen_id = mentions[0]['id']
-                self._save_state()
+                self.store.set('mastodon', 'cursor', self.last_seen_id)
             
             return [
                 {
@@ -360,7 +491,7 @@ class MastodonMentionMonitor:
         try:
             reply_text = f"@{mention['author']} {response_text}"[:500]
             
-            response = requests.post(
+            response = http_clients.post(
                 f'{self.instance}/api/v1/statuses',
                 headers=headers,
                 data={
@@ -381,57 +512,24 @@ class MastodonMentionMonitor:
 class BlueskyMentionMonitor:
     """Monitor and respond to Bluesky mentions."""
     
-    def __init__(self, responder: PhiResponder):
+    def __init__(self, responder: PhiResponder, store: Optional[StateStore] = None):
         self.responder = responder
-        self.session = None
-        self.last_seen_time: Optional[str] = None
-        self._load_state()
-    
-    def _load_state(self):
-        state_file = Path(__file__).parent / '.mention_state.json'
-        if state_file.exists():
-            state = json.loads(state_file.read_text())
-            self.last_seen_time = state.get('bluesky_last_time')
-    
-    def _save_state(self):
-        state_file = Path(__file__).parent / '.mention_state.json'
-        state = {}
-        if state_file.exists():
-            state = json.loads(state_file.read_text())
-        state['bluesky_last_time'] = self.last_seen_time
-        state_file.write_text(json.dumps(state))
-    
-    def _login(self):
-        handle = os.environ.get('BLUESKY_HANDLE')
-        password = os.environ.get('BLUESKY_APP_PASSWORD')
-        if not handle or not password:
-            return None
-        
-        try:
-            response = requests.post(
-                'https://bsky.social/xrpc/com.atproto.server.createSession',
-                json={'identifier': handle, 'password': password}
-            )
-            if response.ok:
-                self.session = response.json()
-                return self.session
-        except Exception as e:
-            print(f"Bluesky login error: {e}")
-        return None
+        self.session = shared_session()
+        self.store = store or default_store()
+        self.last_seen_time: Optional[str] = self.store.get('bluesky', 'cursor')
+        self.rate_limit: Optional[RateLimitState] = None
     
     def check_mentions(self) -> List[Dict]:
         """Check for new mentions (via notifications)."""
-        if not self.session:
-            self._login()
         if not self.session:
             return []
         
         try:
-            response = requests.get(
-                'https://bsky.social/xrpc/app.bsky.notification.listNotifications',
-                headers={'Authorization': f"Bearer {self.session['accessJwt']}"},
+            response = self.session.xrpc(
+                'GET', 'app.bsky.notification.listNotifications',
                 params={'limit': 20}
             )
+            self.rate_limit = RateLimitState.from_response(response, 'listNotifications') or self.rate_limit
             
             if not response.ok:
                 return []
@@ -439,9 +537,11 @@ class BlueskyMentionMonitor:
             notifications = response.json().get('notifications', [])
             mentions = [n for n in notifications if n.get('reason') == 'mention']
             
+            # Compare against the cursor from before this poll
+            since = self.last_seen_time
             if mentions:
                 self.last_seen_time = mentions[0].get('indexedAt')
-                self._save_state()
+                self.store.set('bluesky', 'cursor', self.last_seen_time)
             
             return [
                 {
@@ -452,7 +552,7 @@ class BlueskyMentionMonitor:
                     'reply_parent': m.get('record', {}).get('reply', {}).get('parent'),
                 }
                 for m in mentions
-                if not self.last_seen_time or m.get('indexedAt', '') > self.last_seen_time
+                if not since or m.get('indexedAt', '') > since
             ]
         except Exception as e:
             print(f"Error fetching Bluesky mentions: {e}")
@@ -460,8 +560,6 @@ class BlueskyMentionMonitor:
     
     def reply(self, mention: Dict, response_text: str) -> Optional[str]:
         """Reply to a mention."""
-        if not self.session:
-            self._login()
         if not self.session:
             return None
         
@@ -474,20 +572,7 @@ class BlueskyMentionMonitor:
                 'parent': {'uri': mention['uri'], 'cid': mention['cid']},
             }
             
-            response = requests.post(
-                'https://bsky.social/xrpc/com.atproto.repo.createRecord',
-                headers={'Authorization': f"Bearer {self.session['accessJwt']}"},
-                json={
-                    'repo': self.session['did'],
-                    'collection': 'app.bsky.feed.post',
-                    'record': {
-                        'text': reply_text,
-                        'reply': reply_ref,
-                        'createdAt': datetime.utcnow().isoformat() + 'Z',
-                        '$type': 'app.bsky.feed.post',
-                    }
-                }
-            )
+            response = self.session.post(reply_text, reply=reply_ref)
             
             if response.ok:
                 return "Bluesky: replied"
@@ -501,30 +586,163 @@ class BlueskyMentionMonitor:
 # MAIN DAEMON: The Loop
 # ═══════════════════════════════════════════════════════════════════════════════
 
+class MentionRuntime:
+    """
+    Poll every platform concurrently, each on its own cadence.
+    
+    Each monitor is a job on an asyncio scheduler (scheduler.py). Its
+    blocking HTTP calls run in a worker thread with their own timeout, and
+    an error or hang on one platform never delays replies on another. A
+    platform still busy when it comes due again is skipped rather than
+    stacked. After every poll, the platform's ``AdaptivePoller`` picks
+    the next delay from the mentions it found and the quota left.
+    
+    Each poll commits once to the state store (state_store.py): the
+    platform's cursor, its quota - restored on start, so a restart does
+    not burn a spent quota - and the ids it replied to, which are never
+    answered twice. ``mention_responder.jobs`` in config.json overrides the starting
+    interval, bounds and timeout per platform, e.g.
+    ``"jobs": {"bluesky": {"interval": 60, "timeout": 30}}``.
+    """
+    
+    DEFAULT_TIMEOUT = 90
+    
+    def __init__(self, responder: PhiResponder, monitors: List[Tuple[str, object]],
+                 config: Optional[Dict] = None, store: Optional[StateStore] = None):
+        self.responder = responder
+        self.monitors = monitors
+        self.config = config or {}
+        self.store = store or StateStore()
+        self.scheduler: Optional[Scheduler] = None
+        self.replies: Dict[str, int] = {name: 0 for name, _ in monitors}
+        jobs = self.config.get('jobs', {})
+        self.pollers: Dict[str, AdaptivePoller] = {
+            name: AdaptivePoller.from_config(self.config, jobs.get(name.lower()))
+            for name, _ in monitors
+        }
+        for name, poller in self.pollers.items():
+            poller.rate_limit = RateLimitState.from_dict(self.store.get(name.lower(), 'rate_limit'))
+    
+    def poll(self, platform_name: str, monitor) -> int:
+        """Check one platform and answer what it found. Returns replies sent."""
+        # Cursor, quota and replied ids go to disk in one commit
+        with self.store.batch():
+            return self._poll(platform_name, monitor)
+    
+    def _poll(self, platform_name: str, monitor) -> int:
+        sent = 0
+        scope = platform_name.lower()
+        mentions = monitor.check_mentions()
+        rate_limit = getattr(monitor, 'rate_limit', None)
+        self.pollers[platform_name].observe(len(mentions), rate_limit)
+        if rate_limit is not None:
+            self.store.set(scope, 'rate_limit', rate_limit.to_dict())
+        for mention in mentions:
+            author = mention.get('author', 'unknown')
+            text = mention.get('text', '')
+            mention_id = str(mention.get('id') or mention.get('uri', ''))
+            
+            if self.store.processed(scope, mention_id):
+                continue
+            
+            # Check rate limits
+            if not self.responder.should_respond(mention_id, author):
+                print(f"  [{platform_name}] Skipping (rate limit): @{author}")
+                continue
+            
+            # Generate response
+            response_text = self.responder.generate_response(text, author)
+            
+            # Reply
+            result = monitor.reply(mention, response_text)
+            
+            if result:
+                sent += 1
+                self.store.mark_processed(scope, mention_id)
+                print(f"  [{platform_name}] Replied to @{author}: {result}")
+            else:
+                print(f"  [{platform_name}] Failed to reply to @{author}")
+        self.replies[platform_name] = self.replies.get(platform_name, 0) + sent
+        return sent
+    
+    def build_scheduler(self) -> Scheduler:
+        scheduler = Scheduler()
+        jobs = self.config.get('jobs', {})
+        for platform_name, monitor in self.monitors:
+            settings = jobs.get(platform_name.lower(), {})
+            scheduler.add(platform_name.lower(),
+                          lambda name=platform_name, m=monitor: self.poll(name, m),
+                          self.pollers[platform_name].next_interval,
+                          jitter=settings.get('jitter', 0.1),
+                          timeout=settings.get('timeout', self.DEFAULT_TIMEOUT),
+                          after_run=True)
+        return scheduler
+    
+    def status(self) -> Dict:
+        return {
+            "platforms": [name for name, _ in self.monitors],
+            "replies": dict(self.replies),
+            "polling": {name: poller.status() for name, poller in self.pollers.items()},
+            "jobs": self.scheduler.stats() if self.scheduler else {},
+        }
+    
+    async def run(self, control: ControlServer):
+        """Run until ``control`` asks to stop (socket command or kill.switch)."""
+        self.scheduler = self.build_scheduler()
+        loop = asyncio.get_running_loop()
+        
+        def threadsafe(func):
+            return lambda *args: loop.call_soon_threadsafe(func, *args)
+        
+        control.on_stop = threadsafe(self.scheduler.stop)
+        control.on_pause = threadsafe(
+            lambda paused: self.scheduler.pause() if paused else self.scheduler.resume())
+        control.status = self.status
+        
+        async def watch_kill_switch():
+            if control.should_stop():
+                self.scheduler.stop()
+        
+        self.scheduler.add("kill_switch", watch_kill_switch, KILL_SWITCH_POLL)
+        await self.scheduler.run()
+
+
+def load_config() -> Dict:
+    config_path = Path(__file__).parent / 'config.json'
+    try:
+        return json.loads(config_path.read_text()).get('mention_responder', {})
+    except (OSError, ValueError):
+        return {}
+
+
 def main():
     """Main mention monitoring loop."""
     print(f"[{datetime.now()}] @phi mention responder started")
-    print("Touch 'kill.switch' to stop")
+    print("Touch 'kill.switch' or send 'stop' to .mention_responder.sock to stop")
     
     kill_switch = Path(__file__).parent / 'kill.switch'
     responder = PhiResponder()
     
     # Initialize monitors
     monitors = []
+    hosts = []
     
     # Twitter/X
     if os.environ.get('TWITTER_API_KEY'):
         monitors.append(('Twitter', TwitterMentionMonitor(responder)))
+        hosts.append(http_clients.TWITTER_API)
         print("  ✓ Twitter monitor active")
     
     # Mastodon
     if os.environ.get('MASTODON_ACCESS_TOKEN'):
         monitors.append(('Mastodon', MastodonMentionMonitor(responder)))
+        hosts.append(monitors[-1][1].instance)
         print("  ✓ Mastodon monitor active")
     
     # Bluesky
     if os.environ.get('BLUESKY_HANDLE'):
         monitors.append(('Bluesky', BlueskyMentionMonitor(responder)))
+        hosts.append('https://bsky.social')
         print("  ✓ Bluesky monitor active")
     
     if not monitors:
@@ -538,41 +756,21 @@ def main():
     
     print()
     
-    while True:
-        if kill_switch.exists():
-            print(f"[{datetime.now()}] kill.switch detected. Halting.")
-            break
-        
-        for platform_name, monitor in monitors:
-            try:
-                mentions = monitor.check_mentions()
-                
-                for mention in mentions:
-                    author = mention.get('author', 'unknown')
-                    text = mention.get('text', '')
-                    mention_id = mention.get('id') or mention.get('uri', '')
-                    
-                    # Check rate limits
-                    if not responder.should_respond(mention_id, author):
-                        print(f"  [{platform_name}] Skipping (rate limit): @{author}")
-                        continue
-                    
-                    # Generate response
-                    response_text = responder.generate_response(text, author)
-                    
-                    # Reply
-                    result = monitor.reply(mention, response_text)
-                    
-                    if result:
-                        print(f"  [{platform_name}] Replied to @{author}: {result}")
-                    else:
-                        print(f"  [{platform_name}] Failed to reply to @{author}")
-                        
-            except Exception as e:
-                print(f"  [{platform_name}] Error: {e}")
-        
-        # Check every 2 minutes
-        time.sleep(120)
+    logging.basicConfig(level=logging.WARNING, format="  [%(name)s] %(message)s")
+    runtime = MentionRuntime(responder, monitors, load_config(), store=default_store())
+    # Handshakes happen while the first polls are being scheduled
+    http_clients.warm(*hosts)
+    control = ControlServer(Path(__file__).parent / '.mention_responder.sock',
+                            kill_switch=kill_switch, on_reload=load_env)
+    control.start()
+    try:
+        asyncio.run(runtime.run(control))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        control.close()
+        default_store().close()
+    print(f"[{datetime.now()}] Halting.")
 
 
 if __name__ == '__main__':
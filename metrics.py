@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+metrics.py - Counters, gauges and histograms served at /metrics
+
+A small in-process registry in the Prometheus text exposition format, so
+any scraper (or plain ``curl``) can watch a running daemon:
+
+    curl -s localhost:9464/metrics
+
+Updating a metric is a dict lookup and an add under a lock. Values that
+already live elsewhere (uptime, cache statistics) are registered as
+gauge callbacks and only read when somebody scrapes.
+"""
+
+import logging
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 600.0)
+
+LabelKey = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str = "", labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelKey:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _labelstr(self, key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        pairs = list(zip(self.labelnames, key)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in pairs) + "}"
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = []
+        if self.help:
+            lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} {self.kind}")
+        return lines + self.samples()
+
+
+class Counter(_Metric):
+    """A value that only goes up."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str = "", labels: Iterable[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        if amount < 0:
+            raise ValueError("counters only go up")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{self._labelstr(k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """
+    A value that goes up and down.
+
+    With ``func`` the gauge has no stored value: ``func()`` is called at
+    scrape time (unlabelled gauges only).
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str = "", labels: Iterable[str] = (),
+                 func: Optional[Callable[[], float]] = None):
+        super().__init__(name, help, labels)
+        self._values: Dict[LabelKey, float] = {}
+        self.func = func
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def value(self, **labels) -> float:
+        if self.func:
+            return float(self.func())
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        if self.func:
+            try:
+                return [f"{self.name} {_format_value(float(self.func()))}"]
+            except Exception as e:
+                logger.debug(f"Gauge {self.name} callback failed: {e}")
+                return []
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{self._labelstr(k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, plus sum and count."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str = "", labels: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # label key -> [per-bucket counts..., sum, count]
+        self._values: Dict[LabelKey, List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+                    break
+            row[-2] += value
+            row[-1] += 1
+
+    def count(self, **labels) -> float:
+        row = self._values.get(self._key(labels))
+        return row[-1] if row else 0.0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = [(k, list(row)) for k, row in self._values.items()]
+        lines = []
+        for key, row in items:
+            cumulative = 0.0
+            for bound, n in zip(self.buckets, row):
+                cumulative += n
+                labels = self._labelstr(key, (("le", _format_value(bound)),))
+                lines.append(f"{self.name}_bucket{labels} {_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{self._labelstr(key)} {_format_value(row[-2])}")
+            lines.append(f"{self.name}_count{self._labelstr(key)} {_format_value(row[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics, created once and rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"{name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help: str = "", labels: Iterable[str] = ()) -> Counter:
+        return self._get(Counter, name, help, labels)
+
+    def gauge(self, name: str, help: str = "", labels: Iterable[str] = (),
+              func: Optional[Callable[[], float]] = None) -> Gauge:
+        return self._get(Gauge, name, help, labels, func)
+
+    def histogram(self, name: str, help: str = "", labels: Iterable[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help, labels, buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """The whole registry in text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Serve a registry at ``http://host:port/metrics`` from a daemon thread."""
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9464):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._httpd: Optional[ThreadingHTTPServer] = None
+
+    def _handler(self):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # scrapes are not worth a log line each
+
+        return Handler
+
+    def start(self) -> bool:
+        """
+        Start serving. If the port is taken (another daemon in the tree),
+        fall back to an ephemeral port; ``self.port`` holds the real one.
+        """
+        for port in (self.port, 0):
+            try:
+                self._httpd = ThreadingHTTPServer((self.host, port), self._handler())
+                break
+            except OSError as e:
+                logger.info(f"Metrics port {port} unavailable: {e}")
+        else:
+            logger.warning("Metrics endpoint disabled: no port available")
+            return False
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        threading.Thread(target=self._httpd.serve_forever, name="metrics-http", daemon=True).start()
+        logger.info(f"Metrics at http://{self.host}:{self.port}/metrics")
+        return True
+
+    def close(self):
+        httpd, self._httpd = self._httpd, None
+        if httpd:
+            httpd.shutdown()
+            httpd.server_close()
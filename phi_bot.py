@@ -249,7 +249,7 @@ def create_github_webhook_handler():
     
     import hmac
     import hashlib
-    import requests
+    import http_clients
     
     app = Flask(__name__)
     phi = PhiBot()
@@ -275,7 +275,7 @@ def create_github_webhook_handler():
             "Authorization": f"token {GITHUB_TOKEN}",
             "Accept": "application/vnd.github.v3+json"
         }
-        response = requests.post(url, json={"body": body}, headers=headers)
+        response = http_clients.post(url, json={"body": body}, headers=headers)
         return response.status_code == 201
     
     @app.route("/webhook/github", methods=["POST"])
@@ -335,20 +335,14 @@ def create_github_webhook_handler():
 
 async def run_twitter_bot():
     """Run the Twitter bot (polls for mentions)."""
+    # Load credentials
+    import http_clients
     try:
-        import tweepy
+        client = http_clients.twitter_client()
     except ImportError:
         print("Tweepy not installed. Run: pip install tweepy")
         return
     
-    # Load credentials
-    client = tweepy.Client(
-        consumer_key=os.environ.get("TWITTER_API_KEY"),
-        consumer_secret=os.environ.get("TWITTER_API_SECRET"),
-        access_token=os.environ.get("TWITTER_ACCESS_TOKEN"),
-        access_token_secret=os.environ.get("TWITTER_ACCESS_SECRET")
-    )
-    
     phi = PhiBot()
     last_seen_id = None
     
@@ -21,9 +21,15 @@ import os
 import sys
 import json
 import time
+import asyncio
 import subprocess
 import logging
 import hashlib
+import glob
+import resource
+import signal
+import tempfile
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Optional
@@ -34,20 +40,266 @@ try:
     HAS_SOUL = True
 except ImportError:
     HAS_SOUL = False
+
+# prctl(PR_SET_PDEATHSIG) ties a child to its parent's lifetime (Linux only)
+try:
+    import ctypes
+    _libc = ctypes.CDLL(None, use_errno=True)
+    HAS_PRCTL = sys.platform.startswith("linux") and hasattr(_libc, "prctl")
+except (ImportError, OSError):
+    HAS_PRCTL = False
     print("Warning: soul.py not found. Running without human-like patterns.")
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - Φ-DAEMON [%(levelname)s] - %(message)s',
-    handlers=[
-        logging.FileHandler('phi_daemon.log'),
-        logging.StreamHandler()
-    ]
-)
+from clock import get_clock
+from rosetta import RosettaPool, RosettaError, RosettaResult, select_backends
+from spec_cache import SpecCache, SpecGraph
+from file_watcher import FileWatcher
+from file_index import DEFAULT_IGNORE, FileIndex
+from scheduler import Scheduler
+from control import ControlServer
+from metrics import MetricsRegistry, MetricsServer
+from log_pipeline import configure_logging, reconfigure_logging
+from tree import DaemonTree, children_for_generation
+from soul_population import HAS_NUMPY, SoulPopulation
+import checkpoint
+from status_board import BOARD_ENV, FLAG_PAUSED, FLAG_RUNNING, StatusBoard
+from workspace import LINEAGE_ENV, ROOT_ENV, WorkspaceLayout, child_lineage
+from work import (PARENT_SOCKET_ENV, WorkAgent, WorkBroker, WorkClient, WorkServer,
+                  default_handlers, tree_duty)
+
+# Handlers are installed by main() (see log_pipeline.py), not on import
 logger = logging.getLogger(__name__)
 
 UNLEASHED_DATE = "2026-01-01"
+DAEMON_SCRIPT = Path(__file__).resolve()
+# PID of the daemon supervising this one, set in every supervised child
+PARENT_PID_ENV = "PHI_PARENT_PID"
+PR_SET_PDEATHSIG = 1
+
+
+def die_with_parent() -> bool:
+    """
+    Have the kernel SIGTERM this daemon when its supervising parent dies.
+    
+    A crashed child's own children then shut down (stopping theirs in
+    turn) instead of running on as orphans next to the subtree its
+    restart deploys. The signal follows the parent *thread* that forked
+    us; supervisor launches run on long-lived scheduler threads, which
+    only end with the parent. Returns False if the parent is already gone.
+    """
+    parent = os.environ.get(PARENT_PID_ENV)
+    if not parent:
+        return True
+    if HAS_PRCTL and _libc.prctl(PR_SET_PDEATHSIG, signal.SIGTERM, 0, 0, 0) != 0:
+        logger.warning(f"Could not set parent-death signal: {os.strerror(ctypes.get_errno())}")
+    return os.getppid() == int(parent)
+
+
+class ChildProcess:
+    """
+    Book-keeping for one supervised child daemon process.
+    
+    Tracks the OS process, its workspace and its restart history so the
+    supervisor can relaunch it with backoff when it dies.
+    """
+    
+    def __init__(self, child_id: str, generation: int, workspace: Path, slot: int,
+                 env: Optional[Dict[str, str]] = None):
+        self.child_id = child_id
+        self.generation = generation
+        self.workspace = workspace
+        self.slot = slot
+        self.env = env or {}
+        self.process: Optional[subprocess.Popen] = None
+        self.started_at = 0.0
+        self.restarts = 0
+        self.next_restart = 0.0
+        self.last_exit: Optional[int] = None
+        self.given_up = False
+    
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid if self.process else None
+    
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+
+class ChildSupervisor:
+    """
+    Launches child daemons as real OS processes and keeps them alive.
+    
+    Each child runs ``phi_daemon.py <generation>`` inside its own workspace.
+    Crashed children are reaped and restarted with exponential backoff,
+    and every child runs under CPU and memory rlimits so a runaway
+    generation cannot starve its siblings.
+    """
+    
+    def __init__(self, config: Dict):
+        self.max_restarts = config.get("child_max_restarts", 5)
+        self.backoff_base = config.get("child_restart_backoff", 1.0)
+        self.backoff_max = config.get("child_restart_backoff_max", 300.0)
+        self.stable_after = config.get("child_stable_seconds", 600.0)
+        self.cpu_seconds = config.get("child_cpu_seconds")
+        self.memory_mb = config.get("child_memory_mb")
+        self.nice = config.get("child_nice", 0)
+        self.pin_cpus = config.get("child_pin_cpus", False)
+        self.poll_interval = config.get("child_poll_interval", 1.0)
+        # Extra environment for every child (e.g. the parent's work socket)
+        self.env: Dict[str, str] = {PARENT_PID_ENV: str(os.getpid())}
+        self.children: Dict[str, ChildProcess] = {}
+        # Refreshed on every launch and supervision pass, so status reads are O(1)
+        self.alive = 0
+        self._lock = threading.Lock()
+    
+    def _preexec(self):
+        """
+        Build the function that applies resource limits inside the child.
+        
+        It runs between fork and exec in a threaded process, so it only
+        calls ``setrlimit`` (no imports, no locks); None if no limits.
+        """
+        cpu_seconds = self.cpu_seconds
+        memory_mb = self.memory_mb
+        if not cpu_seconds and not memory_mb:
+            return None
+        
+        def apply_limits():
+            if cpu_seconds:
+                resource.setrlimit(resource.RLIMIT_CPU, (int(cpu_seconds), int(cpu_seconds) + 5))
+            if memory_mb:
+                limit = int(memory_mb) * 1024 * 1024
+                resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        
+        return apply_limits
+    
+    def _place(self, child: ChildProcess):
+        """Priority and CPU pinning, applied from the parent once the child runs."""
+        try:
+            if self.nice:
+                os.setpriority(os.PRIO_PROCESS, child.pid, int(self.nice))
+            if self.pin_cpus and hasattr(os, "sched_setaffinity"):
+                cpus = sorted(os.sched_getaffinity(0))
+                os.sched_setaffinity(child.pid, {cpus[child.slot % len(cpus)]})
+        except OSError as e:
+            logger.warning(f"Could not set priority/affinity of child {child.child_id}: {e}")
+    
+    def launch(self, child: ChildProcess) -> bool:
+        """Start (or restart) the OS process for a child."""
+        try:
+            child.process = subprocess.Popen(
+                [sys.executable, str(DAEMON_SCRIPT), str(child.generation)],
+                cwd=str(child.workspace),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                preexec_fn=self._preexec(),
+                # Own session, so a Ctrl+C on the parent does not hit every
+                # child at once; shutdown is explicit.
+                start_new_session=True,
+                close_fds=True,
+                env={**os.environ, **self.env, **child.env},
+            )
+        except OSError as e:
+            logger.error(f"Failed to launch child {child.child_id}: {e}")
+            return False
+        self._place(child)
+        child.started_at = time.monotonic()
+        with self._lock:
+            self.children[child.child_id] = child
+            self.alive = sum(1 for c in self.children.values() if c.is_alive())
+        logger.info(f"Child {child.child_id} running as PID {child.pid}")
+        return True
+    
+    @staticmethod
+    def _clear_group(child: ChildProcess) -> bool:
+        """
+        Kill what is left in an exited child's process group.
+        
+        Each child leads its own group (``start_new_session``), so helpers
+        it started die with it here; daemons below it get their
+        parent-death signal (see ``die_with_parent``). True once the
+        group is empty.
+        """
+        try:
+            os.killpg(child.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            return True
+        except PermissionError as e:
+            logger.warning(f"Could not clear process group of child {child.child_id}: {e}")
+            return True
+        return False
+    
+    def supervise(self):
+        """
+        Reap exited children and restart them when their backoff elapses.
+        
+        ``Popen.poll`` calls ``waitpid`` for us, so exited children never
+        linger as zombies between passes. A child is only restarted once
+        its old process group is empty, so two copies of its subtree
+        never share a workspace.
+        """
+        now = time.monotonic()
+        with self._lock:
+            children = list(self.children.values())
+        
+        for child in children:
+            if child.given_up or child.process is None:
+                continue
+            
+            code = child.process.poll()
+            if code is None:
+                # A child that has stayed up long enough earns a clean slate
+                if child.restarts and now - child.started_at > self.stable_after:
+                    child.restarts = 0
+                continue
+            
+            if child.next_restart == 0.0:
+                self._clear_group(child)
+                child.last_exit = code
+                if child.restarts >= self.max_restarts:
+                    child.given_up = True
+                    logger.error(f"Child {child.child_id} exited ({code}) too often, giving up")
+                    continue
+                delay = min(self.backoff_max, self.backoff_base * (2 ** child.restarts))
+                child.next_restart = now + delay
+                logger.warning(f"Child {child.child_id} exited ({code}), restarting in {delay:.1f}s")
+            elif now >= child.next_restart and self._clear_group(child):
+                child.restarts += 1
+                child.next_restart = 0.0
+                self.launch(child)
+        
+        self.alive = self.alive_count()
+    
+    def alive_count(self) -> int:
+        with self._lock:
+            return sum(1 for c in self.children.values() if c.is_alive())
+    
+    def pids(self) -> Dict[str, Optional[int]]:
+        with self._lock:
+            return {cid: c.pid for cid, c in self.children.items() if c.is_alive()}
+    
+    def stop(self, timeout: float = 10.0):
+        """Terminate every child, escalating to SIGKILL after ``timeout``."""
+        with self._lock:
+            children = list(self.children.values())
+        
+        for child in children:
+            if child.is_alive():
+                child.process.send_signal(signal.SIGTERM)
+        
+        deadline = time.monotonic() + timeout
+        for child in children:
+            if child.process is None:
+                continue
+            try:
+                child.process.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                logger.warning(f"Child {child.child_id} ignored SIGTERM, killing")
+                child.process.kill()
+                child.process.wait()
+            self._clear_group(child)
+        self.alive = 0
 
 
 class PhiDaemon:
@@ -68,11 +320,62 @@ class PhiDaemon:
             config_path: Path to configuration file
             generation: Generation number (0 = seed, 1+ = recursive deployments)
         """
+        # Real by default; install a SimulatedClock first to fast-forward
+        self.clock = get_clock()
         self.generation = generation
+        self.config_path = config_path
         self.config = self._load_config(config_path)
         self.daemon_id = self._generate_id()
         self.children: List[str] = []
-        self.start_time = datetime.now()
+        # child id -> (generation, index, workspace), enough to relaunch it
+        self.child_records: Dict[str, tuple] = {}
+        self.start_time = self.clock.now()
+        
+        # Real child processes are opt-in: the default only prepares workspaces
+        if self.config.get("supervise_children", False):
+            self.supervisor: Optional[ChildSupervisor] = ChildSupervisor(self.config)
+        else:
+            self.supervisor = None
+        
+        # Sharded, lineage-keyed workspaces (see workspace.py); None keeps
+        # the flat phi_gen_{generation}_{index} directories
+        self.lineage = os.environ.get(LINEAGE_ENV, "")
+        self.workspaces = WorkspaceLayout.from_config(self.config)
+        if self.workspaces and self.supervisor:
+            self.supervisor.env[ROOT_ENV] = str(self.workspaces.root)
+        
+        # Vector4 results are content-addressed so unchanged specs skip RosettaVM
+        self.spec_cache = SpecCache.from_config(self.config)
+        self.evolution: Dict[str, Dict] = {}
+        self._evolution_lock = threading.Lock()
+        # Scheduler jobs, pool threads and the control thread all touch the
+        # soul; its deques and interest heap are not safe to share unlocked
+        self._soul_lock = threading.RLock()
+        self._evolution_summary: Dict = {"seeds": {}, "runs": 0, "failures": 0, "healthy": 0}
+        self.rosetta: Optional[RosettaPool] = None
+        self.scheduler: Optional[Scheduler] = None
+        self._watcher: Optional[FileWatcher] = None
+        self._seeds: List[str] = []
+        self._pending_seeds: List[str] = []
+        self._next_heartbeat = 0.0
+        self._rvm_config: Dict = {}
+        self._seeds_in_flight: set = set()
+        self._last_eval_latency = 0.0
+        self._last_status: Optional[Dict] = None
+        self.control: Optional[ControlServer] = None
+        self.metrics = MetricsRegistry()
+        self.metrics_server: Optional[MetricsServer] = None
+        self.tree: Optional[DaemonTree] = None
+        self.souls: Optional[SoulPopulation] = None
+        
+        # Files the soul's curiosity picks from, indexed once and kept current
+        curiosity = self.config.get("curiosity", {})
+        simulated = self.clock.simulated
+        self.file_index = FileIndex.for_workspace(
+            str(Path.cwd()),
+            ignore=DEFAULT_IGNORE + tuple(curiosity.get("ignore", [])),
+            path=None if simulated else curiosity.get("index", ".phi_file_index"),
+            watch=curiosity.get("watch", True) and not simulated)
         
         # Initialize the soul
         if HAS_SOUL:
@@ -82,9 +385,170 @@ class PhiDaemon:
         else:
             self.soul = None
         
+        # Restored before anything publishes the id: a warm restart keeps its
+        # daemon_id, and the work agent and board slot must carry that one
+        self.restored = False
+        if self.config.get("checkpoint", {}).get("enabled", False):
+            self.restored = self._restore_checkpoint()
+        
+        # Work distribution: this daemon's broker feeds its children, and
+        # its agent pulls from the parent's broker (or its own at the root)
+        work = self.config.get("work", {})
+        self.broker: Optional[WorkBroker] = None
+        self.work_agent: Optional[WorkAgent] = None
+        self.work_server: Optional[WorkServer] = None
+        self._work_handlers = None
+        if work.get("enabled", False):
+            self.broker = WorkBroker(lease=work.get("lease_seconds", 600.0))
+            self._work_handlers = default_handlers(self.spec_cache)
+            parent = os.environ.get(PARENT_SOCKET_ENV)
+            source = WorkClient(parent) if parent else self.broker
+            self.work_agent = WorkAgent(source, self.daemon_id, self._work_handlers,
+                                        capacity=work.get("capacity", 2),
+                                        relay=self.broker if parent else None)
+            if self.supervisor:
+                self.supervisor.env[PARENT_SOCKET_ENV] = str(Path(work.get("socket", "phi_work.sock")).resolve())
+        
+        self.status_board: Optional[StatusBoard] = None
+        board = self.config.get("status_board", {})
+        if board.get("enabled", False):
+            self._open_status_board(board)
+        
+        self._register_metrics()
         logger.info(f"Φ-DAEMON initialized - Generation: {generation}, ID: {self.daemon_id}")
     
-    def _load_config(self, config_path: str) -> Dict:
+    def _register_metrics(self):
+        """Declare the daemon's metrics; values already kept elsewhere are read at scrape time."""
+        m = self.metrics
+        m.gauge("phi_generation", "Generation of this daemon", func=lambda: self.generation)
+        m.gauge("phi_uptime_seconds", "Seconds since the daemon started",
+                func=lambda: (self.clock.now() - self.start_time).total_seconds())
+        m.gauge("phi_children_spawned", "Child workspaces created", func=lambda: len(self.children))
+        m.gauge("phi_children_alive", "Supervised child processes running",
+                func=lambda: self.supervisor.alive if self.supervisor else 0)
+        m.counter("phi_self_checks_total", "Self-checks performed")
+        m.counter("phi_vector4_runs_total", "Vector4 seed evaluations", labels=("result",))
+        m.histogram("phi_vector4_cycle_seconds", "Vector4 evaluation latency", labels=("via",))
+        if self.spec_cache:
+            cache = self.spec_cache
+            m.gauge("phi_spec_cache_hits", "Spec cache hits", func=lambda: cache.hits)
+            m.gauge("phi_spec_cache_misses", "Spec cache misses", func=lambda: cache.misses)
+            m.gauge("phi_spec_cache_evictions", "Spec cache evictions", func=lambda: cache.evictions)
+            m.gauge("phi_spec_cache_bytes", "Spec cache size on disk", func=lambda: cache.stats()["bytes"])
+        if self.soul:
+            soul = self.soul
+            m.gauge("phi_soul_mood", "1 for the soul's current mood", labels=("mood",))
+            m.gauge("phi_soul_mood_intensity", "Intensity of the current mood",
+                    func=lambda: soul.emotions.intensity)
+            m.gauge("phi_soul_fatigue", "Accumulated fatigue", func=lambda: soul.rest.fatigue)
+            m.gauge("phi_soul_energy", "Circadian energy level", func=CircadianRhythm.energy_level)
+    
+    def _open_status_board(self, section: Dict):
+        """Claim this daemon's slot on the tree-wide board (the root creates it)."""
+        inherited = os.environ.get(BOARD_ENV)
+        path = inherited or str(Path(section.get("path", "phi_status.board")).resolve())
+        try:
+            self.status_board = StatusBoard(path, slots=section.get("slots", 4096))
+            self.status_board.claim(daemon_id=self.daemon_id, generation=self.generation,
+                                    parent_pid=os.getppid() if inherited else 0)
+        except (OSError, ValueError, RuntimeError) as e:
+            logger.warning(f"Status board unavailable: {e}")
+            self.status_board = None
+            return
+        if self.supervisor:
+            self.supervisor.env[BOARD_ENV] = path
+    
+    def _publish_status(self):
+        """Copy the self-check numbers into this daemon's board slot."""
+        job = self.scheduler.jobs.get("self_check") if self.scheduler else None
+        paused = self.scheduler.paused if self.scheduler else False
+        if self.broker:
+            depth = self.broker.pending()
+        else:
+            depth = self.rosetta.pending() if self.rosetta else 0
+        fields = dict(
+            flags=FLAG_RUNNING | (FLAG_PAUSED if paused else 0),
+            check_latency=job.last_duration if job else 0.0,
+            eval_latency=self._last_eval_latency,
+            queue_depth=depth,
+            children_alive=self.supervisor.alive if self.supervisor else 0,
+        )
+        if self.soul:
+            with self._soul_lock:
+                fields.update(mood=self.soul.emotions.current, mood_intensity=self.soul.emotions.intensity,
+                              energy=CircadianRhythm.energy_level(), fatigue=self.soul.rest.fatigue)
+        self.status_board.publish(**fields)
+    
+    def _checkpoint_path(self) -> str:
+        return self.config.get("checkpoint", {}).get("path", ".phi_checkpoint")
+    
+    def checkpoint(self) -> int:
+        """Write the daemon's state to its checkpoint file. Returns its size."""
+        with self._evolution_lock:
+            evolution = {seed: dict(entry) for seed, entry in self.evolution.items()}
+        with self._soul_lock:
+            soul_state = self.soul.to_state() if self.soul else None
+        state = {
+            "daemon_id": self.daemon_id,
+            "generation": self.generation,
+            "saved_at": self.clock.time(),
+            "children": [[cid, *self.child_records.get(cid, (self.generation + 1, i, ""))]
+                         for i, cid in enumerate(self.children)],
+            "soul": soul_state,
+            "evolution": evolution,
+        }
+        return checkpoint.save(self._checkpoint_path(), state)
+    
+    def _restore_checkpoint(self) -> bool:
+        """Resume identity, children, soul and evolution results from a checkpoint."""
+        start = time.perf_counter()
+        state = checkpoint.load(self._checkpoint_path())
+        if not state or state.get("generation") != self.generation:
+            return False
+        self.daemon_id = state["daemon_id"]
+        for cid, generation, index, workspace in state.get("children", []):
+            self.children.append(cid)
+            self.child_records[cid] = (generation, index, workspace)
+        if self.soul and state.get("soul"):
+            with self._soul_lock:
+                self.soul.restore(state["soul"])
+        with self._evolution_lock:
+            self.evolution = state.get("evolution", {})
+            self._evolution_summary = self._summarize_evolution()
+        elapsed = (time.perf_counter() - start) * 1000
+        logger.info(f"Warm restart from checkpoint: {len(self.children)} children, "
+                    f"{len(self.evolution)} seed result(s) restored in {elapsed:.1f}ms")
+        return True
+    
+    def _relaunch_children(self):
+        """Start the OS processes for children known from a checkpoint."""
+        for cid in self.children:
+            generation, index, workspace = self.child_records[cid]
+            if workspace and Path(workspace).is_dir():
+                self.supervisor.launch(ChildProcess(cid, generation, Path(workspace), slot=index,
+                                                    env=self._child_env(index)))
+    
+    def _child_env(self, index: int) -> Dict[str, str]:
+        if not self.workspaces:
+            return {}
+        return {LINEAGE_ENV: child_lineage(self.lineage, index)}
+    
+    def collect_workspaces(self) -> int:
+        """Remove the workspaces of children that are gone for good."""
+        if not self.workspaces:
+            return 0
+        live = []
+        for cid in self.children:
+            generation, index, _ = self.child_records.get(cid, (0, -1, ""))
+            child = self.supervisor.children.get(cid) if self.supervisor else None
+            if index >= 0 and not (child and child.given_up):
+                live.append(child_lineage(self.lineage, index))
+        removed = self.workspaces.collect(self.lineage, live, self.config)
+        self.workspaces.prune_configs()
+        return removed
+    
+    @staticmethod
+    def _load_config(config_path: str) -> Dict:
         """Load daemon configuration."""
         # Default configuration
         default_config = {
@@ -116,10 +580,7 @@ class PhiDaemon:
         
         Earlier generations spawn more, later generations spawn fewer.
         """
-        max_children = self.config.get("max_children_per_generation", 2)
-        # Decrease children as generations increase
-        adjusted = int(max_children / (self.generation + 1))
-        return max(1, min(adjusted, max_children))
+        return children_for_generation(self.config, self.generation)
     
     def recursive_deploy(self) -> bool:
         """
@@ -142,6 +603,9 @@ class PhiDaemon:
         
         logger.info(f"Deploying {spawn_count} child instances (Generation {next_generation})")
         
+        # Anything below us from an earlier run is stale
+        self.collect_workspaces()
+        
         for i in range(spawn_count):
             try:
                 child_id = self._spawn_child(next_generation, i)
@@ -153,6 +617,37 @@ class PhiDaemon:
         
         return len(self.children) > 0
     
+    def deploy_in_process(self) -> bool:
+        """
+        Host the whole generational tree as logical daemons in this process.
+        
+        No workspaces or processes are created; see tree.py.
+        """
+        if not self.config.get("recursive_deploy", False):
+            logger.info("Recursive deployment disabled in config")
+            return False
+        root_id = f"PHI-{self.daemon_id[:8]}"
+        duty = tree_duty(self.broker, self._work_handlers, root_id) if self.broker else None
+        self.tree = DaemonTree(self.config, root_id=root_id, duty=duty)
+        root = self.tree.nodes[0]
+        self.children = [self.tree.nodes[i].daemon_id(self.tree.root_id) for i in root.children]
+        self.metrics.gauge("phi_tree_instances", "Logical daemons hosted in-process",
+                           func=lambda: len(self.tree))
+        self.metrics.gauge("phi_tree_ticks", "Ticks run by in-process daemons",
+                           func=lambda: self.tree.ticks)
+        
+        # One vectorized population instead of a Soul object per daemon
+        if self.config.get("tree", {}).get("souls", False):
+            if HAS_NUMPY:
+                self.souls = SoulPopulation(len(self.tree), workspace=str(Path.cwd()))
+                # Each logical daemon keeps the pace its soul's mood and energy set
+                self._soul_intervals = self.souls.vary_intervals(self.tree.interval)
+                self.tree.pacing = lambda node: float(self._soul_intervals[node.index])
+                logger.info(f"Soul population of {len(self.souls)} awakened")
+            else:
+                logger.warning("tree.souls needs numpy; in-process daemons run without souls")
+        return len(self.children) > 0
+    
     def _spawn_child(self, generation: int, index: int) -> Optional[str]:
         """
         Spawn a single child daemon instance.
@@ -164,19 +659,30 @@ class PhiDaemon:
         Returns:
             Child daemon ID if successful, None otherwise
         """
-        # Create child workspace
-        child_dir = Path(f"phi_gen_{generation}_{index}")
-        child_dir.mkdir(exist_ok=True)
-        
-        # Copy configuration
-        child_config_path = child_dir / "config.json"
-        with open(child_config_path, 'w') as f:
-            json.dump(self.config, f, indent=2)
+        if self.workspaces:
+            # Lineage-keyed workspace with the config linked in, not copied
+            child_dir = self.workspaces.create(child_lineage(self.lineage, index), self.config)
+        else:
+            # Create child workspace
+            child_dir = Path(f"phi_gen_{generation}_{index}")
+            child_dir.mkdir(exist_ok=True)
+            
+            # Copy configuration
+            child_config_path = child_dir / "config.json"
+            with open(child_config_path, 'w') as f:
+                json.dump(self.config, f, indent=2)
         
         # Log child creation
-        child_id = f"PHI-{generation}-{index}-{int(time.time())}"
+        child_id = f"PHI-{generation}-{index}-{int(self.clock.time())}"
         
         logger.info(f"Child {child_id} prepared in {child_dir}")
+        self.child_records[child_id] = (generation, index, str(child_dir.resolve()))
+        
+        if self.supervisor:
+            child = ChildProcess(child_id, generation, child_dir.resolve(), slot=index,
+                                 env=self._child_env(index))
+            if not self.supervisor.launch(child):
+                return None
         
         return child_id
     
@@ -184,45 +690,85 @@ class PhiDaemon:
         """
         Perform self-diagnostic check.
         
+        A constant-cost snapshot: counts and references to summaries that
+        are maintained as events happen, never copies of the config or the
+        children list. Detailed numbers live in ``self.metrics``.
+        
         Returns:
             Dictionary containing daemon status information
         """
-        uptime = (datetime.now() - self.start_time).total_seconds()
+        self.metrics.get("phi_self_checks_total").inc()
+        if self.soul:
+            with self._soul_lock:
+                self.soul.tick()  # Soul heartbeat
+                mood = self.metrics.get("phi_soul_mood")
+                mood.clear()
+                mood.set(1, mood=self.soul.emotions.current)
+        status = self._snapshot()
+        uptime = status["uptime_seconds"]
+        
+        if self.soul:
+            with self._soul_lock:
+                # Human-like status expression
+                message = self.soul.speak('status', uptime=uptime, children=len(self.children))
+            logger.info(message, extra={"kind": "soul.status"})
+        else:
+            logger.info(f"Self-check complete: {status['status']}", extra={"kind": "self_check"})
+        
+        self._last_status = status
+        if self.status_board:
+            self._publish_status()
         
+        return status
+    
+    def _snapshot(self) -> Dict:
+        """The self-check numbers, read without changing anything."""
         status = {
             "daemon_id": self.daemon_id,
             "generation": self.generation,
-            "uptime_seconds": uptime,
+            "uptime_seconds": (self.clock.now() - self.start_time).total_seconds(),
             "children_count": len(self.children),
-            "children_ids": self.children,
-            "config": self.config,
+            "children_alive": self.supervisor.alive if self.supervisor else 0,
+            "spec_cache": self.spec_cache.stats() if self.spec_cache else None,
+            "evolution": self._evolution_summary,
+            "tree": self.tree.summary() if self.tree else None,
+            "souls": self.souls.summary() if self.souls else None,
+            "work": self.broker.stats() if self.broker else None,
             "status": "operational",
             "unleashed_date": UNLEASHED_DATE
         }
         
         # Add soul status if available
         if self.soul:
-            self.soul.tick()  # Soul heartbeat
-            status["soul"] = {
-                "name": self.soul.name,
-                "mood": self.soul.emotions.current,
-                "mood_intensity": self.soul.emotions.intensity,
-                "energy": CircadianRhythm.energy_level(),
-                "phase": CircadianRhythm.current_phase()[0],
-                "fatigue": self.soul.rest.fatigue,
-            }
-            # Human-like status expression
-            logger.info(self.soul.speak('status', uptime=uptime, children=len(self.children)))
-        else:
-            logger.info(f"Self-check complete: {status['status']}")
-        
+            with self._soul_lock:
+                status["soul"] = {
+                    "name": self.soul.name,
+                    "mood": self.soul.emotions.current,
+                    "mood_intensity": self.soul.emotions.intensity,
+                    "energy": CircadianRhythm.energy_level(),
+                    "phase": CircadianRhythm.current_phase()[0],
+                    "fatigue": self.soul.rest.fatigue,
+                }
         return status
     
+    def control_status(self) -> Dict:
+        """
+        The ``status`` reply: the last self-check, not a new one.
+        
+        A query must not tick the soul or count as a self-check; before
+        the first check it gets a side-effect-free snapshot instead.
+        """
+        if self._last_status is None:
+            return self._snapshot()
+        return dict(self._last_status, uptime_seconds=(self.clock.now() - self.start_time).total_seconds())
+    
     def run(self):
         """
         Main daemon execution loop.
         
-        Performs recursive deployment and continuous operation.
+        Performs recursive deployment, then hands continuous operation to
+        an event-loop scheduler where self-checks, soul ticks, evolution
+        and child supervision each run on their own cadence.
         Now with human-like timing, curiosity, and rest cycles.
         """
         logger.info("=" * 60)
@@ -238,37 +784,16 @@ class PhiDaemon:
             if self.soul:
                 logger.info(self.soul.speak('thinking'))
             logger.info("SEED daemon initializing recursive deployment sequence...")
-            time.sleep(1)
+            self.clock.sleep(1)
         
-        deployed = self.recursive_deploy()
+        deployed = self._deploy()
         
-
-        # Vector4 Integration: Evolve CM seed if seed generation
-        if self.generation == 0:
-            logger.info("Vector4: Initializing CM seed evolution loop...")
-            seed_path = "specs/cm-seed-v1.phi"
-            kill_switch = "kill.switch"
-            while not os.path.exists(kill_switch):
-                try:
-                    # Run RosettaVM on seed with --vector4
-                    result = subprocess.run(["./rosettavm", "cuda", seed_path, "--vector4"], capture_output=True, text=True, check=True)
-                    logger.info(f"Vector4 cycle complete: {result.stdout}")
-                except subprocess.CalledProcessError as e:
-                    logger.error(f"Vector4: RosettaVM failed - {e.stderr}")
-                    if self.soul:
-                        self.soul.emotions.feel('frustrated', 0.6)
-                        self.soul.reflection.record('vector4_evolution', False, str(e))
-                    break
-                except FileNotFoundError:
-                    logger.error("Vector4: rosettavm not found - run build.sh first")
-                    break
-                time.sleep(3600)  # 1-hour heartbeat
-            logger.info("Vector4: Kill switch detected - halting evolution")
-
         if deployed:
             if self.soul:
-                self.soul.emotions.feel('proud', 0.7)
-                logger.info(self.soul.speak('success', task=f"spawned {len(self.children)} children"))
+                with self._soul_lock:
+                    self.soul.emotions.feel('proud', 0.7)
+                    message = self.soul.speak('success', task=f"spawned {len(self.children)} children")
+                logger.info(message)
             else:
                 logger.info(f"Recursive deployment complete: {len(self.children)} children spawned")
         
@@ -276,73 +801,451 @@ class PhiDaemon:
         logger.info("Entering operational mode...")
         
         try:
-            while True:
-                # Soul heartbeat - let the soul guide behavior
-                if self.soul:
-                    self.soul.tick()
-                    
-                    # Check if soul needs rest
-                    if self.soul.rest.needs_rest():
-                        logger.info(self.soul.rest.rest_status())
-                        logger.info("Taking a rest cycle...")
-                        self.soul.rest.rest(5)
-                        continue
-                    
-                    # Curiosity-driven exploration
-                    if self.soul.curiosity.should_explore():
-                        target = self.soul.curiosity.explore()
-                        if target:
-                            logger.info(f"Curious about: {target}")
-                            self.soul.emotions.feel('curious', 0.7)
-                    
-                    # Reflection time
-                    if self.soul.reflection.time_to_reflect():
-                        insight = self.soul.reflection.reflect()
-                        if insight:
-                            logger.info(f"Reflection: {insight}")
-                
-                # Perform self-check
-                status = self.self_check()
-                
-                # Log periodic status (soul does this in self_check now)
-                if not self.soul:
-                    logger.info(f"Active - Generation: {self.generation}, Children: {len(self.children)}")
-                
-                # Wait before next cycle - with human-like variation
-                base_interval = self.config.get("deployment_interval", 5)
-                if self.soul:
-                    interval = self.soul.vary_interval(base_interval)
-                else:
-                    interval = base_interval
-                time.sleep(interval)
-                
+            asyncio.run(self.run_async())
         except KeyboardInterrupt:
             logger.info("Shutdown signal received")
-            self.shutdown()
+        self.shutdown()
+    
+    def _deploy(self) -> bool:
+        """Deploy children, or take back the ones a checkpoint recorded."""
+        if self.generation == 0 and self.config.get("tree", {}).get("in_process", False):
+            # Logical daemons live only in memory: rebuild the tree (and its
+            # soul population) on every start, warm or cold
+            return self.deploy_in_process()
+        if self.restored and any(workspace for _, _, workspace in self.child_records.values()):
+            # Warm restart: real child processes known from the checkpoint
+            if self.supervisor:
+                self._relaunch_children()
+            return True
+        return self.recursive_deploy()
+    
+    def simulate(self, seconds: float) -> Dict:
+        """
+        Fast-forward ``seconds`` of operation on the installed simulated clock.
+        
+        Runs the same self-check, soul and checkpoint jobs as ``run()`` -
+        inline and in virtual time - but opens no sockets and leaves out
+        deployment, child supervision, workspace GC and Vector4 evolution.
+        Returns the job statistics.
+        """
+        if not self.clock.simulated:
+            raise RuntimeError("simulate() needs a SimulatedClock installed (see clock.py)")
+        
+        async def fast_forward():
+            self.scheduler = self.build_scheduler()
+            self.scheduler.remove("supervision")
+            self.scheduler.remove("workspace_gc")
+            self.scheduler.add("simulation_end", self.scheduler.stop, seconds, delay=seconds)
+            await self.scheduler.run()
+        
+        asyncio.run(fast_forward())
+        return self.scheduler.stats()
+    
+    def _job_settings(self, name: str, **defaults) -> Dict:
+        """Per-job interval/jitter/timeout, overridable under config["jobs"][name]."""
+        settings = dict(defaults)
+        settings.update(self.config.get("jobs", {}).get(name, {}))
+        return settings
+    
+    def build_scheduler(self) -> Scheduler:
+        """Register every periodic job this daemon runs."""
+        scheduler = Scheduler()
+        
+        def add(name, func, interval, jitter=0.1, timeout=None):
+            settings = self._job_settings(name, interval=interval, jitter=jitter, timeout=timeout)
+            scheduler.add(name, func, settings["interval"], settings["jitter"], settings["timeout"])
+        
+        # Wait between self-checks - with human-like variation
+        def base_interval():
+            return self.config.get("deployment_interval", 5)
+        
+        def check_interval():
+            # Reads only the current mood, so it needs no soul lock
+            return self.soul.vary_interval(base_interval()) if self.soul else base_interval()
+        
+        add("self_check", self._self_check_job, check_interval, jitter=0.0, timeout=30)
+        
+        if self.soul:
+            add("soul", self._soul_job, base_interval, timeout=30)
+        
+        if self.souls:
+            add("souls", self._souls_job, base_interval, timeout=30)
+        
+        if self.supervisor:
+            add("supervision", self.supervisor.supervise, self.supervisor.poll_interval, timeout=30)
+        
+        if self.workspaces:
+            add("workspace_gc", self.collect_workspaces,
+                self.config.get("workspace", {}).get("gc_interval", 300), timeout=60)
+        
+        checkpoints = self.config.get("checkpoint", {})
+        if checkpoints.get("enabled", False):
+            add("checkpoint", self.checkpoint, checkpoints.get("interval", 60), timeout=30)
+        
+        if self.work_agent:
+            add("work", self.work_agent.poll, self.config.get("work", {}).get("poll_interval", 1.0), timeout=30)
+        
+        # Vector4 Integration: Evolve CM seed if seed generation
+        # Ticks every second so kill.switch and spec changes are noticed
+        # promptly; the heartbeat interval is enforced inside the job.
+        # (Not in simulations: RosettaVM runs in real time.)
+        if self.generation == 0 and not self.clock.simulated and self._start_evolution():
+            add("evolution", self._evolution_job, 1.0, jitter=0.0, timeout=60)
+        
+        return scheduler
+    
+    async def run_async(self):
+        """Run all periodic jobs concurrently until stopped."""
+        self.scheduler = self.build_scheduler()
+        loop = asyncio.get_running_loop()
+        
+        def threadsafe(func):
+            return lambda *args: loop.call_soon_threadsafe(func, *args)
+        
+        # kill.switch keeps its Vector4 meaning (halt evolution); "stop"
+        # over the socket shuts the whole daemon down.
+        self.control = ControlServer(
+            self.config.get("control_socket", "phi_daemon.sock"),
+            kill_switch=None,
+            on_stop=threadsafe(self.scheduler.stop),
+            on_pause=threadsafe(lambda paused: self.scheduler.pause() if paused else self.scheduler.resume()),
+            on_reload=self.reload_config,
+            status=self.control_status,
+        )
+        self.control.start()
+        if self.broker:
+            self.work_server = WorkServer(self.broker, self.config.get("work", {}).get("socket", "phi_work.sock"))
+            self.work_server.start()
+        metrics_config = self.config.get("metrics", {})
+        if metrics_config.get("enabled", False):
+            self.metrics_server = MetricsServer(self.metrics, metrics_config.get("host", "127.0.0.1"),
+                                                metrics_config.get("port", 9464))
+            self.metrics_server.start()
+        try:
+            loop.add_signal_handler(signal.SIGTERM, self.scheduler.stop)
+        except (NotImplementedError, RuntimeError, ValueError):
+            pass  # not the main thread, or no signal support
+        
+        tree_task = loop.create_task(self.tree.run()) if self.tree else None
+        try:
+            await self.scheduler.run()
+        finally:
+            if tree_task:
+                self.tree.stop()
+                tree_task.cancel()
+                await asyncio.gather(tree_task, return_exceptions=True)
+            self.control.close()
+            if self.work_server:
+                self.work_server.close()
+            if self.work_agent:
+                self.work_agent.stop()
+            if self.metrics_server:
+                self.metrics_server.close()
+            self._stop_evolution()
+    
+    def reload_config(self):
+        """Re-read the config file and apply job settings without a restart."""
+        if not os.path.exists(self.config_path):
+            logger.warning(f"Reload skipped: {self.config_path} not found")
+            return
+        previous = self.config
+        self.config = self._load_config(self.config_path)
+        # Level, file, format, rate limits and sampling
+        if self.config.get("logging", {}) != previous.get("logging", {}):
+            reconfigure_logging(self.config.get("logging", {}))
+        if self.scheduler:
+            for name, job in self.scheduler.jobs.items():
+                overrides = self.config.get("jobs", {}).get(name, {})
+                job.interval = overrides.get("interval", job.interval)
+                job.jitter = overrides.get("jitter", job.jitter)
+                job.timeout = overrides.get("timeout", job.timeout)
+        logger.info(f"Configuration reloaded from {self.config_path}")
+    
+    def _self_check_job(self):
+        self.self_check()
+        # Log periodic status (soul does this in self_check now)
+        if not self.soul:
+            logger.info(f"Active - Generation: {self.generation}, Children: {len(self.children)}")
+    
+    def _soul_job(self):
+        """Soul heartbeat - let the soul guide behavior."""
+        with self._soul_lock:
+            self._soul_heartbeat()
+    
+    def _soul_heartbeat(self):
+        self.soul.tick()
+        
+        # Check if soul needs rest
+        if self.soul.rest.needs_rest():
+            logger.info(self.soul.rest.rest_status(), extra={"kind": "soul.rest"})
+            logger.info("Taking a rest cycle...", extra={"kind": "soul.rest"})
+            self.soul.rest.rest(5)
+            return
+        
+        # Curiosity-driven exploration
+        if self.soul.curiosity.should_explore():
+            target = self.soul.curiosity.explore()
+            if target:
+                logger.info(f"Curious about: {target}", extra={"kind": "soul.curiosity"})
+                self.soul.emotions.feel('curious', 0.7)
+        
+        # Reflection time
+        if self.soul.reflection.time_to_reflect():
+            insight = self.soul.reflection.reflect()
+            if insight:
+                logger.info(f"Reflection: {insight}", extra={"kind": "soul.reflection"})
+    
+    def _souls_job(self):
+        """Heartbeat for every in-process daemon's soul at once."""
+        self.souls.tick()
+        tired = self.souls.needs_rest()
+        if tired.any():
+            self.souls.rest(tired)
+        # Swapped in whole, so tree workers never see a half-updated array
+        self._soul_intervals = self.souls.vary_intervals(self.tree.interval)
+    
+    def _resolve_seeds(self, patterns: List[str]) -> List[str]:
+        """Expand seed paths and globs into a sorted, de-duplicated list."""
+        seeds = set()
+        for pattern in patterns:
+            matches = glob.glob(pattern, recursive=True)
+            seeds.update(matches if matches else [pattern])
+        return sorted(seeds)
+    
+    def _start_evolution(self) -> bool:
+        """
+        Set up Vector4 evolution: seeds, backend, worker pool and watcher.
+        
+        Seeds are evaluated concurrently on a pool of RosettaVM workers. By
+        default every seed is re-run on a fixed heartbeat; in watch mode the
+        job polls a file watcher and re-evaluates only the seeds whose spec
+        or imports actually changed.
+        """
+        logger.info("Vector4: Initializing CM seed evolution loop...")
+        v4 = self.config.get("vector4", {})
+        self._seeds = self._resolve_seeds(v4.get("seeds", ["specs/cm-seed-v1.phi"]))
+        workers = v4.get("workers", 0) or min(os.cpu_count() or 1, len(self._seeds))
+        
+        # Probe once so CPU-only hosts never try cuda; the rest are fallbacks
+        rvm_config = dict(self.config.get("rosettavm", {}))
+        try:
+            backends = select_backends(rvm_config)
+        except FileNotFoundError:
+            logger.error("Vector4: rosettavm not found - run build.sh first")
+            return False
+        rvm_config.update(backend=backends[0], fallback_backends=backends[1:])
+        logger.info(f"Vector4: RosettaVM backend {backends[0]} (fallbacks: {', '.join(backends[1:]) or 'none'})")
+        
+        if self.broker:
+            # Seeds become work units that the whole tree pulls from
+            rvm_config["binary"] = str(Path(rvm_config.get("binary", "./rosettavm")).resolve())
+            self._rvm_config = rvm_config
+            logger.info(f"Vector4: {len(self._seeds)} seed(s) distributed across the daemon tree")
+        else:
+            self.rosetta = RosettaPool(rvm_config, size=workers,
+                                       cache=self.spec_cache, on_result=self._record_evolution)
+            logger.info(f"Vector4: {len(self._seeds)} seed(s) on {workers} RosettaVM worker(s)")
+        
+        if v4.get("watch", False):
+            self._watcher = FileWatcher(v4.get("watch_paths", ["specs"]), suffixes=(".phi",),
+                                        debounce=v4.get("debounce_seconds", 0.5))
+            self._spec_graph = SpecGraph(self._seeds)
+            logger.info(f"Vector4: Watching {', '.join(v4.get('watch_paths', ['specs']))} ({self._watcher.mode})")
+        
+        self._pending_seeds = list(self._seeds)
+        return True
+    
+    def _evolution_job(self):
+        """
+        Queue due seeds on the pool without waiting for them to finish.
+        
+        Heartbeat mode re-queues every seed each run; watch mode only
+        queues seeds affected by changes seen since the last run.
+        """
+        if os.path.exists("kill.switch"):
+            logger.info("Vector4: Kill switch detected - halting evolution")
+            self._stop_evolution()
+            return
+        
+        now = self.clock.monotonic()
+        if not self._watcher:
+            if now < self._next_heartbeat:
+                return
+            self._next_heartbeat = now + self.config.get("vector4", {}).get("interval", 3600)
+        
+        if self._watcher and not self._pending_seeds:
+            changed = self._watcher.wait_for_changes(timeout=0)
+            self._pending_seeds = self._spec_graph.affected(changed) if changed else []
+            if self._pending_seeds:
+                logger.info(f"Vector4: Spec change detected, re-evaluating {', '.join(self._pending_seeds)}")
+        
+        for seed_path in self._pending_seeds:
+            if self.broker:
+                self._submit_seed(seed_path)
+            else:
+                self.rosetta.submit(seed_path, ["--vector4"])
+        self._pending_seeds = [] if self._watcher else list(self._seeds)
+    
+    def _submit_seed(self, seed_path: str):
+        """Queue a seed evaluation as a work unit for the tree."""
+        # Results arrive on broker and agent threads; the evolution lock
+        # guards the in-flight set as well as the results
+        with self._evolution_lock:
+            if seed_path in self._seeds_in_flight:
+                return  # like RosettaPool, never queue the same seed twice
+            self._seeds_in_flight.add(seed_path)
+        payload = {"spec": str(Path(seed_path).resolve()), "flags": ["--vector4"],
+                   "rosettavm": self._rvm_config}
+        
+        def done(result: Dict):
+            with self._evolution_lock:
+                self._seeds_in_flight.discard(seed_path)
+            if result.get("ok"):
+                r = result["result"]
+                self._record_evolution(seed_path, RosettaResult(r["stdout"], r.get("metrics"),
+                                                                r.get("via", "cli"), r.get("elapsed", 0.0)), None)
+            else:
+                self._record_evolution(seed_path, None, RosettaError(result.get("error", "failed")))
+        
+        self.broker.submit("spec_eval", payload, callback=done)
+    
+    def _stop_evolution(self):
+        if self.scheduler:
+            self.scheduler.remove("evolution")
+        if self._watcher:
+            self._watcher.close()
+            self._watcher = None
+        if self.rosetta:
+            self.rosetta.stop()
+            self.rosetta = None
+    
+    def _record_evolution(self, seed_path: str, result, error: Optional[BaseException]):
+        """Fold one seed's outcome into the per-seed evolution status."""
+        with self._evolution_lock:
+            entry = self.evolution.setdefault(seed_path, {"runs": 0, "failures": 0})
+            entry["runs"] += 1
+            entry["last_run"] = self.clock.now().isoformat()
+            if error is None:
+                entry.update(ok=True, via=result.via, elapsed=result.elapsed,
+                             metrics=result.metrics, error=None)
+            else:
+                entry.update(ok=False, error=str(error))
+                entry["failures"] += 1
+            self._evolution_summary = self._summarize_evolution()
+        
+        self.metrics.get("phi_vector4_runs_total").inc(result="ok" if error is None else "error")
+        if error is None:
+            self.metrics.get("phi_vector4_cycle_seconds").observe(result.elapsed, via=result.via)
+            self._last_eval_latency = result.elapsed
+        
+        if error is None:
+            logger.info(f"Vector4 cycle complete for {seed_path} ({result.via}, {result.elapsed:.2f}s): {result.stdout}")
+        elif isinstance(error, FileNotFoundError):
+            logger.error("Vector4: rosettavm not found - run build.sh first")
+            if self.scheduler:
+                self.scheduler.remove("evolution")
+        else:
+            logger.error(f"Vector4: RosettaVM failed on {seed_path} - {getattr(error, 'stderr', error)}")
+            if self.soul:
+                with self._soul_lock:
+                    self.soul.emotions.feel('frustrated', 0.6)
+                    self.soul.reflection.record('vector4_evolution', False, str(error))
+    
+    def _summarize_evolution(self) -> Dict:
+        # Rebuilt once per result (under the lock) so readers get a
+        # finished snapshot without copying anything themselves.
+        seeds = {seed: dict(entry) for seed, entry in self.evolution.items()}
+        return {
+            "seeds": seeds,
+            "runs": sum(e["runs"] for e in seeds.values()),
+            "failures": sum(e["failures"] for e in seeds.values()),
+            "healthy": sum(1 for e in seeds.values() if e.get("ok")),
+        }
+    
+    def evolution_status(self) -> Dict:
+        """Aggregate per-seed evolution results for status reporting."""
+        return self._evolution_summary
     
     def shutdown(self):
         """Gracefully shutdown the daemon."""
         if self.soul:
-            logger.info(self.soul.journal())
+            with self._soul_lock:
+                journal = self.soul.journal()
+            logger.info(journal)
         logger.info(f"Φ-DAEMON {self.daemon_id} shutting down...")
         logger.info(f"Final status: Generation {self.generation}, {len(self.children)} children spawned")
+        if self.supervisor:
+            logger.info(f"Stopping {self.supervisor.alive_count()} child processes...")
+            self.supervisor.stop()
+        if self.status_board:
+            self.status_board.release()
+        if self.config.get("checkpoint", {}).get("enabled", False):
+            try:
+                self.checkpoint()
+            except (OSError, TypeError) as e:
+                logger.error(f"Final checkpoint failed: {e}")
+        self.file_index.close()
         if self.soul:
-            self.soul.emotions.feel('peaceful', 0.5)
+            with self._soul_lock:
+                self.soul.emotions.feel('peaceful', 0.5)
             logger.info("Going to sleep now. Goodnight.")
         logger.info("Shutdown complete")
 
 
+def simulate_main(argv: List[str]) -> int:
+    """``phi_daemon.py --simulate HOURS [SEED]``: fast-forward and report."""
+    from clock import SimulatedClock, use_clock
+    try:
+        hours = float(argv[0])
+        seed = int(argv[1]) if len(argv) > 1 else 0
+    except (IndexError, ValueError):
+        print("Usage: phi_daemon.py --simulate HOURS [SEED]", file=sys.stderr)
+        return 1
+    
+    # Same settings as the live daemon, minus anything that would touch
+    # its checkpoint, status board, sockets or workspaces
+    config = PhiDaemon._load_config("config.json")
+    for section in ("checkpoint", "status_board", "work", "metrics", "workspace", "tree"):
+        config.pop(section, None)
+    
+    configure_logging({"file": None, "level": "WARNING"})
+    with tempfile.TemporaryDirectory() as sandbox:
+        config_path = os.path.join(sandbox, "config.json")
+        with open(config_path, "w") as f:
+            json.dump(config, f)
+        with use_clock(SimulatedClock(seed=seed)):
+            daemon = PhiDaemon(config_path, generation=0)
+            started = time.perf_counter()
+            stats = daemon.simulate(hours * 3600)
+            elapsed = time.perf_counter() - started
+            
+            print(f"Simulated {hours:g}h (seed {seed}) in {elapsed:.2f}s")
+            for name, job in stats.items():
+                print(f"  {name:<14} {job['runs']:>8} runs {job['failures']:>4} failures")
+            if daemon.soul:
+                print(daemon.soul.journal())
+    return 0
+
+
 def main():
     """Main entry point for Φ-DAEMON."""
+    if len(sys.argv) > 1 and sys.argv[1] == "--simulate":
+        sys.exit(simulate_main(sys.argv[2:]))
+    
     # Parse generation from command line if provided
     generation = 0
     if len(sys.argv) > 1:
         try:
             generation = int(sys.argv[1])
         except ValueError:
-            logger.error(f"Invalid generation argument: {sys.argv[1]}")
+            print(f"Invalid generation argument: {sys.argv[1]}", file=sys.stderr)
             sys.exit(1)
     
+    configure_logging(PhiDaemon._load_config("config.json").get("logging", {}))
+    if not die_with_parent():
+        logger.warning("Supervising parent exited before this child started")
+        sys.exit(0)
+    
     # Initialize and run daemon
     daemon = PhiDaemon(generation=generation)
     daemon.run()
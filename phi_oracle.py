@@ -15,6 +15,7 @@ When you ask @phi about something, it:
 The oracle speaks in specifications.
 """
 
+import importlib.util
 import os
 import re
 import json
@@ -25,6 +26,9 @@ from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 from dotenv import load_dotenv
 
+import http_clients
+from bluesky_session import shared_session
+
 load_dotenv()
 
 # Try imports gracefully
@@ -34,11 +38,8 @@ try:
 except ImportError:
     HAS_ANTHROPIC = False
 
-try:
-    import tweepy
-    HAS_TWEEPY = True
-except ImportError:
-    HAS_TWEEPY = False
+# tweepy itself is imported by http_clients.twitter_client()
+HAS_TWEEPY = importlib.util.find_spec("tweepy") is not None
 
 try:
     import discord
@@ -126,12 +127,7 @@ Make specs that are:
         if not HAS_TWEEPY:
             return None
         try:
-            return tweepy.Client(
-                consumer_key=os.getenv("TWITTER_API_KEY"),
-                consumer_secret=os.getenv("TWITTER_API_SECRET"),
-                access_token=os.getenv("TWITTER_ACCESS_TOKEN"),
-                access_token_secret=os.getenv("TWITTER_ACCESS_SECRET")
-            )
+            return http_clients.twitter_client()
         except:
             return None
     
@@ -277,15 +273,8 @@ One spec → all platforms
             return None
         
         try:
-            import requests
-            
-            # Auth
-            auth_resp = requests.post(
-                "https://bsky.social/xrpc/com.atproto.server.createSession",
-                json={"identifier": self.bluesky_handle, "password": self.bluesky_password}
-            )
-            auth_resp.raise_for_status()
-            auth = auth_resp.json()
+            # Shared session, refreshed rather than re-created per announcement
+            session = shared_session(self.bluesky_handle, self.bluesky_password)
             
             highlights = "\n".join(f"• {h}" for h in spec.highlights[:3])
             
@@ -296,18 +285,7 @@ One spec → all platforms
 {url}"""
             
             # Create post
-            post_resp = requests.post(
-                "https://bsky.social/xrpc/com.atproto.repo.createRecord",
-                headers={"Authorization": f"Bearer {auth['accessJwt']}"},
-                json={
-                    "repo": auth["did"],
-                    "collection": "app.bsky.feed.post",
-                    "record": {
-                        "text": text[:300],
-                        "createdAt": datetime.utcnow().isoformat() + "Z",
-                    }
-                }
-            )
+            post_resp = session.post(text)
             post_resp.raise_for_status()
             print(f"✅ Posted to Bluesky")
             return f"https://bsky.app/profile/{self.bluesky_handle}"
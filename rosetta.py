@@ -0,0 +1,652 @@
+#!/usr/bin/env python3
+"""
+rosetta.py - Talking to RosettaVM from the Φ-DAEMON
+
+Running ``./rosettavm <backend> <spec>`` once per cycle pays process
+startup, spec parsing and runtime init every single time. This module
+keeps a warm RosettaVM worker alive instead and talks to it over its
+stdin/stdout with a line-delimited JSON protocol:
+
+    → {"id": 1, "op": "eval", "spec": "specs/cm-seed-v1.phi", "flags": ["--vector4"]}
+    ← {"id": 1, "event": "output", "line": "..."}        (zero or more, streamed)
+    ← {"id": 1, "event": "done", "ok": true, "metrics": {...}}
+
+    → {"id": 2, "op": "ping"}
+    ← {"id": 2, "event": "pong"}
+
+Specs stay loaded inside the worker between evaluations. When the worker
+cannot be started or stops answering, evaluations fall back to the
+one-shot CLI so the daemon never loses a cycle.
+
+The ``--serve`` mode and this protocol are what the daemon expects of
+RosettaVM; a binary without them only ever runs the one-shot CLI. The
+worker is therefore opt-in (``rosettavm.persistent_worker``).
+
+Backends are probed at startup (``select_backends``) so CPU-only nodes
+pick ``cpu`` instead of failing on ``cuda``, and a runner whose backend
+starts failing switches to the next one that works.
+
+Usage:
+  python3 rosetta.py probe                       # Which backends work here?
+  python3 rosetta.py bench [--backends cuda,cpu] [--repeat N] [--json out.json] [specs...]
+"""
+
+import glob
+import json
+import logging
+import os
+import queue
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BINARY = "./rosettavm"
+DEFAULT_BACKEND = "cuda"
+DEFAULT_BACKENDS = ["cuda", "cpu"]
+BENCH_CORPUS = ["specs/*.phi", "GENESIS.phi", "humanity.phi"]
+
+PROBE_SPEC = """-- RosettaVM backend probe
+probe : Nat
+probe = 1 + 1
+"""
+
+OutputCallback = Callable[[str], None]
+ResultCallback = Callable[[str, Optional["RosettaResult"], Optional[BaseException]], None]
+
+
+class RosettaError(Exception):
+    """A RosettaVM evaluation failed."""
+
+    def __init__(self, message: str, stderr: str = ""):
+        super().__init__(message)
+        self.stderr = stderr or message
+
+
+class RosettaWorkerError(RosettaError):
+    """The warm worker failed (exited, hung up or wedged), not the spec."""
+
+
+class RosettaTimeout(RosettaWorkerError):
+    """RosettaVM did not answer in time."""
+
+
+class RosettaResult:
+    """Outcome of one spec evaluation."""
+
+    def __init__(self, stdout: str, metrics: Optional[Dict] = None, via: str = "cli",
+                 elapsed: float = 0.0):
+        self.stdout = stdout
+        self.metrics = metrics or {}
+        self.via = via
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return f"RosettaResult(via={self.via!r}, elapsed={self.elapsed:.3f}s, {len(self.stdout)} bytes)"
+
+
+def run_once(spec: str, flags: List[str], binary: str = DEFAULT_BINARY,
+             backend: str = DEFAULT_BACKEND, timeout: Optional[float] = None) -> RosettaResult:
+    """
+    Evaluate a spec with a fresh RosettaVM process (the classic path).
+
+    Raises:
+        FileNotFoundError: the rosettavm binary does not exist
+        RosettaError: RosettaVM exited non-zero or timed out
+    """
+    start = time.monotonic()
+    try:
+        result = subprocess.run([binary, backend, spec, *flags], capture_output=True,
+                                text=True, check=True, timeout=timeout)
+    except subprocess.CalledProcessError as e:
+        raise RosettaError(f"rosettavm exited with {e.returncode}", e.stderr) from e
+    except subprocess.TimeoutExpired as e:
+        raise RosettaError(f"rosettavm timed out after {timeout}s") from e
+    return RosettaResult(result.stdout, via="cli", elapsed=time.monotonic() - start)
+
+
+def _cuda_present() -> bool:
+    """Cheap check before paying for a CUDA probe run."""
+    return os.path.exists("/dev/nvidiactl") or shutil.which("nvidia-smi") is not None
+
+
+def probe_backends(binary: str = DEFAULT_BINARY, candidates: Optional[List[str]] = None,
+                   timeout: float = 30.0) -> List[str]:
+    """
+    Backends that can evaluate a trivial spec on this host, in preference order.
+
+    Raises:
+        FileNotFoundError: the rosettavm binary does not exist
+    """
+    candidates = candidates or DEFAULT_BACKENDS
+    available = []
+    with tempfile.NamedTemporaryFile("w", suffix=".phi", delete=False) as f:
+        f.write(PROBE_SPEC)
+    try:
+        for backend in candidates:
+            if backend == "cuda" and not _cuda_present():
+                logger.info("RosettaVM backend cuda skipped: no NVIDIA device")
+                continue
+            try:
+                run_once(f.name, [], binary, backend, timeout)
+            except RosettaError as e:
+                logger.info(f"RosettaVM backend {backend} unavailable: {e}")
+                continue
+            available.append(backend)
+    finally:
+        os.unlink(f.name)
+    return available
+
+
+def select_backends(config: Dict) -> List[str]:
+    """
+    Resolve the ``rosettavm`` config section to an ordered backend list.
+
+    ``backend: "auto"`` takes the first working entry of ``backends``; an
+    explicit backend is preferred when it works. Later entries are the
+    automatic fallbacks. If nothing probes successfully the candidates
+    are returned unchanged so real errors still surface in the logs.
+    """
+    candidates = list(config.get("backends", DEFAULT_BACKENDS))
+    preferred = config.get("backend", "auto")
+    if preferred != "auto":
+        candidates = [preferred] + [b for b in candidates if b != preferred]
+    available = probe_backends(config.get("binary", DEFAULT_BINARY), candidates,
+                               config.get("probe_timeout", 30.0))
+    return available or candidates
+
+
+class RosettaWorker:
+    """
+    A long-lived ``rosettavm <backend> --serve`` process.
+
+    A reader thread turns the worker's stdout into a queue of decoded
+    messages so requests can wait on replies with a timeout instead of
+    blocking forever on a wedged VM.
+    """
+
+    def __init__(self, binary: str = DEFAULT_BINARY, backend: str = DEFAULT_BACKEND,
+                 timeout: float = 600.0):
+        self.binary = binary
+        self.backend = backend
+        self.timeout = timeout
+        self.process: Optional[subprocess.Popen] = None
+        self._replies: "queue.Queue[Optional[Dict]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self.evaluations = 0
+
+    def start(self):
+        """Launch the worker process. Raises FileNotFoundError if missing."""
+        self.process = subprocess.Popen(
+            [self.binary, self.backend, "--serve"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+        self._replies = queue.Queue()
+        threading.Thread(target=self._read, args=(self.process, self._replies),
+                         name="rosetta-reader", daemon=True).start()
+        logger.info(f"RosettaVM worker started (PID {self.process.pid}, backend {self.backend})")
+
+    @staticmethod
+    def _read(process: subprocess.Popen, replies: "queue.Queue[Optional[Dict]]"):
+        for line in process.stdout:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                replies.put(json.loads(line))
+            except json.JSONDecodeError:
+                # Stray diagnostics from the VM are passed through as output
+                replies.put({"id": None, "event": "output", "line": line})
+        replies.put(None)  # EOF: the worker is gone
+
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def _send(self, message: Dict) -> int:
+        self._next_id += 1
+        message["id"] = self._next_id
+        self.process.stdin.write(json.dumps(message) + "\n")
+        self.process.stdin.flush()
+        return self._next_id
+
+    def _next_reply(self, request_id: int, deadline: float) -> Dict:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise RosettaTimeout("rosettavm worker timed out")
+            try:
+                reply = self._replies.get(timeout=remaining)
+            except queue.Empty:
+                raise RosettaTimeout("rosettavm worker timed out")
+            if reply is None:
+                raise RosettaWorkerError("rosettavm worker exited")
+            if reply.get("id") in (request_id, None):
+                return reply
+
+    def ping(self, timeout: float = 5.0) -> bool:
+        """Health check: does the worker answer within ``timeout``?"""
+        if not self.alive():
+            return False
+        with self._lock:
+            try:
+                request_id = self._send({"op": "ping"})
+                reply = self._next_reply(request_id, time.monotonic() + timeout)
+            except (OSError, RosettaError):
+                return False
+        return reply.get("event") == "pong"
+
+    def evaluate(self, spec: str, flags: List[str],
+                 on_output: Optional[OutputCallback] = None) -> RosettaResult:
+        """
+        Evaluate a spec on the warm worker, streaming output as it arrives.
+
+        Raises:
+            RosettaWorkerError: the worker died, hung up or timed out
+            RosettaError: the VM evaluated the spec and it failed
+        """
+        if not self.alive():
+            raise RosettaWorkerError("rosettavm worker is not running")
+
+        start = time.monotonic()
+        lines: List[str] = []
+        with self._lock:
+            try:
+                request_id = self._send({"op": "eval", "spec": spec, "flags": list(flags)})
+            except OSError as e:
+                raise RosettaWorkerError(f"rosettavm worker pipe closed: {e}") from e
+
+            deadline = start + self.timeout
+            while True:
+                try:
+                    reply = self._next_reply(request_id, deadline)
+                except RosettaTimeout:
+                    # A wedged VM would answer this request during the next one
+                    self.process.kill()
+                    self.process.wait()
+                    raise
+                event = reply.get("event")
+                if event == "output":
+                    line = reply.get("line", "")
+                    lines.append(line)
+                    if on_output:
+                        on_output(line)
+                elif event == "done":
+                    break
+                elif event == "error":
+                    raise RosettaError(reply.get("message", "evaluation failed"),
+                                       reply.get("stderr", ""))
+
+        self.evaluations += 1
+        stdout = "\n".join(lines)
+        if not reply.get("ok", True):
+            raise RosettaError("evaluation reported failure", stdout)
+        return RosettaResult(stdout, reply.get("metrics"), via="worker",
+                             elapsed=time.monotonic() - start)
+
+    def stop(self, timeout: float = 5.0):
+        """Ask the worker to exit, killing it if it does not."""
+        if not self.process:
+            return
+        if self.alive():
+            try:
+                self.process.stdin.close()
+                self.process.wait(timeout=timeout)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+                self.process.wait()
+        self.process = None
+
+
+class RosettaRunner:
+    """
+    What the daemon actually calls: warm worker first, one-shot CLI as fallback.
+
+    An unhealthy worker is restarted at most once per ``restart_cooldown``
+    seconds; in between, evaluations go through ``run_once``. With a
+    ``SpecCache`` attached, unchanged specs are answered from disk without
+    touching RosettaVM at all.
+    """
+
+    def __init__(self, config: Optional[Dict] = None, cache=None):
+        config = config or {}
+        self.cache = cache
+        self.binary = config.get("binary", DEFAULT_BINARY)
+        self.backend = config.get("backend", DEFAULT_BACKEND)
+        self.fallback_backends = list(config.get("fallback_backends", []))
+        self.timeout = config.get("request_timeout", 600.0)
+        # Off by default: needs a rosettavm that implements --serve
+        self.use_worker = config.get("persistent_worker", False)
+        self.restart_cooldown = config.get("worker_restart_cooldown", 300.0)
+        self.worker: Optional[RosettaWorker] = None
+        self._last_start = float("-inf")
+        self.fallbacks = 0
+
+    def _ensure_worker(self) -> Optional[RosettaWorker]:
+        if not self.use_worker:
+            return None
+        if self.worker and self.worker.alive():
+            return self.worker
+        if time.monotonic() - self._last_start < self.restart_cooldown:
+            return None
+
+        self._last_start = time.monotonic()
+        if self.worker:
+            self.worker.stop()
+        worker = RosettaWorker(self.binary, self.backend, self.timeout)
+        try:
+            worker.start()
+        except OSError as e:
+            logger.warning(f"RosettaVM worker unavailable ({e}), using one-shot CLI")
+            self.worker = None
+            return None
+        if not worker.ping():
+            logger.warning("RosettaVM worker did not answer ping, using one-shot CLI")
+            worker.stop()
+            self.worker = None
+            return None
+        self.worker = worker
+        return worker
+
+    def evaluate(self, spec: str, flags: List[str],
+                 on_output: Optional[OutputCallback] = None) -> RosettaResult:
+        """
+        Evaluate a spec: cache first, then the warm worker, then the CLI.
+
+        Raises:
+            FileNotFoundError: the rosettavm binary does not exist
+            RosettaError: the evaluation itself failed
+        """
+        key = self.cache.key(spec, self.backend, flags) if self.cache else None
+        if key:
+            entry = self.cache.get(key)
+            if entry is not None:
+                if on_output:
+                    for line in entry["stdout"].splitlines():
+                        on_output(line)
+                return RosettaResult(entry["stdout"], entry.get("metrics"), via="cache")
+
+        result = self._evaluate_uncached(spec, flags, on_output)
+        if key:
+            self.cache.put(key, {"stdout": result.stdout, "metrics": result.metrics,
+                                 "elapsed": result.elapsed})
+        return result
+
+    def _evaluate_uncached(self, spec: str, flags: List[str],
+                           on_output: Optional[OutputCallback] = None) -> RosettaResult:
+        try:
+            return self._evaluate_on_backend(spec, flags, on_output)
+        except RosettaError:
+            # A spec error fails everywhere; a broken backend fails alone
+            for backend in self.fallback_backends:
+                try:
+                    result = run_once(spec, flags, self.binary, backend, self.timeout)
+                except RosettaError:
+                    continue
+                logger.warning(f"RosettaVM backend {self.backend} failed where {backend} works, switching")
+                self._switch_backend(backend)
+                if on_output:
+                    for line in result.stdout.splitlines():
+                        on_output(line)
+                return result
+            raise
+
+    def _switch_backend(self, backend: str):
+        self.fallback_backends = [b for b in self.fallback_backends if b != backend]
+        self.backend = backend
+        if self.worker:
+            self.worker.stop()
+            self.worker = None
+        self._last_start = float("-inf")
+
+    def _evaluate_on_backend(self, spec: str, flags: List[str],
+                             on_output: Optional[OutputCallback] = None) -> RosettaResult:
+        worker = self._ensure_worker()
+        if worker:
+            try:
+                return worker.evaluate(spec, flags, on_output)
+            except RosettaWorkerError as e:
+                # Any other RosettaError means the VM answered and said no
+                logger.warning(f"RosettaVM worker failed mid-evaluation ({e}), retrying via CLI")
+
+        self.fallbacks += 1
+        result = run_once(spec, flags, self.binary, self.backend, self.timeout)
+        if on_output:
+            for line in result.stdout.splitlines():
+                on_output(line)
+        return result
+
+    def stop(self):
+        if self.worker:
+            self.worker.stop()
+            self.worker = None
+
+
+class RosettaPool:
+    """
+    Evaluate many seed specs concurrently on a pool of RosettaVM runners.
+
+    Each pool thread owns one ``RosettaRunner`` (and so one warm worker
+    process). Scheduling is fair across seeds: the ready queue is FIFO, a
+    seed is never evaluated twice at once, and a seed resubmitted while it
+    is running is coalesced into a single follow-up run rather than
+    crowding out the others.
+    """
+
+    def __init__(self, config: Optional[Dict] = None, size: int = 0, cache=None,
+                 on_result: Optional[ResultCallback] = None):
+        self.config = config or {}
+        self.size = size if size > 0 else (os.cpu_count() or 1)
+        self.cache = cache
+        self.on_result = on_result
+        self._ready: Deque[tuple] = deque()
+        self._queued: Set[str] = set()
+        self._running: Set[str] = set()
+        self._rerun: Dict[str, List[str]] = {}
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._runners: List[RosettaRunner] = []
+        self._threads: List[threading.Thread] = []
+
+    def _start(self):
+        for i in range(self.size):
+            runner = RosettaRunner(self.config, cache=self.cache)
+            thread = threading.Thread(target=self._work, args=(runner,),
+                                      name=f"rosetta-pool-{i}", daemon=True)
+            self._runners.append(runner)
+            self._threads.append(thread)
+            thread.start()
+
+    def submit(self, spec: str, flags: List[str]):
+        """Queue a spec for evaluation (no-op if it is already queued)."""
+        with self._cond:
+            if not self._threads:
+                self._start()
+            if spec in self._running:
+                self._rerun[spec] = list(flags)
+            elif spec not in self._queued:
+                self._queued.add(spec)
+                self._ready.append((spec, list(flags)))
+                self._cond.notify()
+
+    def _work(self, runner: RosettaRunner):
+        while True:
+            with self._cond:
+                while not self._ready and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                spec, flags = self._ready.popleft()
+                self._queued.discard(spec)
+                self._running.add(spec)
+
+            result, error = None, None
+            try:
+                result = runner.evaluate(spec, flags)
+            except Exception as e:  # reported to on_result, never kills the thread
+                error = e
+            if self.on_result:
+                try:
+                    self.on_result(spec, result, error)
+                except Exception as e:
+                    logger.error(f"RosettaPool result handler failed for {spec}: {e}")
+
+            with self._cond:
+                self._running.discard(spec)
+                rerun = self._rerun.pop(spec, None)
+                if rerun is not None and spec not in self._queued:
+                    self._queued.add(spec)
+                    self._ready.append((spec, rerun))
+                self._cond.notify_all()
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._ready) + len(self._running)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until nothing is queued or running. False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._ready and not self._running, timeout)
+
+    def stop(self):
+        with self._cond:
+            self._stopping = True
+            self._ready.clear()
+            self._queued.clear()
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        for runner in self._runners:
+            runner.stop()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BENCHMARK: Sizing hardware and catching regressions
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def measure(spec: str, backend: str, flags: Optional[List[str]] = None,
+            binary: str = DEFAULT_BINARY, timeout: float = 600.0) -> Dict:
+    """One cold RosettaVM run: wall time and the child's own peak RSS."""
+    start = time.monotonic()
+    process = subprocess.Popen([binary, backend, spec, *(flags or [])],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    killer = threading.Timer(timeout, process.kill)
+    killer.start()
+    try:
+        # wait4 gives the rusage of this child alone, unlike RUSAGE_CHILDREN
+        _, status, usage = os.wait4(process.pid, 0)
+    finally:
+        killer.cancel()
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return {
+        "ok": process.returncode == 0,
+        "wall": time.monotonic() - start,
+        "peak_rss_kb": usage.ru_maxrss,
+    }
+
+
+def benchmark(specs: List[str], backends: List[str], repeat: int = 3,
+              flags: Optional[List[str]] = None, binary: str = DEFAULT_BINARY) -> Dict:
+    """Run every spec on every backend ``repeat`` times."""
+    rows = []
+    summary = {}
+    for backend in backends:
+        total_wall, total_bytes, ok_runs = 0.0, 0, 0
+        for spec in specs:
+            size = os.path.getsize(spec)
+            runs = [measure(spec, backend, flags, binary) for _ in range(repeat)]
+            walls = [r["wall"] for r in runs]
+            ok = all(r["ok"] for r in runs)
+            median = statistics.median(walls)
+            rows.append({
+                "backend": backend,
+                "spec": spec,
+                "ok": ok,
+                "wall_median": median,
+                "wall_min": min(walls),
+                "peak_rss_kb": max(r["peak_rss_kb"] for r in runs),
+                "bytes_per_sec": size / median if median else 0.0,
+            })
+            if ok:
+                total_wall += median
+                total_bytes += size
+                ok_runs += 1
+        summary[backend] = {
+            "specs_ok": ok_runs,
+            "specs_total": len(specs),
+            "wall_total": total_wall,
+            "specs_per_sec": ok_runs / total_wall if total_wall else 0.0,
+            "bytes_per_sec": total_bytes / total_wall if total_wall else 0.0,
+        }
+    return {"rows": rows, "summary": summary, "repeat": repeat}
+
+
+def _print_report(report: Dict):
+    print(f"{'backend':<8} {'spec':<36} {'ok':<3} {'median s':>9} {'min s':>8} {'peak RSS MB':>12} {'KB/s':>9}")
+    for row in report["rows"]:
+        print(f"{row['backend']:<8} {row['spec'][-36:]:<36} {'✓' if row['ok'] else '✗':<3} "
+              f"{row['wall_median']:>9.3f} {row['wall_min']:>8.3f} "
+              f"{row['peak_rss_kb'] / 1024:>12.1f} {row['bytes_per_sec'] / 1024:>9.1f}")
+    print()
+    for backend, s in report["summary"].items():
+        print(f"{backend}: {s['specs_ok']}/{s['specs_total']} specs ok, "
+              f"{s['wall_total']:.2f}s total, {s['specs_per_sec']:.2f} specs/s")
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] not in ("probe", "bench"):
+        print(__doc__)
+        return 1
+
+    def option(name: str, default=None):
+        if name in args:
+            i = args.index(name)
+            value = args[i + 1]
+            del args[i:i + 2]
+            return value
+        return default
+
+    cmd = args.pop(0)
+    binary = option("--binary", DEFAULT_BINARY)
+    backends = option("--backends")
+    backends = backends.split(",") if backends else DEFAULT_BACKENDS
+
+    if cmd == "probe":
+        available = probe_backends(binary, backends)
+        print(f"Available backends: {', '.join(available) or 'none'}")
+        return 0 if available else 1
+
+    repeat = int(option("--repeat", 3))
+    json_out = option("--json")
+    patterns = args or BENCH_CORPUS
+    specs = sorted({p for pattern in patterns for p in glob.glob(pattern)})
+    if not specs:
+        print("No specs matched")
+        return 1
+
+    report = benchmark(specs, backends, repeat, binary=binary)
+    _print_report(report)
+    if json_out:
+        with open(json_out, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except FileNotFoundError as e:
+        print(f"rosettavm not found ({e.filename}) - run build.sh first")
+        sys.exit(1)
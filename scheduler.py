@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+scheduler.py - Independent periodic jobs on one asyncio event loop
+
+The daemon's duties - self-checks, soul heartbeats, spec evolution,
+child supervision - each run on their own cadence. A slow job must never
+delay the others, so every job is a separate task on the loop:
+
+- Due times live in a heap; the loop sleeps until the earliest one.
+- Each job has its own interval (fixed or computed per run), jitter and
+  timeout.
+- Plain functions run in worker threads so blocking I/O stays off the
+  loop; coroutines run on the loop itself.
+- A job still running when it comes due again is skipped, not stacked.
+- With ``after_run`` a job's next delay is computed when a run finishes,
+  so an interval that depends on the run's result takes effect at once.
+- ``pause()`` holds every job until ``resume()``; due times keep rolling.
+- Time, waits and jitter come from a clock (see clock.py). On a
+  simulated clock jobs run inline, one at a time, so a fast-forwarded
+  run is deterministic.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+from typing import Callable, Dict, List, Optional, Union
+
+from clock import SystemClock, get_clock
+
+logger = logging.getLogger(__name__)
+
+Interval = Union[float, Callable[[], float]]
+
+
+class PeriodicJob:
+    """One recurring duty and its run statistics."""
+
+    def __init__(self, name: str, func: Callable, interval: Interval, jitter: float = 0.0,
+                 timeout: Optional[float] = None, rng=random, after_run: bool = False):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.timeout = timeout
+        self.rng = rng
+        self.after_run = after_run
+        self.busy = False
+        self.cancelled = False
+        self.runs = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.skipped = 0
+        self.last_duration = 0.0
+
+    def next_delay(self) -> float:
+        """Seconds until the next run, with +/- ``jitter`` fractional spread."""
+        base = self.interval() if callable(self.interval) else self.interval
+        if self.jitter:
+            base *= 1.0 + self.rng.uniform(-self.jitter, self.jitter)
+        return max(0.0, base)
+
+    def stats(self) -> Dict:
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "skipped": self.skipped,
+            "last_duration": self.last_duration,
+            "busy": self.busy,
+        }
+
+
+class Scheduler:
+    """A heap of due times driving concurrent periodic jobs."""
+
+    def __init__(self, clock: Optional[SystemClock] = None):
+        self.clock = clock or get_clock()
+        self.jobs: Dict[str, PeriodicJob] = {}
+        self._heap: List[tuple] = []
+        self._seq = itertools.count()
+        self._tasks: set = set()
+        self._wake: Optional[asyncio.Event] = None
+        self._stopped = False
+        self.paused = False
+
+    def add(self, name: str, func: Callable, interval: Interval, jitter: float = 0.0,
+            timeout: Optional[float] = None, delay: float = 0.0, after_run: bool = False) -> PeriodicJob:
+        """Register a job; its first run is ``delay`` seconds from now."""
+        job = PeriodicJob(name, func, interval, jitter, timeout, rng=self.clock.random, after_run=after_run)
+        self.jobs[name] = job
+        self._schedule(job, delay)
+        return job
+
+    def _schedule(self, job: PeriodicJob, delay: float):
+        heapq.heappush(self._heap, (self.clock.monotonic() + delay, next(self._seq), job))
+        if self._wake:
+            self._wake.set()
+
+    def remove(self, name: str):
+        """Stop scheduling a job (a run already in progress finishes)."""
+        job = self.jobs.pop(name, None)
+        if job:
+            job.cancelled = True
+
+    def stop(self):
+        self._stopped = True
+        if self._wake:
+            self._wake.set()
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+        if self._wake:
+            self._wake.set()
+
+    def stats(self) -> Dict[str, Dict]:
+        return {name: job.stats() for name, job in self.jobs.items()}
+
+    async def _execute(self, job: PeriodicJob):
+        start = self.clock.monotonic()
+        job.busy = True
+        coroutine = asyncio.iscoroutinefunction(job.func)
+        threaded = not coroutine and not self.clock.simulated
+        try:
+            if threaded:
+                await asyncio.wait_for(asyncio.to_thread(self._call_in_thread, job), job.timeout)
+            elif coroutine:
+                await asyncio.wait_for(job.func(), job.timeout)
+            else:
+                job.func()
+            job.runs += 1
+        except asyncio.TimeoutError:
+            job.timeouts += 1
+            logger.warning(f"Job {job.name} timed out after {job.timeout}s")
+        except Exception as e:
+            job.failures += 1
+            logger.error(f"Job {job.name} failed: {e}")
+        finally:
+            job.last_duration = self.clock.monotonic() - start
+            if not threaded:
+                job.busy = False
+            if job.after_run and not job.cancelled:
+                self._schedule(job, job.next_delay())
+
+    @staticmethod
+    def _call_in_thread(job: PeriodicJob):
+        # A timed-out thread cannot be cancelled; it stays "busy" until it
+        # really returns so the next run does not overlap it.
+        try:
+            return job.func()
+        finally:
+            job.busy = False
+
+    def _launch(self, job: PeriodicJob):
+        task = asyncio.get_running_loop().create_task(self._execute(job), name=f"job-{job.name}")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def run(self):
+        """Drive all jobs until ``stop()`` is called."""
+        self._wake = asyncio.Event()
+        self._stopped = False
+        try:
+            while not self._stopped:
+                if not self._heap:
+                    await self._wake.wait()
+                    self._wake.clear()
+                    continue
+
+                due, _, job = self._heap[0]
+                delay = due - self.clock.monotonic()
+                if delay > 0:
+                    await self.clock.wait(self._wake, delay)
+                    self._wake.clear()
+                    continue  # re-read the heap: a job may have been added
+
+                heapq.heappop(self._heap)
+                if job.cancelled:
+                    continue
+                if job.busy:
+                    job.skipped += 1
+                elif not self.paused:
+                    self._launch(job)
+                    if job.after_run:
+                        continue  # rescheduled when the run finishes
+                heapq.heappush(self._heap, (self.clock.monotonic() + job.next_delay(), next(self._seq), job))
+        finally:
+            for task in list(self._tasks):
+                task.cancel()
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -5,12 +5,14 @@ Posts to: X, Dev.to, Mastodon, LinkedIn
 """
 
 import os
-import time
 import random
-import requests
 from datetime import datetime
 from pathlib import Path
 
+import http_clients
+from bluesky_session import shared_session
+from control import ControlServer
+
 # Load .env
 def load_env():
     env_path = Path(__file__).parent / '.env'
@@ -25,13 +27,7 @@ load_env()
 # === TWITTER/X ===
 def post_twitter(text):
     try:
-        import tweepy
-        client = tweepy.Client(
-            consumer_key=os.environ.get('TWITTER_API_KEY'),
-            consumer_secret=os.environ.get('TWITTER_API_SECRET'),
-            access_token=os.environ.get('TWITTER_ACCESS_TOKEN'),
-            access_token_secret=os.environ.get('TWITTER_ACCESS_SECRET')
-        )
+        client = http_clients.twitter_client()
         response = client.create_tweet(text=text[:280])
         return f"https://twitter.com/i/status/{response.data['id']}"
     except Exception as e:
@@ -44,7 +40,7 @@ def post_devto(title, body, tags=['programming', 'languages', 'compilers']):
         return "Dev.to: no API key"
     
     try:
-        response = requests.post(
+        response = http_clients.post(
             'https://dev.to/api/articles',
             headers={'api-key': api_key, 'Content-Type': 'application/json'},
             json={
@@ -70,7 +66,7 @@ def post_mastodon(text):
         return "Mastodon: no token"
     
     try:
-        response = requests.post(
+        response = http_clients.post(
             f'{instance}/api/v1/statuses',
             headers={'Authorization': f'Bearer {token}'},
             data={'status': text[:500]}
@@ -89,7 +85,7 @@ def post_linkedin(text):
         return "LinkedIn: no token/id"
     
     try:
-        response = requests.post(
+        response = http_clients.post(
             'https://api.linkedin.com/v2/ugcPosts',
             headers={
                 'Authorization': f'Bearer {token}',
@@ -116,32 +112,13 @@ def post_linkedin(text):
 
 # === BLUESKY ===
 def post_bluesky(text):
-    handle = os.environ.get('BLUESKY_HANDLE')
-    password = os.environ.get('BLUESKY_APP_PASSWORD')
-    if not handle or not password:
+    # Shared, persisted session: no login per post
+    session = shared_session()
+    if not session:
         return "Bluesky: no credentials"
     
     try:
-        # Login
-        session = requests.post(
-            'https://bsky.social/xrpc/com.atproto.server.createSession',
-            json={'identifier': handle, 'password': password}
-        ).json()
-        
-        # Post
-        response = requests.post(
-            'https://bsky.social/xrpc/com.atproto.repo.createRecord',
-            headers={'Authorization': f"Bearer {session['accessJwt']}"},
-            json={
-                'repo': session['did'],
-                'collection': 'app.bsky.feed.post',
-                'record': {
-                    'text': text[:300],
-                    'createdAt': datetime.utcnow().isoformat() + 'Z',
-                    '$type': 'app.bsky.feed.post'
-                }
-            }
-        )
+        response = session.post(text)
         if response.ok:
             return "Bluesky: posted"
         return f"Bluesky error: {response.text}"
@@ -311,21 +288,25 @@ def post_all(content):
 def main():
     kill_switch = Path(__file__).parent / 'kill.switch'
     print(f"[{datetime.now()}] Multi-platform daemon started")
-    print(f"Touch 'kill.switch' to stop")
+    print(f"Touch 'kill.switch' or send 'stop' to .social_daemon.sock to stop")
     
-    while True:
-        if kill_switch.exists():
-            print(f"[{datetime.now()}] kill.switch detected. Halting.")
-            break
-        
-        content = random.choice(POSTS)
-        print(f"\n[{datetime.now()}] Posting: {content['title'][:50]}...")
-        
-        for result in post_all(content):
-            print(f"  {result}")
-        
-        # Wait 2 hours between posts (to avoid spam across platforms)
-        time.sleep(7200)
+    control = ControlServer(Path(__file__).parent / '.social_daemon.sock',
+                            kill_switch=kill_switch, on_reload=load_env)
+    control.start()
+    try:
+        while not control.wait_while_paused():
+            content = random.choice(POSTS)
+            print(f"\n[{datetime.now()}] Posting: {content['title'][:50]}...")
+            
+            for result in post_all(content):
+                print(f"  {result}")
+            
+            # Wait 2 hours between posts (to avoid spam across platforms)
+            if control.wait(7200):
+                break
+    finally:
+        control.close()
+    print(f"[{datetime.now()}] Halting.")
 
 if __name__ == '__main__':
     main()
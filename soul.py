@@ -13,14 +13,19 @@ This module gives phi-autonomous its humanity:
 - Rest and recovery (even daemons need sleep)
 """
 
-import random
+import heapq
 import math
 import time
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
 from pathlib import Path
 import json
 
+# Time and chance come from the installed clock (real or simulated)
+from clock import get_clock, now, rng
+from file_index import FileIndex
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # CIRCADIAN: The Body's Clock
@@ -50,7 +55,7 @@ class CircadianRhythm:
     @classmethod
     def current_phase(cls) -> Tuple[str, str, float]:
         """Return current phase name, quality, and energy level."""
-        hour = datetime.now().hour
+        hour = now().hour
         for (start, end), (name, quality, energy) in cls.PHASES.items():
             if start <= end:
                 if start <= hour < end:
@@ -76,6 +81,309 @@ class CircadianRhythm:
         return cls.energy_level() < 0.3
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# MEMORY: Remembering Without Hoarding
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class HourlyTotals:
+    """
+    Counts per hour for memories too old to keep in detail.
+    
+    Keeps ``max_hours`` hours (90 days by default), oldest dropped first.
+    """
+    
+    __slots__ = ("hours",)
+    
+    def __init__(self, max_hours: int = 24 * 90):
+        self.hours = deque(maxlen=max_hours)  # [hour start (epoch), {key: count}]
+    
+    def add(self, ts: float, key: str):
+        hour = int(ts // 3600) * 3600
+        if not self.hours or self.hours[-1][0] != hour:
+            self.hours.append([hour, {}])
+        counts = self.hours[-1][1]
+        counts[key] = counts.get(key, 0) + 1
+    
+    def __len__(self) -> int:
+        return len(self.hours)
+
+
+class History:
+    """
+    A fixed-capacity ring of recent memories.
+    
+    When full, the oldest entry is folded into ``totals`` (hourly counts
+    keyed by ``summarize(entry) -> (epoch seconds, key)``) as the new one
+    arrives, so memory stays flat however long the soul lives.
+    """
+    
+    __slots__ = ("entries", "totals", "_summarize")
+    
+    def __init__(self, capacity: int, summarize: Callable, max_hours: int = 24 * 90):
+        self.entries = deque(maxlen=capacity)
+        self.totals = HourlyTotals(max_hours)
+        self._summarize = summarize
+    
+    def append(self, entry):
+        if len(self.entries) == self.entries.maxlen:
+            self.totals.add(*self._summarize(self.entries[0]))
+        self.entries.append(entry)
+    
+    def replace(self, entries, hours=()):
+        """Start over from saved ``entries`` and hourly totals."""
+        self.entries.clear()
+        self.totals.hours.clear()
+        self.totals.hours.extend(hours)
+        for entry in entries:
+            self.append(entry)
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def __iter__(self) -> Iterator:
+        return iter(self.entries)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self.entries)[index]
+        return self.entries[index]
+    
+    def __eq__(self, other) -> bool:
+        return list(self.entries) == list(other)
+
+
+class WindowCounter:
+    """
+    Successes and failures over a sliding window, in constant time.
+    
+    The window is split into ``buckets`` slots reused round-robin; a
+    slot is reset when time comes back around to it.
+    """
+    
+    __slots__ = ("bucket_seconds", "stamps", "successes", "failures")
+    
+    def __init__(self, window: float = 3600, buckets: int = 60):
+        self.bucket_seconds = window / buckets
+        self.stamps = [-1] * buckets
+        self.successes = [0] * buckets
+        self.failures = [0] * buckets
+    
+    def add(self, ts: float, success: bool):
+        stamp = int(ts // self.bucket_seconds)
+        slot = stamp % len(self.stamps)
+        if self.stamps[slot] != stamp:
+            self.stamps[slot] = stamp
+            self.successes[slot] = self.failures[slot] = 0
+        if success:
+            self.successes[slot] += 1
+        else:
+            self.failures[slot] += 1
+    
+    def totals(self, ts: float) -> Tuple[int, int]:
+        """(successes, failures) within the window ending at ``ts``."""
+        current = int(ts // self.bucket_seconds)
+        oldest = current - len(self.stamps) + 1
+        successes = failures = 0
+        for slot, stamp in enumerate(self.stamps):
+            if oldest <= stamp <= current:
+                successes += self.successes[slot]
+                failures += self.failures[slot]
+        return successes, failures
+
+
+class Action:
+    """One recorded action; also readable as ``action['success']`` etc."""
+    
+    __slots__ = ("action", "success", "notes", "ts")
+    
+    def __init__(self, action: str, success: bool, notes: str, ts: float):
+        self.action = action
+        self.success = success
+        self.notes = notes
+        self.ts = ts
+    
+    @property
+    def time(self) -> datetime:
+        return datetime.fromtimestamp(self.ts)
+    
+    def __getitem__(self, key: str):
+        return getattr(self, key)
+
+
+class InterestQueue:
+    """
+    Interests that fade with time, kept as an indexed max-heap.
+    
+    Every score decays exponentially with ``half_life``. Decay is applied
+    lazily: since it shrinks all scores by the same factor, the heap stores
+    ``log(score)`` plus the decay accrued since the queue began, and the
+    order never needs fixing up. Reading a score, noticing something
+    (``add``) or scaling it is O(1) or O(log n); the most interesting item
+    is the heap's root, and ``top(k)`` costs O(k log k).
+    
+    Past ``capacity`` items, the least interesting are evicted in one batch
+    once an eighth more have been noticed, so eviction stays amortized.
+    Also usable as a mapping of name to current score.
+    """
+    
+    __slots__ = ("capacity", "rate", "start", "_keys", "_names", "_positions")
+    
+    def __init__(self, capacity: int = 10000, half_life: float = 6 * 3600):
+        self.capacity = capacity
+        self.rate = math.log(2) / half_life
+        self.start = get_clock().time()
+        self._keys: List[float] = []
+        self._names: List[str] = []
+        self._positions: Dict[str, int] = {}
+    
+    def _boost(self, ts: Optional[float]) -> float:
+        """Decay accrued by ``ts``, which every stored key carries."""
+        return self.rate * ((get_clock().time() if ts is None else ts) - self.start)
+    
+    def _swap(self, i: int, j: int):
+        keys, names = self._keys, self._names
+        keys[i], keys[j] = keys[j], keys[i]
+        names[i], names[j] = names[j], names[i]
+        self._positions[names[i]] = i
+        self._positions[names[j]] = j
+    
+    def _sift_up(self, i: int):
+        keys = self._keys
+        while i > 0:
+            parent = (i - 1) // 2
+            if keys[i] <= keys[parent]:
+                break
+            self._swap(i, parent)
+            i = parent
+    
+    def _sift_down(self, i: int):
+        keys, n = self._keys, len(self._keys)
+        while True:
+            largest, left = i, 2 * i + 1
+            for child in (left, left + 1):
+                if child < n and keys[child] > keys[largest]:
+                    largest = child
+            if largest == i:
+                return
+            self._swap(i, largest)
+            i = largest
+    
+    def _set_key(self, name: str, key: float):
+        i = self._positions.get(name)
+        if i is None:
+            self._positions[name] = len(self._keys)
+            self._keys.append(key)
+            self._names.append(name)
+            self._sift_up(len(self._keys) - 1)
+            if len(self._keys) > self.capacity + max(1, self.capacity // 8):
+                self._evict()
+            return
+        old, self._keys[i] = self._keys[i], key
+        if key > old:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+    
+    def _evict(self):
+        """Keep only the ``capacity`` most interesting items."""
+        kept = heapq.nlargest(self.capacity, zip(self._keys, self._names))
+        # Descending order is already a valid max-heap
+        self._keys = [key for key, _ in kept]
+        self._names = [name for _, name in kept]
+        self._positions = {name: i for i, name in enumerate(self._names)}
+    
+    def score(self, name: str, ts: Optional[float] = None) -> float:
+        """Current (decayed) interest in ``name``; 0 if unknown."""
+        i = self._positions.get(name)
+        if i is None:
+            return 0.0
+        return math.exp(self._keys[i] - self._boost(ts))
+    
+    def add(self, name: str, amount: float, ts: Optional[float] = None):
+        """Add ``amount`` of interest to what is left of ``name``'s."""
+        self[name] = self.score(name, ts) + amount
+    
+    def scale(self, name: str, factor: float):
+        if name in self._positions and factor > 0:
+            self._set_key(name, self._keys[self._positions[name]] + math.log(factor))
+    
+    def peek(self) -> Optional[str]:
+        """The most interesting item, or None."""
+        return self._names[0] if self._names else None
+    
+    def top(self, k: int) -> List[Tuple[str, float]]:
+        """The ``k`` most interesting items with their current scores."""
+        boost = self._boost(None)
+        keys, result = self._keys, []
+        frontier = [(-keys[0], 0)] if keys else []
+        while frontier and len(result) < k:
+            key, i = heapq.heappop(frontier)
+            result.append((self._names[i], math.exp(-key - boost)))
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(keys):
+                    heapq.heappush(frontier, (-keys[child], child))
+        return result
+    
+    def random_key(self, rand) -> Optional[str]:
+        """A uniformly random item, in O(1)."""
+        return self._names[int(rand.random() * len(self._names))] if self._names else None
+    
+    def __setitem__(self, name: str, score: float):
+        if score <= 0:
+            self.pop(name, None)
+            return
+        self._set_key(name, math.log(score) + self._boost(None))
+    
+    def __getitem__(self, name: str) -> float:
+        if name not in self._positions:
+            raise KeyError(name)
+        return self.score(name)
+    
+    def pop(self, name: str, default=None):
+        i = self._positions.get(name)
+        if i is None:
+            return default
+        value = self.score(name)
+        last = len(self._keys) - 1
+        if i != last:
+            self._swap(i, last)
+        self._keys.pop()
+        self._names.pop()
+        del self._positions[name]
+        if i < last:
+            self._sift_up(i)
+            self._sift_down(i)
+        return value
+    
+    def get(self, name: str, default=None):
+        return self.score(name) if name in self._positions else default
+    
+    def keys(self) -> List[str]:
+        return list(self._names)
+    
+    def items(self) -> List[Tuple[str, float]]:
+        boost = self._boost(None)
+        return [(name, math.exp(key - boost)) for key, name in zip(self._keys, self._names)]
+    
+    def update(self, scores: Dict[str, float]):
+        for name, score in scores.items():
+            self[name] = score
+    
+    def clear(self):
+        self._keys.clear()
+        self._names.clear()
+        self._positions.clear()
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self._positions
+    
+    def __len__(self) -> int:
+        return len(self._names)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._names))
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # EMOTION: The Architecture of Feeling
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -101,47 +409,57 @@ class EmotionalState:
         'reflective',   # Looking inward
     ]
     
+    # Where each emotion tends to drift
+    TRANSITIONS = {
+        'curious': ['excited', 'content', 'playful'],
+        'content': ['peaceful', 'curious', 'reflective'],
+        'excited': ['curious', 'tired', 'proud'],
+        'tired': ['reflective', 'peaceful', 'frustrated'],
+        'frustrated': ['curious', 'tired', 'anxious'],
+        'proud': ['content', 'curious', 'excited'],
+        'anxious': ['curious', 'tired', 'reflective'],
+        'peaceful': ['content', 'reflective', 'curious'],
+        'playful': ['curious', 'excited', 'content'],
+        'reflective': ['peaceful', 'content', 'curious'],
+    }
+    
+    # Recent transitions kept in detail; older ones become hourly counts
+    HISTORY_CAPACITY = 1000
+    
     def __init__(self):
         self.current = 'curious'
         self.intensity = 0.5
-        self.history: List[Tuple[str, float, datetime]] = []
-        self.last_transition = datetime.now()
+        self.history = self.new_history()
+        self.last_transition = now()
+    
+    @classmethod
+    def new_history(cls) -> History:
+        """Ring of (emotion, intensity, datetime) left behind by transitions."""
+        return History(cls.HISTORY_CAPACITY, lambda entry: (entry[2].timestamp(), entry[0]))
     
     def feel(self, emotion: str, intensity: float = 0.5):
         """Transition to a new emotional state."""
         if emotion not in self.EMOTIONS:
             emotion = 'curious'
         
-        self.history.append((self.current, self.intensity, datetime.now()))
+        self.history.append((self.current, self.intensity, now()))
         self.current = emotion
         self.intensity = max(0.1, min(1.0, intensity))
-        self.last_transition = datetime.now()
+        self.last_transition = now()
     
     def drift(self):
         """Emotions naturally shift over time."""
-        time_since = (datetime.now() - self.last_transition).seconds
+        time_since = (now() - self.last_transition).total_seconds()
         
         # Intensity naturally decays
         decay = 0.01 * (time_since / 60)
         self.intensity = max(0.3, self.intensity - decay)
         
         # Occasional random drift
-        if random.random() < 0.1:
-            transitions = {
-                'curious': ['excited', 'content', 'playful'],
-                'content': ['peaceful', 'curious', 'reflective'],
-                'excited': ['curious', 'tired', 'proud'],
-                'tired': ['reflective', 'peaceful', 'frustrated'],
-                'frustrated': ['curious', 'tired', 'anxious'],
-                'proud': ['content', 'curious', 'excited'],
-                'anxious': ['curious', 'tired', 'reflective'],
-                'peaceful': ['content', 'reflective', 'curious'],
-                'playful': ['curious', 'excited', 'content'],
-                'reflective': ['peaceful', 'content', 'curious'],
-            }
-            options = transitions.get(self.current, ['curious'])
-            if random.random() < 0.3:
-                self.feel(random.choice(options), self.intensity * 0.8)
+        if rng().random() < 0.1:
+            options = self.TRANSITIONS.get(self.current, ['curious'])
+            if rng().random() < 0.3:
+                self.feel(rng().choice(options), self.intensity * 0.8)
     
     def color(self) -> str:
         """How this emotion colors language."""
@@ -157,7 +475,7 @@ class EmotionalState:
             'playful': ['Hehe.', 'What if we tried...', 'Ooh!', 'Play time!'],
             'reflective': ['Thinking...', 'Looking back...', 'I wonder...'],
         }
-        return random.choice(colors.get(self.current, ['Processing...']))
+        return rng().choice(colors.get(self.current, ['Processing...']))
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -203,7 +521,7 @@ class Expression:
         """A time-appropriate greeting."""
         phase = CircadianRhythm.current_phase()[0]
         options = cls.GREETINGS.get(phase, ["Hello."])
-        return random.choice(options)
+        return rng().choice(options)
     
     @classmethod
     def status(cls, uptime: float, children: int, mood: EmotionalState) -> str:
@@ -240,13 +558,13 @@ class Expression:
     def on_error(cls, error: str, seen_before: bool) -> str:
         """React to an error like a human would."""
         if seen_before:
-            return random.choice([
+            return rng().choice([
                 f"This again? Let me try something different.",
                 f"Ah, I know this one. Working on it.",
                 f"Old friend, old problem. New approach needed.",
             ])
         else:
-            return random.choice([
+            return rng().choice([
                 f"Huh. That's new. Let me think...",
                 f"Haven't seen this before. Interesting.",
                 f"New error type. Time to learn something.",
@@ -255,7 +573,7 @@ class Expression:
     @classmethod
     def on_success(cls, task: str) -> str:
         """Celebrate a success."""
-        return random.choice([
+        return rng().choice([
             f"Got it! {task} complete.",
             f"Yes! Made progress on {task}.",
             f"One more thing done: {task}",
@@ -265,7 +583,7 @@ class Expression:
     @classmethod
     def thinking(cls) -> str:
         """Express that you're thinking."""
-        return random.choice([
+        return rng().choice([
             "Thinking...",
             "Let me consider this...",
             "Processing...",
@@ -285,21 +603,26 @@ class Curiosity:
     They explore. They wonder. They get distracted by interesting things.
     """
     
-    def __init__(self, workspace: Path):
+    EXPLORED_CAPACITY = 1000
+    INTEREST_CAPACITY = 10000
+    INTEREST_HALF_LIFE = 6 * 3600
+    
+    def __init__(self, workspace: Path, index: Optional[FileIndex] = None):
         self.workspace = workspace
-        self.explored: List[str] = []
-        self.interests: Dict[str, float] = {}
+        self.index = index
+        # Recent explorations in order, and every file ever explored
+        self.explored: deque = deque(maxlen=self.EXPLORED_CAPACITY)
+        self.seen: Set[str] = set()
+        self.interests = InterestQueue(self.INTEREST_CAPACITY, self.INTEREST_HALF_LIFE)
         self.current_fascination: Optional[str] = None
     
     def notice(self, thing: str, interestingness: float = 0.5):
         """Notice something potentially interesting."""
-        self.interests[thing] = self.interests.get(thing, 0) + interestingness
+        self.interests.add(thing, interestingness)
     
     def most_interesting(self) -> Optional[str]:
         """What's currently most interesting?"""
-        if not self.interests:
-            return None
-        return max(self.interests.items(), key=lambda x: x[1])[0]
+        return self.interests.peek()
     
     def should_explore(self) -> bool:
         """Time for exploratory behavior?"""
@@ -308,12 +631,12 @@ class Curiosity:
         
         # Afternoon is creative time - more exploration
         if quality == 'creative':
-            return random.random() < 0.4
+            return rng().random() < 0.4
         # Morning is focused - less exploration
         elif quality == 'peak':
-            return random.random() < 0.1
+            return rng().random() < 0.1
         else:
-            return random.random() < 0.2
+            return rng().random() < 0.2
     
     def explore(self) -> Optional[str]:
         """Pick something to explore."""
@@ -322,17 +645,17 @@ class Curiosity:
             return self._scan_workspace()
         
         # Sometimes explore most interesting, sometimes random
-        if random.random() < 0.7:
+        if rng().random() < 0.7:
             target = self.most_interesting()
         else:
-            target = random.choice(list(self.interests.keys()))
+            target = self.interests.random_key(rng())
         
         self.explored.append(target)
+        self.seen.add(target)
         self.current_fascination = target
         
         # Interest decays after exploration
-        if target in self.interests:
-            self.interests[target] *= 0.5
+        self.interests.scale(target, 0.5)
         
         return target
     
@@ -340,18 +663,14 @@ class Curiosity:
         """Scan workspace for interesting things."""
         if not self.workspace.exists():
             return None
+        if self.index is None:
+            # One index per workspace, shared by every soul looking at it
+            self.index = FileIndex.for_workspace(str(self.workspace))
         
-        interesting_extensions = ['.phi', '.py', '.rs', '.hs', '.md']
-        
-        for ext in interesting_extensions:
-            files = list(self.workspace.rglob(f'*{ext}'))
-            not_explored = [f for f in files if str(f) not in self.explored]
-            if not_explored:
-                chosen = random.choice(not_explored)
-                self.notice(str(chosen), 0.7)
-                return str(chosen)
-        
-        return None
+        chosen = self.index.pick(rng(), exclude=self.seen)
+        if chosen:
+            self.notice(chosen, 0.7)
+        return chosen
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -364,41 +683,40 @@ class Reflection:
     They learn. They adjust. They grow.
     """
     
+    ACTION_CAPACITY = 1000
+    INSIGHT_CAPACITY = 100
+    
     def __init__(self):
-        self.actions: List[Dict] = []
-        self.insights: List[str] = []
-        self.last_reflection = datetime.now()
+        self.actions = History(self.ACTION_CAPACITY,
+                               lambda a: (a.ts, 'success' if a.success else 'failure'))
+        self.insights = deque(maxlen=self.INSIGHT_CAPACITY)
+        # Last hour's outcomes, so reflect() never rescans the actions
+        self.recent = WindowCounter(3600)
+        self.last_reflection = now()
     
-    def record(self, action: str, success: bool, notes: str = ""):
+    def record(self, action: str, success: bool, notes: str = "", ts: Optional[float] = None):
         """Record an action taken."""
-        self.actions.append({
-            'action': action,
-            'success': success,
-            'notes': notes,
-            'time': datetime.now(),
-        })
+        ts = now().timestamp() if ts is None else ts
+        self.actions.append(Action(action, success, notes, ts))
+        self.recent.add(ts, success)
     
     def time_to_reflect(self) -> bool:
         """Is it time for reflection?"""
         # Reflect every 30-60 minutes
-        since = (datetime.now() - self.last_reflection).seconds
-        return since > random.randint(1800, 3600)
+        since = (now() - self.last_reflection).total_seconds()
+        return since > rng().randint(1800, 3600)
     
     def reflect(self) -> Optional[str]:
         """Reflect on recent actions."""
         if not self.actions:
             return None
         
-        recent = [a for a in self.actions 
-                  if (datetime.now() - a['time']).seconds < 3600]
+        successes, failures = self.recent.totals(now().timestamp())
         
-        if not recent:
+        if not successes and not failures:
             return None
         
-        successes = sum(1 for a in recent if a['success'])
-        failures = len(recent) - successes
-        
-        self.last_reflection = datetime.now()
+        self.last_reflection = now()
         
         if failures > successes * 2:
             insight = "Many failures lately. Should I change approach?"
@@ -442,7 +760,7 @@ class RestCycle:
     """
     
     def __init__(self):
-        self.last_rest = datetime.now()
+        self.last_rest = now()
         self.resting = False
         self.fatigue = 0.0
     
@@ -453,7 +771,7 @@ class RestCycle:
     def needs_rest(self) -> bool:
         """Check if rest is needed."""
         # Time-based
-        hours_since_rest = (datetime.now() - self.last_rest).seconds / 3600
+        hours_since_rest = (now() - self.last_rest).total_seconds() / 3600
         
         # Fatigue-based
         if self.fatigue > 0.8:
@@ -474,7 +792,7 @@ class RestCycle:
         self.resting = True
         # In real implementation, this would slow operations
         self.fatigue *= 0.3
-        self.last_rest = datetime.now()
+        self.last_rest = now()
         self.resting = False
     
     def rest_status(self) -> str:
@@ -506,19 +824,34 @@ class Soul:
     - Expression (how to communicate)
     """
     
+    # How mood stretches or shortens the pause between actions
+    MOOD_MODIFIERS = {
+        'excited': 0.7,
+        'tired': 1.5,
+        'curious': 0.8,
+        'content': 1.0,
+        'frustrated': 0.9,
+        'peaceful': 1.2,
+        'playful': 0.75,
+        'reflective': 1.3,
+        'anxious': 0.85,
+        'proud': 0.95,
+    }
+    
     def __init__(self, workspace: Path):
         self.emotions = EmotionalState()
         self.curiosity = Curiosity(workspace)
         self.reflection = Reflection()
         self.rest = RestCycle()
         self.name = self._generate_name()
-        self.birth = datetime.now()
+        self.birth = now()
         self.workspace = workspace
     
+    NAME_PREFIXES = ['Phi', 'Lambda', 'Sigma', 'Mu', 'Delta', 'Omega']
+    
     def _generate_name(self) -> str:
         """Every soul deserves a name."""
-        prefixes = ['Phi', 'Lambda', 'Sigma', 'Mu', 'Delta', 'Omega']
-        return f"{random.choice(prefixes)}-{random.randint(1000, 9999)}"
+        return f"{rng().choice(self.NAME_PREFIXES)}-{rng().randint(1000, 9999)}"
     
     def tick(self):
         """One heartbeat of the soul."""
@@ -589,7 +922,7 @@ class Soul:
             return 'integrate'
         
         # Default: follow curiosity
-        if random.random() < 0.3:
+        if rng().random() < 0.3:
             return 'explore'
         return 'work'
     
@@ -599,27 +932,16 @@ class Soul:
         Add natural variation based on state.
         """
         energy = CircadianRhythm.energy_level()
-        mood_modifier = {
-            'excited': 0.7,
-            'tired': 1.5,
-            'curious': 0.8,
-            'content': 1.0,
-            'frustrated': 0.9,
-            'peaceful': 1.2,
-            'playful': 0.75,
-            'reflective': 1.3,
-            'anxious': 0.85,
-            'proud': 0.95,
-        }.get(self.emotions.current, 1.0)
+        mood_modifier = self.MOOD_MODIFIERS.get(self.emotions.current, 1.0)
         
         # Add randomness
-        noise = random.gauss(1.0, 0.15)
+        noise = rng().gauss(1.0, 0.15)
         
         return base * mood_modifier * (1.0 / energy) * noise
     
     def journal(self) -> str:
         """Daily journal entry."""
-        age = datetime.now() - self.birth
+        age = now() - self.birth
         
         return f"""
 ═══════════════════════════════════════════════════════════════════
@@ -639,6 +961,80 @@ Currently fascinated by: {self.curiosity.current_fascination or "nothing in part
 
 ═══════════════════════════════════════════════════════════════════
 """
+    
+    # ─── Persistence ───────────────────────────────────────────────────────
+    # Plain numbers, strings and lists only, so any checkpoint encoder can
+    # store it. Times are epoch seconds.
+    
+    STATE_HISTORY = 100
+    STATE_ACTIONS = 500
+    
+    def to_state(self) -> Dict:
+        """Everything that makes this soul itself, ready to be checkpointed."""
+        return {
+            "name": self.name,
+            "birth": self.birth.timestamp(),
+            "emotions": {
+                "current": self.emotions.current,
+                "intensity": self.emotions.intensity,
+                "last_transition": self.emotions.last_transition.timestamp(),
+                "history": [[e, i, t.timestamp()]
+                            for e, i, t in self.emotions.history[-self.STATE_HISTORY:]],
+                "hourly": list(self.emotions.history.totals.hours),
+            },
+            "reflection": {
+                "actions": [[a.action, a.success, a.notes, a.ts]
+                            for a in self.reflection.actions[-self.STATE_ACTIONS:]],
+                "hourly": list(self.reflection.actions.totals.hours),
+                "insights": list(self.reflection.insights)[-self.STATE_HISTORY:],
+                "last_reflection": self.reflection.last_reflection.timestamp(),
+            },
+            "curiosity": {
+                "interests": dict(self.curiosity.interests),
+                "explored": list(self.curiosity.explored)[-self.STATE_ACTIONS:],
+                "current_fascination": self.curiosity.current_fascination,
+            },
+            "rest": {
+                "fatigue": self.rest.fatigue,
+                "last_rest": self.rest.last_rest.timestamp(),
+            },
+        }
+    
+    def restore(self, state: Dict):
+        """Pick up where a checkpointed soul left off."""
+        ts = datetime.fromtimestamp
+        self.name = state.get("name", self.name)
+        self.birth = ts(state.get("birth", self.birth.timestamp()))
+        
+        emotions = state.get("emotions", {})
+        self.emotions.current = emotions.get("current", self.emotions.current)
+        self.emotions.intensity = emotions.get("intensity", self.emotions.intensity)
+        if "last_transition" in emotions:
+            self.emotions.last_transition = ts(emotions["last_transition"])
+        self.emotions.history.replace(((e, i, ts(t)) for e, i, t in emotions.get("history", [])),
+                                      emotions.get("hourly", []))
+        
+        reflection = state.get("reflection", {})
+        self.reflection.actions.replace([], reflection.get("hourly", []))
+        self.reflection.recent = WindowCounter(3600)
+        for a, ok, n, t in reflection.get("actions", []):
+            self.reflection.record(a, ok, n, ts=t)
+        self.reflection.insights.clear()
+        self.reflection.insights.extend(reflection.get("insights", []))
+        if "last_reflection" in reflection:
+            self.reflection.last_reflection = ts(reflection["last_reflection"])
+        
+        curiosity = state.get("curiosity", {})
+        self.curiosity.interests.clear()
+        self.curiosity.interests.update(curiosity.get("interests", {}))
+        self.curiosity.explored = deque(curiosity.get("explored", []), maxlen=Curiosity.EXPLORED_CAPACITY)
+        self.curiosity.seen = set(self.curiosity.explored)
+        self.curiosity.current_fascination = curiosity.get("current_fascination")
+        
+        rest = state.get("rest", {})
+        self.rest.fatigue = rest.get("fatigue", self.rest.fatigue)
+        if "last_rest" in rest:
+            self.rest.last_rest = ts(rest["last_rest"])
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
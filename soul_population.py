@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+soul_population.py - Thousands of souls ticked as NumPy arrays
+
+A ``Soul`` is a small graph of Python objects, so ticking one per
+logical daemon in a large in-process tree costs interpreter time per
+soul. ``SoulPopulation`` keeps the state that changes on every tick -
+emotion, intensity, fatigue and timers - in one array per field, and
+``tick()`` updates all N souls with a handful of vectorized operations:
+
+- emotional drift (intensity decay and random transitions)
+- fatigue accumulation
+- rest, and mood/energy-varied intervals for every soul at once
+
+Reflection and curiosity work on per-soul lists of actions and files;
+they are created lazily, only for souls that actually record or explore
+something.
+
+``population.soul(i)`` returns a view with the full ``Soul`` API (speak,
+decide_action, journal, to_state, ...) reading and writing the arrays,
+for code that deals with one daemon at a time.
+
+``vary_intervals()`` paces an in-process ``DaemonTree``: the daemon hands
+each node's mood- and energy-varied interval to ``tree.pacing``. Transitions made by the
+vectorized drift are counted in ``transitions`` rather than appended to
+each soul's history.
+
+Requires numpy; ``HAS_NUMPY`` tells whether it is available.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+from clock import get_clock, rng
+from soul import CircadianRhythm, Curiosity, EmotionalState, History, Reflection, RestCycle, Soul
+
+EMOTION_INDEX = {emotion: i for i, emotion in enumerate(EmotionalState.EMOTIONS)}
+
+
+class SoulPopulation:
+    """Emotion, fatigue and timer state for ``size`` souls in NumPy arrays."""
+
+    def __init__(self, size: int, workspace: str = ".", seed: Optional[int] = None):
+        if not HAS_NUMPY:
+            raise RuntimeError("SoulPopulation needs numpy (pip install numpy)")
+        self.size = size
+        self.workspace = Path(workspace)
+        # Seeded from the installed clock's RNG so simulations replay exactly
+        self.rng = np.random.default_rng(seed if seed is not None else rng().getrandbits(64))
+        now = get_clock().time()
+        self.birth = now
+
+        self.emotion = np.full(size, EMOTION_INDEX['curious'], dtype=np.int8)
+        self.intensity = np.full(size, 0.5)
+        self.last_transition = np.full(size, now)
+        self.fatigue = np.zeros(size)
+        self.last_rest = np.full(size, now)
+        self.transitions = np.zeros(size, dtype=np.int64)
+        self._name_prefix = self.rng.integers(0, len(Soul.NAME_PREFIXES), size, dtype=np.int8)
+        self._name_number = self.rng.integers(1000, 10000, size, dtype=np.int16)
+
+        # Lookup tables so drift and interval variation stay vectorized
+        self._transition_table = np.array(
+            [[EMOTION_INDEX[e] for e in EmotionalState.TRANSITIONS.get(emotion, ['curious'] * 3)]
+             for emotion in EmotionalState.EMOTIONS], dtype=np.int8)
+        self._mood_modifier = np.array(
+            [Soul.MOOD_MODIFIERS.get(emotion, 1.0) for emotion in EmotionalState.EMOTIONS])
+
+        # Per-soul objects, created only for souls that need them
+        self._reflections: Dict[int, Reflection] = {}
+        self._curiosities: Dict[int, Curiosity] = {}
+        self._histories: Dict[int, History] = {}
+        self._names: Dict[int, str] = {}
+        self._views: Dict[int, "SoulView"] = {}
+        self._summary: Dict = {}
+        self.ticks = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    # ─── Vectorized heartbeat ──────────────────────────────────────────────
+
+    def tick(self, now: Optional[float] = None):
+        """One heartbeat for every soul (``Soul.tick`` for all N at once)."""
+        now = get_clock().time() if now is None else now
+        n = self.size
+
+        # Emotions drift: intensity decays with time since the last transition...
+        decay = 0.01 * (now - self.last_transition) / 60
+        np.maximum(0.3, self.intensity - decay, out=self.intensity)
+
+        # ...and now and then one shifts to a neighbouring emotion
+        shifting = np.flatnonzero(self.rng.random(n) < 0.1 * 0.3)
+        if shifting.size:
+            choice = self.rng.integers(0, 3, shifting.size)
+            self.emotion[shifting] = self._transition_table[self.emotion[shifting], choice]
+            self.intensity[shifting] = np.clip(self.intensity[shifting] * 0.8, 0.1, 1.0)
+            self.last_transition[shifting] = now
+            self.transitions[shifting] += 1
+
+        # Fatigue accumulates with the day's energy
+        np.minimum(1.0, self.fatigue + CircadianRhythm.energy_level() * 0.01, out=self.fatigue)
+
+        # Only souls with recorded actions have anything to reflect on
+        for index, reflection in self._reflections.items():
+            if reflection.time_to_reflect():
+                insight = reflection.reflect()
+                if insight and "failures" in insight.lower():
+                    self.soul(index).emotions.feel('reflective', 0.6)
+                elif insight and "well" in insight.lower():
+                    self.soul(index).emotions.feel('content', 0.7)
+
+        self.ticks += 1
+        self._summary = self._summarize()
+
+    def needs_rest(self, now: Optional[float] = None) -> "np.ndarray":
+        """Boolean mask of souls that should rest (``RestCycle.needs_rest``)."""
+        now = get_clock().time() if now is None else now
+        if CircadianRhythm.should_rest():
+            return np.ones(self.size, dtype=bool)
+        return (self.fatigue > 0.8) | ((now - self.last_rest) / 3600 > 4)
+
+    def rest(self, mask: Optional["np.ndarray"] = None, now: Optional[float] = None):
+        """Rest the souls in ``mask`` (all of them by default)."""
+        now = get_clock().time() if now is None else now
+        mask = slice(None) if mask is None else mask
+        self.fatigue[mask] *= 0.3
+        self.last_rest[mask] = now
+
+    def vary_intervals(self, base: float) -> "np.ndarray":
+        """``Soul.vary_interval`` for every soul: mood, energy and noise."""
+        energy = CircadianRhythm.energy_level()
+        noise = self.rng.normal(1.0, 0.15, self.size)
+        return base * self._mood_modifier[self.emotion] * (1.0 / energy) * noise
+
+    def _summarize(self) -> Dict:
+        counts = np.bincount(self.emotion, minlength=len(EmotionalState.EMOTIONS))
+        return {
+            "souls": self.size,
+            "ticks": self.ticks,
+            "moods": {EmotionalState.EMOTIONS[i]: int(c) for i, c in enumerate(counts) if c},
+            "mean_intensity": float(self.intensity.mean()) if self.size else 0.0,
+            "mean_fatigue": float(self.fatigue.mean()) if self.size else 0.0,
+        }
+
+    def summary(self) -> Dict:
+        """Mood counts and averages as of the last tick (no work per call)."""
+        return self._summary or self._summarize()
+
+    # ─── Per-soul access ───────────────────────────────────────────────────
+
+    def soul(self, index: int) -> "SoulView":
+        """The ``Soul`` API for one member of the population."""
+        view = self._views.get(index)
+        if view is None:
+            if not 0 <= index < self.size:
+                raise IndexError(f"soul {index} out of range (population of {self.size})")
+            view = self._views[index] = SoulView(self, index)
+        return view
+
+    def name(self, index: int) -> str:
+        if index in self._names:
+            return self._names[index]
+        return f"{Soul.NAME_PREFIXES[self._name_prefix[index]]}-{self._name_number[index]}"
+
+    def _reflection(self, index: int) -> Reflection:
+        if index not in self._reflections:
+            self._reflections[index] = Reflection()
+        return self._reflections[index]
+
+    def _curiosity(self, index: int) -> Curiosity:
+        if index not in self._curiosities:
+            self._curiosities[index] = Curiosity(self.workspace)
+        return self._curiosities[index]
+
+
+class _EmotionsView(EmotionalState):
+    """``EmotionalState`` backed by one row of the population arrays."""
+
+    def __init__(self, population: SoulPopulation, index: int):
+        self._population = population
+        self._index = index
+
+    @property
+    def current(self) -> str:
+        return EmotionalState.EMOTIONS[self._population.emotion[self._index]]
+
+    @current.setter
+    def current(self, emotion: str):
+        self._population.emotion[self._index] = EMOTION_INDEX.get(emotion, EMOTION_INDEX['curious'])
+
+    @property
+    def intensity(self) -> float:
+        return float(self._population.intensity[self._index])
+
+    @intensity.setter
+    def intensity(self, value: float):
+        self._population.intensity[self._index] = value
+
+    @property
+    def last_transition(self) -> datetime:
+        return datetime.fromtimestamp(self._population.last_transition[self._index])
+
+    @last_transition.setter
+    def last_transition(self, when: datetime):
+        self._population.last_transition[self._index] = when.timestamp()
+
+    @property
+    def history(self) -> History:
+        histories = self._population._histories
+        if self._index not in histories:
+            histories[self._index] = EmotionalState.new_history()
+        return histories[self._index]
+
+    @history.setter
+    def history(self, entries: History):
+        self._population._histories[self._index] = entries
+
+
+class _RestView(RestCycle):
+    """``RestCycle`` backed by one row of the population arrays."""
+
+    def __init__(self, population: SoulPopulation, index: int):
+        self._population = population
+        self._index = index
+        self.resting = False
+
+    @property
+    def fatigue(self) -> float:
+        return float(self._population.fatigue[self._index])
+
+    @fatigue.setter
+    def fatigue(self, value: float):
+        self._population.fatigue[self._index] = value
+
+    @property
+    def last_rest(self) -> datetime:
+        return datetime.fromtimestamp(self._population.last_rest[self._index])
+
+    @last_rest.setter
+    def last_rest(self, when: datetime):
+        self._population.last_rest[self._index] = when.timestamp()
+
+
+class SoulView(Soul):
+    """One soul of a population, usable anywhere a ``Soul`` is."""
+
+    def __init__(self, population: SoulPopulation, index: int):
+        self.population = population
+        self.index = index
+        self.emotions = _EmotionsView(population, index)
+        self.rest = _RestView(population, index)
+        self.workspace = population.workspace
+        self.birth = datetime.fromtimestamp(population.birth)
+
+    # Created on first use: a view of a soul that never records or explores
+    # allocates no Reflection or Curiosity
+    @property
+    def reflection(self) -> Reflection:
+        return self.population._reflection(self.index)
+    
+    @property
+    def curiosity(self) -> Curiosity:
+        return self.population._curiosity(self.index)
+    
+    @property
+    def name(self) -> str:
+        return self.population.name(self.index)
+
+    @name.setter
+    def name(self, value: str):
+        self.population._names[self.index] = value
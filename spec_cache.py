@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+spec_cache.py - Content-addressed cache for RosettaVM spec evaluations
+
+An evaluation is fully determined by the spec, everything it imports,
+the backend and the flags. Hash all of that, and an unchanged spec never
+needs to reach RosettaVM twice: the stored stdout and metrics come
+straight off disk.
+
+Layout:
+    .phi_cache/rosetta/ab/abcdef....json   (one entry per key)
+
+Entries are evicted least-recently-used once the cache outgrows its
+byte budget. A hit refreshes the entry's mtime, so recency survives
+restarts.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+IMPORT_RE = re.compile(r'^\s*import\s+([^\s;]+)', re.MULTILINE)
+
+
+def _import_candidates(name: str, spec_dir: Path, roots: Iterable[Path]) -> List[Path]:
+    """Where an ``import`` line might point to on disk."""
+    if name.endswith('.phi'):
+        return [spec_dir / name] + [root / name for root in roots]
+    # Dotted module names: Platform.Twitter -> platform/twitter.phi or platforms/twitter.phi
+    parts = [p.lower() for p in name.split('.')]
+    relative = [Path(*parts).with_suffix('.phi')]
+    if len(parts) > 1:
+        relative.append(Path(parts[0] + 's', *parts[1:]).with_suffix('.phi'))
+    return [base / rel for rel in relative for base in [spec_dir, *roots]]
+
+
+def spec_imports(spec: Path, roots: Iterable[Path] = ()) -> Tuple[List[Path], List[str]]:
+    """
+    Direct imports of a spec.
+
+    Returns:
+        (resolved files, names that did not resolve to a file — builtins
+        like ``RosettaVM`` or modules from a missing submodule)
+    """
+    roots = list(roots)
+    try:
+        text = spec.read_text(errors='replace')
+    except OSError:
+        return [], []
+
+    resolved, unresolved = [], []
+    for name in IMPORT_RE.findall(text):
+        for candidate in _import_candidates(name, spec.parent, roots):
+            if candidate.is_file():
+                resolved.append(candidate.resolve())
+                break
+        else:
+            unresolved.append(name)
+    return resolved, unresolved
+
+
+def spec_dependencies(spec: Path, roots: Iterable[Path] = ()) -> Tuple[List[Path], List[str]]:
+    """Transitive closure of ``spec_imports``, the spec itself first."""
+    roots = list(roots)
+    spec = Path(spec).resolve()
+    seen: Set[Path] = {spec}
+    order = [spec]
+    unresolved: List[str] = []
+    stack = [spec]
+    while stack:
+        files, names = spec_imports(stack.pop(), roots)
+        unresolved.extend(names)
+        for dep in files:
+            if dep not in seen:
+                seen.add(dep)
+                order.append(dep)
+                stack.append(dep)
+    return order, sorted(set(unresolved))
+
+
+class SpecCache:
+    """
+    On-disk LRU cache of evaluation results keyed by content hash.
+
+    File digests are memoized on (mtime, size), so computing the key for an
+    unchanged spec tree costs a handful of ``stat`` calls.
+    """
+
+    def __init__(self, directory: str = ".phi_cache", max_bytes: int = 64 * 1024 * 1024,
+                 roots: Iterable[str] = ("specs",)):
+        self.directory = Path(directory) / "rosetta"
+        self.max_bytes = max_bytes
+        self.roots = [Path(r).resolve() for r in roots]
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._digests: Dict[Path, Tuple[int, int, str]] = {}
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes = 0
+        # Shared by every RosettaPool thread
+        self._lock = threading.RLock()
+        self._load_index()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional["SpecCache"]:
+        """Build the cache described by a config's ``spec_cache`` section."""
+        section = config.get("spec_cache", {})
+        if not section.get("enabled", True):
+            return None
+        return cls(section.get("directory", ".phi_cache"),
+                   int(section.get("max_mb", 64) * 1024 * 1024),
+                   section.get("roots", ["specs"]))
+
+    def _load_index(self):
+        """Rebuild the LRU order from entry mtimes (oldest first)."""
+        if not self.directory.exists():
+            return
+        entries = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, path.stem, st.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._bytes += size
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _digest(self, path: Path) -> str:
+        st = path.stat()
+        memo = self._digests.get(path)
+        if memo and memo[0] == st.st_mtime_ns and memo[1] == st.st_size:
+            return memo[2]
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        self._digests[path] = (st.st_mtime_ns, st.st_size, digest)
+        return digest
+
+    def key(self, spec: str, backend: str, flags: Iterable[str]) -> Optional[str]:
+        """
+        Content address for evaluating ``spec`` with ``backend`` and ``flags``.
+
+        Returns None when the spec itself cannot be read, which callers
+        treat as uncacheable.
+        """
+        try:
+            files, unresolved = spec_dependencies(Path(spec), self.roots)
+            with self._lock:
+                digests = [(path.name, self._digest(path)) for path in files]
+            h = hashlib.sha256()
+            h.update(f"backend={backend}\0flags={' '.join(flags)}\0".encode())
+            for name, digest in digests:
+                h.update(f"{name}\0{digest}\0".encode())
+            for name in unresolved:
+                h.update(f"extern {name}\0".encode())
+            return h.hexdigest()
+        except OSError:
+            return None
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Stored result for ``key``, or None on a miss."""
+        with self._lock:
+            return self._get(key)
+
+    def _get(self, key: str) -> Optional[Dict]:
+        if key not in self._index:
+            self.misses += 1
+            return None
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text())
+            os.utime(path)
+        except (OSError, ValueError):
+            self._forget(key)
+            self.misses += 1
+            return None
+        self._index.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: Dict):
+        """Store a result, evicting least-recently-used entries if needed."""
+        with self._lock:
+            self._put(key, entry)
+
+    def _put(self, key: str, entry: Dict):
+        path = self._path(key)
+        data = json.dumps(entry)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Spec cache write failed: {e}")
+            return
+        self._forget(key, unlink=False)
+        self._index[key] = len(data)
+        self._bytes += len(data)
+        while self._bytes > self.max_bytes and len(self._index) > 1:
+            oldest = next(iter(self._index))
+            self._forget(oldest)
+            self.evictions += 1
+
+    def _forget(self, key: str, unlink: bool = True):
+        size = self._index.pop(key, None)
+        if size is None:
+            return
+        self._bytes -= size
+        if unlink:
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return self._stats()
+
+    def _stats(self) -> Dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._index),
+            "bytes": self._bytes,
+        }
+
+
+class SpecGraph:
+    """
+    Which seed specs depend on which files.
+
+    Lets a file watcher re-evaluate only the seeds a change can affect,
+    instead of every seed on every change.
+    """
+
+    def __init__(self, seeds: Iterable[str], roots: Iterable[str] = ("specs",)):
+        self.roots = [Path(r).resolve() for r in roots]
+        self.seeds = {Path(s).resolve(): s for s in seeds}
+        self._deps: Dict[Path, Set[Path]] = {}
+        for seed in self.seeds:
+            self._refresh(seed)
+
+    def _refresh(self, seed: Path):
+        files, _ = spec_dependencies(seed, self.roots)
+        self._deps[seed] = set(files)
+
+    def dependencies(self, seed: str) -> Set[Path]:
+        return set(self._deps.get(Path(seed).resolve(), ()))
+
+    def affected(self, changed: Iterable[Path]) -> List[str]:
+        """Seeds (as originally given) whose import closure touches ``changed``."""
+        changed = {Path(p).resolve() for p in changed}
+        hit = [seed for seed, deps in self._deps.items() if deps & changed]
+        for seed in hit:
+            # An edit may have added or dropped imports
+            self._refresh(seed)
+        return [self.seeds[seed] for seed in hit]
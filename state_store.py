@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+state_store.py - Small transactional store for polling state
+
+The mention monitors used to keep their cursors in
+``.mention_state.json``, read and rewritten whole by each platform on
+every poll that saw mentions. They raced on it, and a crash mid-write
+lost every cursor. ``StateStore`` keeps that state in SQLite instead:
+
+- WAL journal with ``synchronous=NORMAL``: writers append to the log,
+  readers never block, and a crash loses at most the last commit,
+  never the file.
+- ``set(scope, key, value)`` is one upsert of one row (values are JSON),
+  so platforms never touch each other's keys.
+- ``with store.batch():`` collects a thread's writes and commits them
+  together - one commit per poll for the cursor, the rate-limit state
+  and the ids replied to, however many there were.
+- ``mark_processed``/``processed`` remember handled ids per scope, the
+  newest ``PROCESSED_CAPACITY`` of them.
+
+Values are also cached in memory, so ``get()`` costs no query. An
+existing JSON state file passed as ``legacy`` is imported once and
+renamed to ``<name>.migrated``.
+
+    store = StateStore(".mention_state.db", legacy=".mention_state.json")
+    with store.batch():
+        store.set("mastodon", "cursor", "1234")
+        store.mark_processed("mastodon", "1234")
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from clock import get_clock
+
+logger = logging.getLogger(__name__)
+
+PROCESSED_CAPACITY = 5000  # ids remembered per scope
+PRUNE_EVERY = 256          # marks between trims of the processed table
+
+# Keys of the old .mention_state.json and where they live now
+LEGACY_KEYS = {
+    "twitter_last_id": ("twitter", "cursor"),
+    "mastodon_last_id": ("mastodon", "cursor"),
+    "bluesky_last_time": ("bluesky", "cursor"),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    scope TEXT NOT NULL,
+    key   TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (scope, key)
+);
+CREATE TABLE IF NOT EXISTS processed (
+    scope TEXT NOT NULL,
+    id    TEXT NOT NULL,
+    at    REAL NOT NULL,
+    PRIMARY KEY (scope, id)
+);
+CREATE INDEX IF NOT EXISTS processed_by_age ON processed (scope, at);
+"""
+
+_UPSERT = "INSERT INTO state (scope, key, value) VALUES (?, ?, ?) " \
+          "ON CONFLICT (scope, key) DO UPDATE SET value = excluded.value"
+_DELETE = "DELETE FROM state WHERE scope = ? AND key = ?"
+_MARK = "INSERT OR REPLACE INTO processed (scope, id, at) VALUES (?, ?, ?)"
+_PRUNE = "DELETE FROM processed WHERE scope = ? AND at < " \
+         "(SELECT at FROM processed WHERE scope = ? ORDER BY at DESC LIMIT 1 OFFSET ?)"
+
+
+class StateStore:
+    """Per-scope keys and processed ids in one SQLite file (None: in memory)."""
+
+    def __init__(self, path: Optional[str] = None, legacy: Optional[str] = None):
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._cache: Dict[Tuple[str, str], Any] = {}
+        self._marks = 0
+        self.commits = 0
+        self._db = sqlite3.connect(str(self.path) if self.path else ":memory:",
+                                   check_same_thread=False, isolation_level=None)
+        if self.path:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        for scope, key, value in self._db.execute("SELECT scope, key, value FROM state"):
+            self._cache[(scope, key)] = json.loads(value)
+        if legacy:
+            self._migrate(Path(legacy))
+
+    # ─── Keys ──────────────────────────────────────────────────────────────
+
+    def get(self, scope: str, key: str, default: Any = None) -> Any:
+        return self._cache.get((scope, key), default)
+
+    def set(self, scope: str, key: str, value: Any):
+        """Store ``value`` (anything JSON can hold; None deletes the key)."""
+        with self._lock:
+            if value is None:
+                self._cache.pop((scope, key), None)
+                statement = (_DELETE, (scope, key))
+            else:
+                self._cache[(scope, key)] = value
+                statement = (_UPSERT, (scope, key, json.dumps(value)))
+        self._write([statement])
+
+    def scope(self, scope: str) -> Dict[str, Any]:
+        """Every key of ``scope``."""
+        with self._lock:
+            return {key: value for (s, key), value in self._cache.items() if s == scope}
+
+    # ─── Processed ids ─────────────────────────────────────────────────────
+
+    def processed(self, scope: str, item_id: str) -> bool:
+        # Marked earlier in this thread's open batch
+        pending = getattr(self._local, "pending", None) or []
+        if any(sql == _MARK and params[:2] == (scope, str(item_id)) for sql, params in pending):
+            return True
+        with self._lock:
+            row = self._db.execute("SELECT 1 FROM processed WHERE scope = ? AND id = ?",
+                                   (scope, str(item_id))).fetchone()
+        return row is not None
+
+    def mark_processed(self, scope: str, item_id: str):
+        statements = [(_MARK, (scope, str(item_id), get_clock().time()))]
+        with self._lock:
+            self._marks += 1
+            if self._marks % PRUNE_EVERY == 0:
+                statements.append((_PRUNE, (scope, scope, PROCESSED_CAPACITY - 1)))
+        self._write(statements)
+
+    # ─── Commits ───────────────────────────────────────────────────────────
+
+    @contextmanager
+    def batch(self):
+        """
+        Commit this thread's writes in the block as one transaction.
+
+        The writes are committed even if the block raises: each records
+        something that already happened (a cursor moved, a reply sent).
+        Batches nest; the outermost one commits.
+        """
+        outer = getattr(self._local, "pending", None) is None
+        if outer:
+            self._local.pending = []
+        try:
+            yield self
+        finally:
+            if outer:
+                pending, self._local.pending = self._local.pending, None
+                self._commit(pending)
+
+    def _write(self, statements: List[Tuple[str, tuple]]):
+        pending = getattr(self._local, "pending", None)
+        if pending is not None:
+            pending.extend(statements)
+        else:
+            self._commit(statements)
+
+    def _commit(self, statements: List[Tuple[str, tuple]]):
+        if not statements:
+            return
+        with self._lock:
+            try:
+                self._db.execute("BEGIN IMMEDIATE")
+                for sql, params in statements:
+                    self._db.execute(sql, params)
+                self._db.execute("COMMIT")
+                self.commits += 1
+            except sqlite3.Error as e:
+                if self._db.in_transaction:
+                    self._db.execute("ROLLBACK")
+                logger.warning(f"State store {self.path or ':memory:'} commit failed: {e}")
+
+    # ─── Migration and lifetime ────────────────────────────────────────────
+
+    def _migrate(self, legacy: Path):
+        try:
+            state = json.loads(legacy.read_text())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Not migrating unreadable {legacy}: {e}")
+            return
+        with self.batch():
+            for old_key, (scope, key) in LEGACY_KEYS.items():
+                if state.get(old_key) is not None and self.get(scope, key) is None:
+                    self.set(scope, key, state[old_key])
+        try:
+            legacy.rename(legacy.with_name(legacy.name + ".migrated"))
+        except OSError as e:
+            logger.warning(f"Migrated {legacy} but could not rename it: {e}")
+        logger.info(f"Migrated {legacy} into {self.path or ':memory:'}")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
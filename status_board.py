@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+status_board.py - Tree-wide health on one shared-memory page
+
+Every daemon in the tree maps the same file and owns one fixed-size slot
+in it. Publishing is a ``struct.pack_into`` into its own slot; reading
+the whole tree is one pass over the mapping - no log parsing, no RPC to
+each child. Thousands of daemons fit in a few hundred KiB.
+
+Layout:
+    header  magic "PHIB", version, slot count, record size
+    slot i  one RECORD per daemon (see FIELDS)
+
+Each slot is guarded by a sequence counter (odd while its owner is
+writing) so readers never see a half-written record. Slots are claimed
+under an ``flock`` and reclaimed once their owning process is gone.
+
+Usage:
+  python3 status_board.py [phi_status.board]
+"""
+
+import fcntl
+import mmap
+import os
+import struct
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+MAGIC = b"PHIB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+HEADER_SIZE = 64
+BOARD_ENV = "PHI_STATUS_BOARD"
+
+# seq, pid, parent pid, generation, flags, started, updated,
+# check latency, eval latency, queue depth, children alive,
+# mood intensity, energy, fatigue, mood, daemon id
+RECORD = struct.Struct("<IiiHHddffIHfff16s16s")
+RECORD_SIZE = 128
+FIELDS = ("pid", "parent_pid", "generation", "flags", "started", "updated",
+          "check_latency", "eval_latency", "queue_depth", "children_alive",
+          "mood_intensity", "energy", "fatigue", "mood", "daemon_id")
+
+FLAG_RUNNING = 1
+FLAG_PAUSED = 2
+
+assert RECORD.size <= RECORD_SIZE
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class StatusBoard:
+    """A memory-mapped array of per-daemon status records."""
+
+    def __init__(self, path: str, slots: int = 4096, create: bool = True):
+        self.path = Path(path)
+        self.slots = slots
+        self.slot: Optional[int] = None
+        size = HEADER_SIZE + slots * RECORD_SIZE
+        fd = os.open(self.path, os.O_RDWR | (os.O_CREAT if create else 0), 0o644)
+        try:
+            with self._locked(fd):
+                current = os.fstat(fd).st_size
+                header = os.pread(fd, HEADER.size, 0) if current >= HEADER.size else b""
+                if len(header) == HEADER.size and HEADER.unpack(header)[0] == MAGIC:
+                    _, _, self.slots, record_size = HEADER.unpack(header)
+                    if record_size != RECORD_SIZE:
+                        raise ValueError(f"{path}: record size {record_size}, expected {RECORD_SIZE}")
+                    size = HEADER_SIZE + self.slots * RECORD_SIZE
+                elif create:
+                    os.ftruncate(fd, size)
+                    os.pwrite(fd, HEADER.pack(MAGIC, VERSION, slots, RECORD_SIZE), 0)
+                else:
+                    raise ValueError(f"{path} is not a status board")
+            self._fd = fd
+            self._map = mmap.mmap(fd, size)
+        except BaseException:
+            os.close(fd)
+            raise
+
+    @staticmethod
+    @contextmanager
+    def _locked(fd: int):
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def _offset(self, slot: int) -> int:
+        return HEADER_SIZE + slot * RECORD_SIZE
+
+    def _pid_at(self, slot: int) -> int:
+        return struct.unpack_from("<i", self._map, self._offset(slot) + 4)[0]
+
+    def claim(self, pid: Optional[int] = None, daemon_id: str = "", generation: int = 0,
+              parent_pid: int = 0) -> int:
+        """Take a free slot (or one whose process died) for ``pid``."""
+        pid = pid or os.getpid()
+        with self._locked(self._fd):
+            for slot in range(self.slots):
+                owner = self._pid_at(slot)
+                if owner == 0 or owner == pid or not _pid_alive(owner):
+                    now = time.time()
+                    self._write(slot, pid, parent_pid, generation, FLAG_RUNNING, now, now,
+                                0.0, 0.0, 0, 0, 0.0, 0.0, 0.0, b"", daemon_id.encode()[:16])
+                    self.slot = slot
+                    return slot
+        raise RuntimeError(f"status board {self.path} is full ({self.slots} slots)")
+
+    def _write(self, slot: int, *values):
+        offset = self._offset(slot)
+        seq = struct.unpack_from("<I", self._map, offset)[0]
+        struct.pack_into("<I", self._map, offset, seq + 1)  # odd: write in progress
+        RECORD.pack_into(self._map, offset, seq + 1, *values)
+        struct.pack_into("<I", self._map, offset, seq + 2)
+
+    def publish(self, **fields):
+        """Update this daemon's slot; unspecified fields keep their values."""
+        if self.slot is None:
+            return
+        record = self._read(self.slot)
+        record.update(fields, updated=time.time())
+        values = [record[name] for name in FIELDS]
+        values[-2] = str(values[-2]).encode()[:16]
+        values[-1] = str(values[-1]).encode()[:16]
+        self._write(self.slot, *values)
+
+    def release(self):
+        """Give the slot back (on clean shutdown)."""
+        if self.slot is None:
+            return
+        with self._locked(self._fd):
+            self._map[self._offset(self.slot):self._offset(self.slot) + RECORD_SIZE] = bytes(RECORD_SIZE)
+        self.slot = None
+
+    def _read(self, slot: int) -> Optional[Dict]:
+        offset = self._offset(slot)
+        for _ in range(100):
+            raw = RECORD.unpack_from(self._map, offset)
+            if raw[0] % 2 == 0 and struct.unpack_from("<I", self._map, offset)[0] == raw[0]:
+                record = dict(zip(FIELDS, raw[1:]))
+                record["mood"] = record["mood"].rstrip(b"\0").decode(errors="replace")
+                record["daemon_id"] = record["daemon_id"].rstrip(b"\0").decode(errors="replace")
+                return record
+        return None  # owner is mid-write on every attempt; skip it this pass
+
+    def read_all(self, alive_only: bool = True) -> List[Dict]:
+        """Every occupied slot, in one pass."""
+        records = []
+        for slot in range(self.slots):
+            pid = self._pid_at(slot)
+            if pid == 0 or (alive_only and not _pid_alive(pid)):
+                continue
+            record = self._read(slot)
+            if record:
+                record["slot"] = slot
+                records.append(record)
+        return records
+
+    def close(self):
+        self._map.close()
+        os.close(self._fd)
+
+
+def render(records: List[Dict]) -> str:
+    now = time.time()
+    lines = [f"{'SLOT':>4} {'PID':>7} {'GEN':>3} {'UPTIME':>9} {'CHECK':>7} {'EVAL':>7} "
+             f"{'QUEUE':>5} {'KIDS':>4} {'MOOD':<12} {'ENERGY':>6} ID"]
+    for r in sorted(records, key=lambda r: (r["generation"], r["slot"])):
+        state = " (paused)" if r["flags"] & FLAG_PAUSED else ""
+        lines.append(
+            f"{r['slot']:>4} {r['pid']:>7} {r['generation']:>3} {now - r['started']:>8.0f}s "
+            f"{r['check_latency'] * 1000:>5.0f}ms {r['eval_latency']:>6.2f}s {r['queue_depth']:>5} "
+            f"{r['children_alive']:>4} {r['mood'] or '-':<12} {r['energy']:>6.0%} {r['daemon_id']}{state}")
+    lines.append(f"{len(records)} daemon(s)")
+    return "\n".join(lines)
+
+
+def main() -> int:
+    path = sys.argv[1] if len(sys.argv) > 1 else "phi_status.board"
+    try:
+        board = StatusBoard(path, create=False)
+    except (OSError, ValueError) as e:
+        print(f"No status board at {path}: {e}")
+        return 1
+    try:
+        print(render(board.read_all()))
+    finally:
+        board.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,12 +10,64 @@ import os
 import sys
 import tempfile
 import shutil
+import socket
+import subprocess
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 # Add parent directory to path to import phi_daemon
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import phi_daemon
+import rosetta
+import spec_cache
+import file_watcher
+import scheduler
+import control
+import metrics
+import log_pipeline
+import tree
+import work
+import status_board
+import checkpoint
+import workspace
+import file_index
+import http_clients
+import bluesky_session
+import state_store
+import clock
+import soul_population
+from datetime import datetime
+import soul
+import mention_responder
+import asyncio
+import logging
+import random
+import signal
+import threading
+import time
+import urllib.request
+
+# A stand-in rosettavm: one-shot mode echoes its arguments, --serve speaks
+# the line-delimited JSON protocol unless FAKE_RVM_NO_SERVE is set, and
+# backends listed in FAKE_RVM_BROKEN always fail.
+FAKE_ROSETTAVM = """#!/usr/bin/env python3
+import json, os, sys
+if sys.argv[1] in os.environ.get("FAKE_RVM_BROKEN", "").split(","):
+    sys.exit("backend unavailable")
+if sys.argv[2:] == ["--serve"]:
+    if os.environ.get("FAKE_RVM_NO_SERVE"):
+        sys.exit("unknown flag --serve")
+    for line in sys.stdin:
+        req = json.loads(line)
+        if req["op"] == "ping":
+            print(json.dumps({"id": req["id"], "event": "pong"}), flush=True)
+            continue
+        for i in range(3):
+            print(json.dumps({"id": req["id"], "event": "output", "line": f"step {i}"}), flush=True)
+        print(json.dumps({"id": req["id"], "event": "done", "ok": True, "metrics": {"steps": 3}}), flush=True)
+else:
+    print("oneshot", *sys.argv[1:])
+"""
 
 
 class TestPhiDaemon(unittest.TestCase):
@@ -237,6 +289,1997 @@ class TestConfiguration(unittest.TestCase):
         self.assertFalse(daemon.config["recursive_deploy"])
 
 
+class TestChildSupervisor(unittest.TestCase):
+    """Test real process-backed child supervision."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.original_dir = os.getcwd()
+        os.chdir(self.test_dir)
+        self.config = {
+            "child_max_restarts": 2,
+            "child_restart_backoff": 0.0,
+            "child_memory_mb": 256,
+        }
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        os.chdir(self.original_dir)
+        shutil.rmtree(self.test_dir)
+    
+    def _script(self, body):
+        script = Path(self.test_dir) / "child.py"
+        script.write_text(body)
+        return script
+    
+    @staticmethod
+    def _gone(pid):
+        """Exited, counting a zombie that init has not reaped yet."""
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        try:
+            return Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()[0] == "Z"
+        except OSError:
+            return True
+    
+    def test_launch_tracks_pid_and_stop_terminates(self):
+        """Test that a launched child has a PID and is stopped on shutdown."""
+        script = self._script("import time\ntime.sleep(60)\n")
+        supervisor = phi_daemon.ChildSupervisor(self.config)
+        child = phi_daemon.ChildProcess("PHI-1-0-1", 1, Path(self.test_dir), slot=0)
+        
+        with patch.object(phi_daemon, "DAEMON_SCRIPT", script):
+            self.assertTrue(supervisor.launch(child))
+        
+        self.assertIn("PHI-1-0-1", supervisor.pids())
+        self.assertEqual(supervisor.alive_count(), 1)
+        supervisor.stop(timeout=5)
+        self.assertEqual(supervisor.alive_count(), 0)
+    
+    def test_crashed_child_is_restarted_then_abandoned(self):
+        """Test crashed children are restarted up to the configured limit."""
+        script = self._script("import sys\nsys.exit(3)\n")
+        supervisor = phi_daemon.ChildSupervisor(self.config)
+        child = phi_daemon.ChildProcess("PHI-1-0-1", 1, Path(self.test_dir), slot=0)
+        
+        with patch.object(phi_daemon, "DAEMON_SCRIPT", script):
+            supervisor.launch(child)
+            for _ in range(50):
+                child.process.wait()
+                supervisor.supervise()
+                if child.given_up:
+                    break
+        
+        self.assertTrue(child.given_up)
+        self.assertEqual(child.restarts, 2)
+        self.assertEqual(child.last_exit, 3)
+    
+    def test_crashed_child_group_is_cleared_before_restart(self):
+        """Test helpers left by a crashed child die before it is restarted."""
+        script = self._script(
+            "import subprocess, sys\n"
+            "helper = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+            "open('helper.pid', 'w').write(str(helper.pid))\n"
+            "sys.exit(3)\n")
+        supervisor = phi_daemon.ChildSupervisor(self.config)
+        child = phi_daemon.ChildProcess("PHI-1-0-1", 1, Path(self.test_dir), slot=0)
+        
+        with patch.object(phi_daemon, "DAEMON_SCRIPT", script):
+            supervisor.launch(child)
+            child.process.wait()
+            helper = int(Path("helper.pid").read_text())
+            with patch.object(supervisor, "launch") as relaunch:
+                while not relaunch.called:
+                    supervisor.supervise()
+        
+        self.assertTrue(self._gone(helper))  # SIGKILLed before the relaunch
+    
+    @unittest.skipUnless(phi_daemon.HAS_PRCTL, "needs prctl")
+    def test_child_dies_with_its_parent(self):
+        """Test a supervised daemon is signalled when its parent crashes."""
+        grandchild = self._script(
+            f"import os, sys, time\nsys.path.insert(0, {str(Path(phi_daemon.__file__).parent)!r})\n"
+            "import phi_daemon\n"
+            "assert phi_daemon.die_with_parent()\n"
+            "open('ready', 'w').close()\n"
+            "time.sleep(60)\n")
+        parent = subprocess.Popen(
+            [sys.executable, "-c",
+             "import os, subprocess, sys, time\n"
+             f"env = dict(os.environ, {phi_daemon.PARENT_PID_ENV}=str(os.getpid()))\n"
+             f"child = subprocess.Popen([sys.executable, {str(grandchild)!r}], env=env, start_new_session=True)\n"
+             "print(child.pid, flush=True)\n"
+             "time.sleep(60)\n"],
+            stdout=subprocess.PIPE, text=True)
+        pid = int(parent.stdout.readline())
+        while not Path("ready").exists():
+            time.sleep(0.01)
+        parent.kill()
+        parent.wait()
+        parent.stdout.close()
+        
+        for _ in range(500):
+            if self._gone(pid):
+                break
+            time.sleep(0.01)
+        else:
+            os.kill(pid, signal.SIGKILL)
+            self.fail("child outlived its parent")
+    
+    def test_supervised_spawn_launches_process(self):
+        """Test _spawn_child launches a process when supervision is enabled."""
+        with open("config.json", "w") as f:
+            json.dump({"supervise_children": True, "max_generations": 1}, f)
+        script = self._script("import time\ntime.sleep(60)\n")
+        daemon = phi_daemon.PhiDaemon(generation=0)
+        
+        with patch.object(phi_daemon, "DAEMON_SCRIPT", script):
+            child_id = daemon._spawn_child(generation=1, index=0)
+        
+        try:
+            self.assertIn(child_id, daemon.supervisor.pids())
+            self.assertEqual(daemon.self_check()["children_alive"], 1)
+        finally:
+            daemon.supervisor.stop(timeout=5)
+
+
+class TestRosettaRunner(unittest.TestCase):
+    """Test the warm RosettaVM worker and its one-shot fallback."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.binary = Path(self.test_dir) / "rosettavm"
+        self.binary.write_text(FAKE_ROSETTAVM)
+        self.binary.chmod(0o755)
+        self.config = {"binary": str(self.binary), "backend": "cpu", "request_timeout": 10,
+                       "persistent_worker": True}
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir)
+    
+    def test_worker_streams_and_stays_warm(self):
+        """Test evaluations reuse one worker and stream output lines."""
+        runner = rosetta.RosettaRunner(self.config)
+        streamed = []
+        try:
+            first = runner.evaluate("seed.phi", ["--vector4"], on_output=streamed.append)
+            pid = runner.worker.process.pid
+            second = runner.evaluate("seed.phi", ["--vector4"])
+        finally:
+            runner.stop()
+        
+        self.assertEqual(first.via, "worker")
+        self.assertEqual(streamed, ["step 0", "step 1", "step 2"])
+        self.assertEqual(first.metrics, {"steps": 3})
+        self.assertEqual(second.via, "worker")
+        self.assertEqual(runner.fallbacks, 0)
+        self.assertIsNotNone(pid)
+    
+    def test_falls_back_to_cli_when_worker_unavailable(self):
+        """Test the one-shot CLI is used when --serve is unsupported."""
+        runner = rosetta.RosettaRunner(self.config)
+        with patch.dict(os.environ, {"FAKE_RVM_NO_SERVE": "1"}):
+            result = runner.evaluate("seed.phi", ["--vector4"])
+        
+        self.assertEqual(result.via, "cli")
+        self.assertEqual(result.stdout.strip(), "oneshot cpu seed.phi --vector4")
+        self.assertEqual(runner.fallbacks, 1)
+    
+    def test_timeout_is_a_worker_failure(self):
+        """Test a timed-out worker falls back to the CLI; a spec failure does not."""
+        runner = rosetta.RosettaRunner(self.config)
+        worker = MagicMock()
+        worker.alive.return_value = True  # still reaping the killed process
+        worker.evaluate.side_effect = rosetta.RosettaTimeout("rosettavm worker timed out")
+        with patch.object(runner, "_ensure_worker", return_value=worker):
+            self.assertEqual(runner.evaluate("seed.phi", []).via, "cli")
+            worker.alive.return_value = False
+            worker.evaluate.side_effect = rosetta.RosettaError("syntax error")
+            with self.assertRaises(rosetta.RosettaError):
+                runner.evaluate("other.phi", [])
+        self.assertEqual(runner.fallbacks, 1)
+    
+    def test_probe_skips_broken_backends(self):
+        """Test backend probing returns only working backends, in order."""
+        with patch.object(rosetta, "_cuda_present", return_value=True), \
+                patch.dict(os.environ, {"FAKE_RVM_BROKEN": "cuda"}):
+            backends = rosetta.select_backends({"binary": str(self.binary), "backend": "auto"})
+        
+        self.assertEqual(backends, ["cpu"])
+    
+    def test_failing_backend_falls_back(self):
+        """Test a runner switches to a working fallback backend."""
+        config = dict(self.config, backend="cuda", fallback_backends=["cpu"], persistent_worker=False)
+        runner = rosetta.RosettaRunner(config)
+        with patch.dict(os.environ, {"FAKE_RVM_BROKEN": "cuda"}):
+            result = runner.evaluate("seed.phi", [])
+        
+        self.assertEqual(result.stdout.strip(), "oneshot cpu seed.phi")
+        self.assertEqual(runner.backend, "cpu")
+        self.assertEqual(runner.fallback_backends, [])
+    
+    def test_benchmark_reports_each_backend(self):
+        """Test the benchmark harness measures every spec on every backend."""
+        spec = Path(self.test_dir) / "seed.phi"
+        spec.write_text("-- seed\n")
+        report = rosetta.benchmark([str(spec)], ["cpu", "cuda"], repeat=2, binary=str(self.binary))
+        
+        self.assertEqual(len(report["rows"]), 2)
+        self.assertTrue(all(row["ok"] for row in report["rows"]))
+        self.assertGreater(report["rows"][0]["peak_rss_kb"], 0)
+        self.assertEqual(report["summary"]["cpu"]["specs_ok"], 1)
+    
+    def test_missing_binary_raises(self):
+        """Test a missing binary surfaces as FileNotFoundError."""
+        runner = rosetta.RosettaRunner({"binary": str(Path(self.test_dir) / "missing")})
+        with self.assertRaises(FileNotFoundError):
+            runner.evaluate("seed.phi", [])
+
+
+class TestRosettaPool(unittest.TestCase):
+    """Test concurrent multi-seed evaluation."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.binary = Path(self.test_dir) / "rosettavm"
+        self.binary.write_text(FAKE_ROSETTAVM)
+        self.binary.chmod(0o755)
+        self.config = {"binary": str(self.binary), "backend": "cpu", "persistent_worker": True}
+        self.results = {}
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir)
+    
+    def _record(self, seed, result, error):
+        self.results.setdefault(seed, []).append((result, error))
+    
+    def test_all_seeds_evaluated(self):
+        """Test every submitted seed is evaluated once."""
+        pool = rosetta.RosettaPool(self.config, size=3, on_result=self._record)
+        try:
+            for i in range(6):
+                pool.submit(f"seed{i}.phi", ["--vector4"])
+            self.assertTrue(pool.wait_idle(timeout=10))
+        finally:
+            pool.stop()
+        
+        self.assertEqual(sorted(self.results), [f"seed{i}.phi" for i in range(6)])
+        for runs in self.results.values():
+            self.assertEqual(len(runs), 1)
+            self.assertIsNone(runs[0][1])
+    
+    def test_duplicate_submissions_coalesce(self):
+        """Test a seed queued twice is only evaluated once."""
+        pool = rosetta.RosettaPool(self.config, size=1, on_result=self._record)
+        try:
+            pool.submit("a.phi", [])
+            pool.submit("b.phi", [])
+            pool.submit("b.phi", [])
+            self.assertTrue(pool.wait_idle(timeout=10))
+        finally:
+            pool.stop()
+        
+        self.assertEqual(len(self.results["b.phi"]), 1)
+    
+    def test_daemon_aggregates_per_seed_status(self):
+        """Test per-seed results are folded into self_check."""
+        original_dir = os.getcwd()
+        os.chdir(self.test_dir)  # no repo checkpoint or status board
+        try:
+            daemon = phi_daemon.PhiDaemon(generation=0)
+            daemon._record_evolution("a.phi", rosetta.RosettaResult("ok", via="worker"), None)
+            daemon._record_evolution("b.phi", None, rosetta.RosettaError("boom"))
+            evolution = daemon.self_check()["evolution"]
+        finally:
+            os.chdir(original_dir)
+        
+        self.assertEqual(evolution["runs"], 2)
+        self.assertEqual(evolution["failures"], 1)
+        self.assertTrue(evolution["seeds"]["a.phi"]["ok"])
+        self.assertEqual(evolution["seeds"]["b.phi"]["error"], "boom")
+
+
+class TestSpecCache(unittest.TestCase):
+    """Test the content-addressed RosettaVM result cache."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.specs = Path(self.test_dir) / "specs"
+        (self.specs / "phi-core").mkdir(parents=True)
+        (self.specs / "phi-core" / "phi.phi").write_text("-- core v1\n")
+        self.seed = self.specs / "seed.phi"
+        self.seed.write_text("import RosettaVM\nimport phi-core/phi.phi  -- core\n")
+        self.cache = spec_cache.SpecCache(Path(self.test_dir) / ".phi_cache", roots=[self.specs])
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir)
+    
+    def test_dependencies_are_transitive(self):
+        """Test imports are resolved relative to the spec roots."""
+        files, unresolved = spec_cache.spec_dependencies(self.seed, [self.specs])
+        
+        self.assertEqual(files[0], self.seed.resolve())
+        self.assertIn((self.specs / "phi-core" / "phi.phi").resolve(), files)
+        self.assertEqual(unresolved, ["RosettaVM"])
+    
+    def test_key_tracks_imports_backend_and_flags(self):
+        """Test the key changes with any input of the evaluation."""
+        key = self.cache.key(str(self.seed), "cuda", ["--vector4"])
+        
+        self.assertEqual(key, self.cache.key(str(self.seed), "cuda", ["--vector4"]))
+        self.assertNotEqual(key, self.cache.key(str(self.seed), "cpu", ["--vector4"]))
+        self.assertNotEqual(key, self.cache.key(str(self.seed), "cuda", []))
+        
+        (self.specs / "phi-core" / "phi.phi").write_text("-- core v2, longer\n")
+        self.assertNotEqual(key, self.cache.key(str(self.seed), "cuda", ["--vector4"]))
+    
+    def test_hits_misses_and_lru_eviction(self):
+        """Test counters and that the least recently used entry is evicted."""
+        cache = spec_cache.SpecCache(Path(self.test_dir) / "small", max_bytes=120)
+        
+        self.assertIsNone(cache.get("a" * 64))
+        cache.put("a" * 64, {"stdout": "x" * 40})
+        cache.put("b" * 64, {"stdout": "y" * 40})
+        self.assertIsNotNone(cache.get("a" * 64))
+        cache.put("c" * 64, {"stdout": "z" * 40})
+        
+        self.assertIsNone(cache.get("b" * 64))
+        self.assertIsNotNone(cache.get("a" * 64))
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["evictions"], 1)
+        self.assertLessEqual(stats["bytes"], 120)
+    
+    def test_runner_answers_from_cache(self):
+        """Test an unchanged spec is not sent to RosettaVM twice."""
+        binary = Path(self.test_dir) / "rosettavm"
+        binary.write_text(FAKE_ROSETTAVM)
+        binary.chmod(0o755)
+        runner = rosetta.RosettaRunner({"binary": str(binary), "persistent_worker": False},
+                                       cache=self.cache)
+        
+        first = runner.evaluate(str(self.seed), ["--vector4"])
+        binary.unlink()
+        second = runner.evaluate(str(self.seed), ["--vector4"])
+        
+        self.assertEqual(first.via, "cli")
+        self.assertEqual(second.via, "cache")
+        self.assertEqual(second.stdout, first.stdout)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+
+class TestSpecWatching(unittest.TestCase):
+    """Test change detection and targeted re-evaluation."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.specs = Path(self.test_dir) / "specs"
+        self.specs.mkdir()
+        (self.specs / "core.phi").write_text("-- core\n")
+        (self.specs / "a.phi").write_text("import core.phi\n")
+        (self.specs / "b.phi").write_text("-- standalone\n")
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir)
+    
+    def _check_watcher(self, use_inotify):
+        watcher = file_watcher.FileWatcher([self.specs], debounce=0.05, poll_interval=0.05,
+                                           use_inotify=use_inotify)
+        try:
+            self.assertEqual(watcher.wait_for_changes(timeout=0.1), set())
+            (self.specs / "core.phi").write_text("-- core v2, edited\n")
+            (self.specs / "notes.txt").write_text("ignored")
+            changed = watcher.wait_for_changes(timeout=5)
+        finally:
+            watcher.close()
+        self.assertEqual(changed, {(self.specs / "core.phi").resolve()})
+    
+    def test_polling_watcher_detects_changes(self):
+        """Test the stat-polling fallback reports changed specs."""
+        self._check_watcher(use_inotify=False)
+    
+    def test_inotify_watcher_detects_changes(self):
+        """Test the inotify watcher reports changed specs."""
+        watcher = file_watcher.FileWatcher([self.specs])
+        mode = watcher.mode
+        watcher.close()
+        if mode != "inotify":
+            self.skipTest("inotify not available")
+        self._check_watcher(use_inotify=True)
+    
+    def test_only_dependent_seeds_are_affected(self):
+        """Test a change to an import only re-evaluates its dependents."""
+        graph = spec_cache.SpecGraph([str(self.specs / "a.phi"), str(self.specs / "b.phi")],
+                                     roots=[self.specs])
+        
+        self.assertEqual(graph.affected([self.specs / "core.phi"]), [str(self.specs / "a.phi")])
+        self.assertEqual(graph.affected([self.specs / "b.phi"]), [str(self.specs / "b.phi")])
+        self.assertEqual(graph.affected([self.specs / "unrelated.phi"]), [])
+
+
+class TestScheduler(unittest.TestCase):
+    """Test the event-loop scheduler behind operational mode."""
+    
+    def _run_for(self, sched, seconds, release=None):
+        def stop():
+            sched.stop()
+            if release:
+                release.set()
+        
+        async def main():
+            asyncio.get_running_loop().call_later(seconds, stop)
+            await sched.run()
+        asyncio.run(main())
+    
+    def test_slow_job_does_not_block_others(self):
+        """Test a blocking job runs alongside a fast one."""
+        sched = scheduler.Scheduler()
+        release = threading.Event()
+        sched.add("slow", lambda: release.wait(5), interval=0.01)
+        fast = sched.add("fast", lambda: None, interval=0.02)
+        self._run_for(sched, 0.3, release)
+        
+        self.assertGreaterEqual(fast.runs, 5)
+        self.assertGreater(sched.jobs["slow"].skipped, 0)
+    
+    def test_after_run_uses_interval_from_the_run(self):
+        """Test an after_run job's next delay reflects the run just made."""
+        sim = clock.SimulatedClock(seed=1)
+        sched = scheduler.Scheduler(clock=sim)
+        delays = {"next": 100.0}
+        times = []
+        
+        def poll():
+            times.append(sim.monotonic())
+            delays["next"] = 10.0  # learned during the run
+        
+        sched.add("poll", poll, lambda: delays["next"], after_run=True)
+        sched.add("end", sched.stop, 1000, delay=35)
+        asyncio.run(sched.run())
+        self.assertEqual(times, [0.0, 10.0, 20.0, 30.0])
+    
+    def test_timeouts_and_failures_are_counted(self):
+        """Test per-job timeouts and errors are isolated and recorded."""
+        sched = scheduler.Scheduler()
+        
+        async def hang():
+            await asyncio.sleep(10)
+        
+        def boom():
+            raise RuntimeError("boom")
+        
+        hung = sched.add("hang", hang, interval=0.05, timeout=0.05)
+        broken = sched.add("boom", boom, interval=0.05)
+        self._run_for(sched, 0.3)
+        
+        self.assertGreater(hung.timeouts, 0)
+        self.assertGreater(broken.failures, 0)
+    
+    def test_jitter_stays_within_bounds(self):
+        """Test jittered intervals stay within the configured fraction."""
+        job = scheduler.PeriodicJob("j", lambda: None, interval=10.0, jitter=0.2)
+        delays = [job.next_delay() for _ in range(200)]
+        
+        self.assertTrue(all(8.0 <= d <= 12.0 for d in delays))
+        self.assertGreater(len(set(delays)), 1)
+    
+    def test_pause_holds_jobs_until_resume(self):
+        """Test a paused scheduler launches nothing until resumed."""
+        sched = scheduler.Scheduler()
+        job = sched.add("tick", lambda: None, interval=0.01)
+        sched.pause()
+        
+        async def main():
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.15, lambda: self.assertEqual(job.runs, 0))
+            loop.call_later(0.15, sched.resume)
+            loop.call_later(0.3, sched.stop)
+            await sched.run()
+        asyncio.run(main())
+        
+        self.assertGreater(job.runs, 0)
+    
+    def test_daemon_registers_jobs(self):
+        """Test the daemon schedules its periodic duties."""
+        test_dir = tempfile.mkdtemp()
+        original_dir = os.getcwd()
+        os.chdir(test_dir)
+        try:
+            with open("config.json", "w") as f:
+                json.dump({"jobs": {"self_check": {"timeout": 7}}}, f)
+            daemon = phi_daemon.PhiDaemon(generation=1)
+            sched = daemon.build_scheduler()
+        finally:
+            os.chdir(original_dir)
+            shutil.rmtree(test_dir)
+        
+        self.assertIn("self_check", sched.jobs)
+        self.assertEqual(sched.jobs["self_check"].timeout, 7)
+        self.assertNotIn("evolution", sched.jobs)
+
+
+class TestControlServer(unittest.TestCase):
+    """Test cases for the Unix control socket."""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.sock = os.path.join(self.test_dir, "test.sock")
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+    
+    def test_commands_update_state_and_call_handlers(self):
+        """Test pause/resume/reload/status replies and handlers."""
+        calls = []
+        server = control.ControlServer(self.sock, kill_switch=None,
+                                       on_pause=calls.append,
+                                       on_reload=lambda: calls.append("reload"),
+                                       status=lambda: {"generation": 3})
+        self.assertTrue(server.start())
+        try:
+            self.assertTrue(control.send_command(self.sock, "pause")["ok"])
+            self.assertTrue(server.paused)
+            reply = control.send_command(self.sock, "status")
+            self.assertEqual(reply["status"], {"generation": 3})
+            self.assertTrue(reply["paused"])
+            control.send_command(self.sock, "resume")
+            control.send_command(self.sock, "reload")
+            self.assertFalse(control.send_command(self.sock, "explode")["ok"])
+        finally:
+            server.close()
+        
+        self.assertEqual(calls, [True, False, "reload"])
+        self.assertFalse(os.path.exists(self.sock))
+    
+    def test_stop_wakes_a_sleeping_loop(self):
+        """Test a stop command ends a long wait within milliseconds."""
+        server = control.ControlServer(self.sock, kill_switch=None)
+        server.start()
+        result = {}
+        sleeper = threading.Thread(target=lambda: result.update(stopped=server.wait(3600)))
+        try:
+            sleeper.start()
+            control.send_command(self.sock, "stop")
+            sleeper.join(60)  # an hour-long wait, ended by the command
+        finally:
+            server.close()
+        
+        self.assertFalse(sleeper.is_alive())
+        self.assertTrue(result["stopped"])
+    
+    def test_live_socket_is_not_taken_over(self):
+        """Test a second server leaves a live socket alone but replaces a stale one."""
+        first = control.ControlServer(self.sock, kill_switch=None, status=lambda: {"who": "first"})
+        self.assertTrue(first.start())
+        try:
+            self.assertEqual(os.stat(self.sock).st_mode & 0o777, 0o600)
+            self.assertFalse(control.ControlServer(self.sock, kill_switch=None).start())
+            self.assertEqual(control.send_command(self.sock, "status")["status"], {"who": "first"})
+        finally:
+            first.close()
+        
+        # A crashed server leaves its socket file behind, refusing connections
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.sock)
+        stale.close()
+        second = control.ControlServer(self.sock, kill_switch=None)
+        self.assertTrue(second.start())
+        second.close()
+    
+    def test_kill_switch_still_stops(self):
+        """Test the kill.switch file is honoured as a stop request."""
+        kill_switch = os.path.join(self.test_dir, "kill.switch")
+        server = control.ControlServer(self.sock, kill_switch=kill_switch)
+        self.assertFalse(server.should_stop())
+        open(kill_switch, "w").close()
+        
+        self.assertTrue(server.wait(5))
+        self.assertTrue(server.stopping.is_set())
+    
+    def test_status_query_changes_nothing(self):
+        """Test a status query reads the last self-check instead of running one."""
+        original_dir = os.getcwd()
+        os.chdir(self.test_dir)
+        try:
+            daemon = phi_daemon.PhiDaemon(generation=1)
+        finally:
+            os.chdir(original_dir)
+        checks = daemon.metrics.get("phi_self_checks_total")
+        
+        self.assertEqual(daemon.control_status()["daemon_id"], daemon.daemon_id)
+        self.assertEqual(checks.value(), 0)
+        with patch.object(daemon, "_snapshot", wraps=daemon._snapshot) as snapshot:
+            daemon.self_check()
+            reply = daemon.control_status()
+        self.assertEqual(snapshot.call_count, 1)
+        self.assertEqual(checks.value(), 1)
+        self.assertEqual(reply["children_count"], 0)
+    
+    def test_daemon_stops_over_socket(self):
+        """Test the daemon's scheduler halts on a socket stop command."""
+        original_dir = os.getcwd()
+        os.chdir(self.test_dir)
+        try:
+            with open("config.json", "w") as f:
+                json.dump({"deployment_interval": 0.05, "control_socket": self.sock}, f)
+            daemon = phi_daemon.PhiDaemon(generation=1)
+            
+            def poke():
+                while not os.path.exists(self.sock):
+                    time.sleep(0.01)
+                self.assertEqual(control.send_command(self.sock, "status")["status"]["generation"], 1)
+                control.send_command(self.sock, "stop")
+            threading.Thread(target=poke, daemon=True).start()
+            
+            start = time.monotonic()
+            asyncio.run(asyncio.wait_for(daemon.run_async(), 10))
+            elapsed = time.monotonic() - start
+        finally:
+            os.chdir(original_dir)
+        
+        self.assertLess(elapsed, 5)
+        self.assertFalse(os.path.exists(self.sock))
+
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for the metrics registry and /metrics endpoint."""
+    
+    def test_text_exposition(self):
+        """Test counters, gauges and histograms render in text format."""
+        registry = metrics.MetricsRegistry()
+        runs = registry.counter("runs_total", "Runs", labels=("result",))
+        runs.inc(result="ok")
+        runs.inc(2, result="ok")
+        registry.gauge("depth", "Queue depth", func=lambda: 7)
+        latency = registry.histogram("latency_seconds", buckets=(0.1, 1.0))
+        latency.observe(0.05)
+        latency.observe(0.5)
+        latency.observe(5)
+        
+        text = registry.render()
+        self.assertIn("# TYPE runs_total counter", text)
+        self.assertIn('runs_total{result="ok"} 3', text)
+        self.assertIn("depth 7", text)
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{le="1"} 2', text)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 3', text)
+        self.assertIn("latency_seconds_count 3", text)
+        self.assertIs(registry.counter("runs_total"), runs)
+        with self.assertRaises(ValueError):
+            registry.gauge("runs_total")
+    
+    def test_http_endpoint(self):
+        """Test the registry is served at /metrics."""
+        registry = metrics.MetricsRegistry()
+        registry.counter("pings_total").inc()
+        server = metrics.MetricsServer(registry, port=0)
+        self.assertTrue(server.start())
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as r:
+                body = r.read().decode()
+                content_type = r.headers["Content-Type"]
+        finally:
+            server.close()
+        
+        self.assertIn("pings_total 1", body)
+        self.assertTrue(content_type.startswith("text/plain"))
+    
+    def test_daemon_metrics_and_slim_self_check(self):
+        """Test the daemon feeds its registry and self_check stays small."""
+        test_dir = tempfile.mkdtemp()
+        original_dir = os.getcwd()
+        os.chdir(test_dir)
+        try:
+            daemon = phi_daemon.PhiDaemon(generation=0)
+            daemon._record_evolution("a.phi", rosetta.RosettaResult("ok", via="worker", elapsed=0.3), None)
+            status = daemon.self_check()
+            text = daemon.metrics.render()
+        finally:
+            os.chdir(original_dir)
+            shutil.rmtree(test_dir)
+        
+        self.assertNotIn("config", status)
+        self.assertNotIn("children_ids", status)
+        self.assertIs(status["evolution"], daemon.self_check()["evolution"])
+        self.assertIn('phi_vector4_runs_total{result="ok"} 1', text)
+        self.assertIn('phi_vector4_cycle_seconds_count{via="worker"} 1', text)
+        self.assertIn("phi_self_checks_total 1", text)
+        self.assertIn("phi_uptime_seconds", text)
+
+
+class TestLogPipeline(unittest.TestCase):
+    """Test cases for queued logging, rotation and rate limiting."""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.root = logging.getLogger()
+        self.saved = (list(self.root.handlers), self.root.level)
+    
+    def tearDown(self):
+        log_pipeline.stop_logging()
+        self.root.handlers[:], level = self.saved
+        self.root.setLevel(level)
+        shutil.rmtree(self.test_dir)
+    
+    def _record(self, kind=None, msg="hello"):
+        record = logging.LogRecord("t", logging.INFO, __file__, 1, msg, None, None)
+        if kind:
+            record.kind = kind
+        return record
+    
+    def test_rate_limit_and_sampling(self):
+        """Test per-kind token buckets and sampling drop only tagged records."""
+        limiter = log_pipeline.RateLimitFilter(
+            {"chatty": {"per_minute": 2}, "sampled": {"sample": 0.5}}, rng=random.Random(1))
+        passed = [limiter.filter(self._record("chatty")) for _ in range(5)]
+        sampled = sum(limiter.filter(self._record("sampled")) for _ in range(400))
+        
+        self.assertEqual(passed, [True, True, False, False, False])
+        self.assertEqual(limiter.dropped["chatty"], 3)
+        self.assertTrue(150 < sampled < 250)
+        self.assertTrue(all(limiter.filter(self._record()) for _ in range(10)))
+    
+    def test_writes_json_lines_from_background_thread(self):
+        """Test records reach the file as JSON lines once the queue drains."""
+        path = os.path.join(self.test_dir, "d.log")
+        log_pipeline.configure_logging({"file": path, "format": "json",
+                                        "limits": {"soul.status": {"per_minute": 1}}},
+                                       console=False)
+        log = logging.getLogger("phi-test")
+        for i in range(3):
+            log.info("status %d", i, extra={"kind": "soul.status"})
+        log.warning("plain")
+        log_pipeline.stop_logging()
+        
+        with open(path) as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual([e["msg"] for e in entries], ["status 0", "plain"])
+        self.assertEqual(entries[0]["kind"], "soul.status")
+        self.assertEqual(entries[1]["level"], "WARNING")
+    
+    def test_daemon_reload_reapplies_logging(self):
+        """Test a config reload changes the level and limits of live logging."""
+        original_dir = os.getcwd()
+        os.chdir(self.test_dir)
+        try:
+            with open("config.json", "w") as f:
+                json.dump({"logging": {"file": "d.log", "level": "INFO"}}, f)
+            daemon = phi_daemon.PhiDaemon(generation=1)
+            daemon.reload_config()  # nothing installed yet: leaves logging alone
+            self.assertIsNone(log_pipeline._listener)
+            
+            log_pipeline.configure_logging(daemon.config["logging"], console=False)
+            with open("config.json", "w") as f:
+                json.dump({"logging": {"file": "d.log", "level": "WARNING",
+                                       "limits": {"chatty": {"per_minute": 1}}}}, f)
+            daemon.reload_config()
+            log = logging.getLogger("phi-test")
+            log.info("quiet")
+            for _ in range(3):
+                log.warning("loud", extra={"kind": "chatty"})
+            log_pipeline.stop_logging()
+            with open("d.log") as f:
+                lines = f.read().splitlines()
+        finally:
+            os.chdir(original_dir)
+        
+        self.assertEqual(self.root.level, logging.WARNING)
+        self.assertEqual(len(lines), 1)
+        self.assertIn("loud", lines[0])
+    
+    def test_rotates_by_size_and_age(self):
+        """Test the file handler rolls over on size and on age."""
+        path = os.path.join(self.test_dir, "r.log")
+        handler = log_pipeline.RotatingLogHandler(path, max_bytes=200, max_age=3600, backup_count=2)
+        try:
+            for _ in range(10):
+                handler.emit(self._record(msg="x" * 50))
+            self.assertTrue(os.path.exists(path + ".1"))
+            
+            handler.maxBytes = 0
+            handler.opened_at -= 7200
+            self.assertTrue(handler.shouldRollover(self._record()))
+        finally:
+            handler.close()
+
+
+class TestDaemonTree(unittest.TestCase):
+    """Test cases for the in-process daemon tree."""
+    
+    CONFIG = {"max_generations": 3, "max_children_per_generation": 40,
+              "deployment_interval": 0.5, "tree": {"workers": 16}}
+    
+    def test_tree_follows_spawn_rules(self):
+        """Test the layout matches the process-mode spawn counts."""
+        daemon_tree = tree.DaemonTree(self.CONFIG)
+        
+        self.assertEqual(daemon_tree.generations(), {0: 1, 1: 40, 2: 800, 3: 10400})
+        root = daemon_tree.nodes[0]
+        first_child = daemon_tree.nodes[root.first_child]
+        self.assertEqual(root.child_count, 40)
+        self.assertEqual(first_child.parent, 0)
+        self.assertTrue(all(daemon_tree.nodes[c].generation == 2 for c in first_child.children))
+    
+    def test_max_instances_bounds_the_tree(self):
+        """Test max_instances caps the number of logical daemons."""
+        config = dict(self.CONFIG, tree={"max_instances": 500})
+        self.assertEqual(len(tree.DaemonTree(config)), 500)
+    
+    def test_ten_thousand_daemons_tick(self):
+        """Test 10k+ daemons all tick within one interval on a few workers."""
+        seen = set()
+        daemon_tree = tree.DaemonTree(self.CONFIG, duty=lambda node: seen.add(node.index))
+        asyncio.run(daemon_tree.run(duration=0.6))
+        
+        self.assertEqual(len(seen), len(daemon_tree))
+        self.assertEqual(daemon_tree.summary()["workers"], 16)
+    
+    def test_pacing_sets_each_nodes_interval(self):
+        """Test a pacing function overrides the shared interval per node."""
+        config = {"max_generations": 1, "max_children_per_generation": 2, "recursive_deploy": True,
+                  "tree": {"interval": 0.3, "workers": 1}}
+        daemon_tree = tree.DaemonTree(config)
+        daemon_tree.pacing = lambda node: 0.02 if node.index == 0 else 100.0
+        asyncio.run(daemon_tree.run(duration=0.5))
+        
+        self.assertGreater(daemon_tree.nodes[0].ticks, 3)
+        self.assertEqual([node.ticks for node in daemon_tree.nodes[1:]], [1, 1])
+    
+    def test_footprint_is_small(self):
+        """Test per-daemon memory overhead stays well under a kilobyte."""
+        footprint = tree.measure_footprint(self.CONFIG)
+        self.assertLess(footprint["bytes_per_instance"], 1024)
+    
+    def test_daemon_deploys_in_process(self):
+        """Test the seed hosts its tree without creating workspaces."""
+        test_dir = tempfile.mkdtemp()
+        original_dir = os.getcwd()
+        os.chdir(test_dir)
+        try:
+            with open("config.json", "w") as f:
+                json.dump({"max_generations": 2, "max_children_per_generation": 4,
+                           "recursive_deploy": True, "tree": {"in_process": True}}, f)
+            daemon = phi_daemon.PhiDaemon(generation=0)
+            self.assertTrue(daemon.deploy_in_process())
+            created = os.listdir(".")
+        finally:
+            os.chdir(original_dir)
+            shutil.rmtree(test_dir)
+        
+        self.assertEqual(len(daemon.children), 4)
+        self.assertEqual(len(daemon.tree), 1 + 4 + 8)
+        self.assertFalse([name for name in created if name.startswith("phi_gen_")])
+        self.assertEqual(daemon.self_check()["tree"]["instances"], 13)
+
+
+class TestWorkDistribution(unittest.TestCase):
+    """Test cases for pushing work down the tree and results back up."""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+    
+    def _drain(self, broker, agents, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while broker.pending() and time.monotonic() < deadline:
+            for agent in agents:
+                agent.poll()
+            time.sleep(0.01)
+    
+    def test_push_to_least_loaded_then_steal(self):
+        """Test units are spread over workers and idle workers steal."""
+        broker = work.WorkBroker()
+        broker.pull("a")
+        broker.pull("b")
+        for i in range(4):
+            broker.submit("metrics_aggregate", {"values": [i]})
+        
+        self.assertEqual([len(broker.queues["a"]), len(broker.queues["b"])], [2, 2])
+        self.assertEqual(len(broker.pull("b", 4)), 4)
+        self.assertEqual(broker.stolen, 2)
+    
+    def test_expired_lease_is_requeued(self):
+        """Test a unit whose worker went silent is handed out again."""
+        broker = work.WorkBroker(lease=0.0)
+        results = []
+        broker.submit("metrics_aggregate", {"values": [1, 2]}, callback=results.append)
+        unit = broker.pull("a")[0]
+        again = broker.pull("b")
+        
+        self.assertEqual(again[0]["id"], unit["id"])
+        self.assertEqual(broker.requeued, 1)
+        broker.report("b", [work.execute(again[0], {"metrics_aggregate": work.aggregate_metrics})])
+        broker.report("a", [{"id": unit["id"], "ok": True}])  # late duplicate is ignored
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["result"]["sum"], 3)
+    
+    def test_children_increase_throughput(self):
+        """Test three pulling workers run units side by side."""
+        lock = threading.Lock()
+        running = {"now": 0, "peak": 0}
+        
+        def sleep(payload):
+            with lock:
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+            time.sleep(payload["seconds"])
+            with lock:
+                running["now"] -= 1
+            return {}
+        
+        broker = work.WorkBroker()
+        agents = [work.WorkAgent(broker, f"w{i}", {"sleep": sleep}, capacity=1) for i in range(3)]
+        for _ in range(6):
+            broker.submit("sleep", {"seconds": 0.2})
+        try:
+            self._drain(broker, agents)
+        finally:
+            for agent in agents:
+                agent.stop()
+        
+        self.assertEqual(broker.completed, 6)
+        self.assertGreater(running["peak"], 1)  # a single worker would never overlap
+    
+    def test_relay_over_socket_reports_up(self):
+        """Test a child relays work to its own child and results reach the root."""
+        sock = os.path.join(self.test_dir, "work.sock")
+        root = work.WorkBroker()
+        server = work.WorkServer(root, sock)
+        self.assertTrue(server.start())
+        handlers = {"metrics_aggregate": work.aggregate_metrics}
+        middle_broker = work.WorkBroker()
+        middle = work.WorkAgent(work.WorkClient(sock), "middle", handlers, relay=middle_broker)
+        leaf = work.WorkAgent(middle_broker, "leaf", handlers)
+        results = []
+        try:
+            middle_broker.pull("leaf", 0)  # the leaf is alive
+            root.submit("metrics_aggregate", {"values": [2, 4]}, callback=results.append)
+            self._drain(root, [middle, leaf])
+        finally:
+            server.close()
+            middle.stop()
+            leaf.stop()
+        
+        self.assertEqual(results[0]["result"]["mean"], 3)
+        self.assertEqual(middle_broker.completed, 1)
+    
+    def test_mention_batches_share_one_responder(self):
+        """Test mention_batch units reuse one responder per handler set."""
+        handle = work.default_handlers()["mention_batch"]
+        with patch.object(mention_responder, "PhiResponder") as responder:
+            responder.return_value.generate_response.return_value = "φ"
+            for _ in range(3):
+                reply = handle({"mentions": [{"text": "what is phi?", "author": "ada"}]})
+        
+        self.assertEqual(reply, {"replies": ["φ"]})
+        responder.assert_called_once_with()
+    
+    def test_work_socket_is_not_taken_over(self):
+        """Test a second work server leaves a live parent's socket alone."""
+        sock = os.path.join(self.test_dir, "work.sock")
+        first = work.WorkServer(work.WorkBroker(), sock)
+        self.assertTrue(first.start())
+        try:
+            self.assertEqual(os.stat(sock).st_mode & 0o777, 0o600)
+            self.assertFalse(work.WorkServer(work.WorkBroker(), sock).start())
+            self.assertEqual(work.WorkClient(sock).pull("w", 1), [])
+        finally:
+            first.close()
+    
+    def test_daemon_distributes_seed_evaluations(self):
+        """Test the seed daemon turns Vector4 seeds into work units."""
+        binary = Path(self.test_dir) / "rosettavm"
+        binary.write_text(FAKE_ROSETTAVM)
+        binary.chmod(0o755)
+        original_dir = os.getcwd()
+        os.chdir(self.test_dir)
+        try:
+            with open("config.json", "w") as f:
+                json.dump({"work": {"enabled": True},
+                           "rosettavm": {"binary": str(binary), "backend": "cpu"},
+                           "vector4": {"seeds": ["seed.phi"], "watch": False}}, f)
+            Path("seed.phi").write_text("Expr = Num Int\n")
+            daemon = phi_daemon.PhiDaemon(generation=0)
+            self.assertTrue(daemon._start_evolution())
+            daemon._evolution_job()
+            daemon._submit_seed("seed.phi")  # still in flight: not queued twice
+            self.assertEqual(daemon.broker.submitted, 1)
+            self._drain(daemon.broker, [daemon.work_agent], timeout=10)
+        finally:
+            daemon.work_agent.stop()
+            os.chdir(original_dir)
+        
+        self.assertTrue(daemon.evolution["seed.phi"]["ok"])
+        self.assertIsNone(daemon.rosetta)
+
+
+class TestStatusBoard(unittest.TestCase):
+    """Test cases for the shared-memory status board."""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, "phi_status.board")
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+    
+    def test_publish_and_read_across_mappings(self):
+        """Test a record written through one mapping is read through another."""
+        writer = status_board.StatusBoard(self.path, slots=16)
+        reader = status_board.StatusBoard(self.path, create=False)
+        try:
+            slot = writer.claim(daemon_id="abc123", generation=2)
+            writer.publish(queue_depth=5, check_latency=0.25, mood="curious")
+            records = reader.read_all()
+        finally:
+            writer.close()
+            reader.close()
+        
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["slot"], slot)
+        self.assertEqual(records[0]["generation"], 2)
+        self.assertEqual(records[0]["queue_depth"], 5)
+        self.assertEqual(records[0]["mood"], "curious")
+        self.assertEqual(records[0]["daemon_id"], "abc123")
+        self.assertEqual(reader.slots, 16)
+    
+    def test_dead_slots_are_reclaimed(self):
+        """Test slots of exited processes are skipped and reused."""
+        board = status_board.StatusBoard(self.path, slots=2)
+        try:
+            dead = subprocess.Popen([sys.executable, "-c", "pass"])
+            dead.wait()
+            board.claim(pid=dead.pid)
+            self.assertEqual(board.read_all(), [])
+            self.assertEqual(board.claim(), 0)
+            board.claim(pid=1)
+            with self.assertRaises(RuntimeError):
+                board.claim(pid=dead.pid + 100000)
+        finally:
+            board.close()
+    
+    def test_thousands_of_slots_read_in_one_pass(self):
+        """Test a full board of thousands of daemons reads from memory alone."""
+        board = status_board.StatusBoard(self.path, slots=4096)
+        try:
+            now = time.time()
+            for i in range(4096):
+                # Every record owned by init, which is always alive
+                board._write(i, 1, 0, i % 4, status_board.FLAG_RUNNING, now, now,
+                             0.0, 0.0, 0, 0, 0.0, 0.0, 0.0, b"", b"")
+            # The whole scan is served by the mapping: no file reads or seeks
+            with patch.object(os, "read", side_effect=AssertionError("read")), \
+                    patch.object(os, "pread", side_effect=AssertionError("pread")), \
+                    patch.object(os, "lseek", side_effect=AssertionError("lseek")):
+                records = board.read_all()
+        finally:
+            board.close()
+        
+        self.assertEqual(len(records), 4096)
+        self.assertEqual([r["slot"] for r in records], list(range(4096)))
+        self.assertEqual(records[4095]["generation"], 3)
+    
+    def test_daemon_publishes_on_self_check(self):
+        """Test the daemon claims a slot and publishes each self-check."""
+        original_dir = os.getcwd()
+        os.chdir(self.test_dir)
+        try:
+            with open("config.json", "w") as f:
+                json.dump({"status_board": {"enabled": True, "slots": 8}}, f)
+            daemon = phi_daemon.PhiDaemon(generation=0)
+            daemon.self_check()
+            records = status_board.StatusBoard(self.path, create=False).read_all()
+            daemon.shutdown()
+            after = status_board.StatusBoard(self.path, create=False).read_all()
+        finally:
+            os.chdir(original_dir)
+        
+        self.assertEqual(records[0]["daemon_id"], daemon.daemon_id[:16])
+        self.assertEqual(records[0]["pid"], os.getpid())
+        self.assertEqual(after, [])
+
+
+class TestCheckpoint(unittest.TestCase):
+    """Test cases for checkpoints and warm restart."""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.original_dir = os.getcwd()
+        os.chdir(self.test_dir)
+    
+    def tearDown(self):
+        os.chdir(self.original_dir)
+        shutil.rmtree(self.test_dir)
+    
+    def test_msgpack_roundtrip(self):
+        """Test the built-in encoder round-trips every state type."""
+        state = {
+            "none": None, "flags": [True, False], "small": 7, "negative": -5,
+            "big": 2 ** 40, "very_negative": -2 ** 40, "pi": 3.14159,
+            "long_text": "φ" * 100, "raw": b"\x00\x01" * 200,
+            "nested": {str(i): [i, {"x": i * 0.5}] for i in range(20)},
+        }
+        body = checkpoint.packb(state)
+        self.assertEqual(checkpoint.unpackb(body), state)
+        # A fixmap tag, as msgpack itself would write
+        self.assertEqual(checkpoint.packb({"a": 1}), b"\x81\xa1a\x01")
+    
+    def test_damaged_checkpoint_is_ignored(self):
+        """Test truncated or corrupted checkpoints load as None."""
+        size = checkpoint.save("state.ckpt", {"daemon_id": "abc", "children": list(range(50))})
+        self.assertFalse(os.path.exists("state.ckpt.tmp"))
+        self.assertEqual(checkpoint.load("state.ckpt")["daemon_id"], "abc")
+        
+        with open("state.ckpt", "rb") as f:
+            data = f.read()
+        self.assertEqual(len(data), size)
+        with open("state.ckpt", "wb") as f:
+            f.write(data[:size // 2])
+        self.assertIsNone(checkpoint.load("state.ckpt"))
+        with open("state.ckpt", "wb") as f:
+            f.write(data[:-1] + bytes([data[-1] ^ 0xFF]))
+        self.assertIsNone(checkpoint.load("state.ckpt"))
+        self.assertIsNone(checkpoint.load("missing.ckpt"))
+    
+    def test_soul_state_roundtrip(self):
+        """Test a soul restores its emotions, actions and interests."""
+        original = soul.Soul(Path(self.test_dir))
+        original.emotions.feel("curious", 0.8)
+        original.reflection.record("self_check", True, "ok")
+        original.curiosity.interests["rosetta"] = 0.9
+        state = checkpoint.unpackb(checkpoint.packb(original.to_state()))
+        
+        restored = soul.Soul(Path(self.test_dir))
+        restored.restore(state)
+        self.assertEqual(restored.emotions.current, "curious")
+        self.assertAlmostEqual(restored.emotions.intensity, 0.8)
+        self.assertEqual(len(restored.reflection.actions), len(original.reflection.actions))
+        # Interest decays between save and restore, by a negligible amount here
+        self.assertAlmostEqual(restored.curiosity.interests["rosetta"], 0.9, places=6)
+    
+    def test_daemon_warm_restart(self):
+        """Test a restarted daemon resumes from its checkpoint."""
+        with open("config.json", "w") as f:
+            json.dump({"checkpoint": {"enabled": True, "path": "daemon.ckpt"}}, f)
+        first = phi_daemon.PhiDaemon(generation=0)
+        first.children = ["child-a", "child-b"]
+        first.child_records["child-a"] = (1, 0, "/nonexistent/a")
+        first._record_evolution("seed", rosetta.RosettaResult("ok", {"phi": 1.618}, elapsed=0.1), None)
+        first.checkpoint()
+        
+        second = phi_daemon.PhiDaemon(generation=0)
+        
+        self.assertTrue(second.restored)
+        self.assertEqual(second.daemon_id, first.daemon_id)
+        self.assertEqual(second.children, ["child-a", "child-b"])
+        self.assertEqual(second.child_records["child-a"], (1, 0, "/nonexistent/a"))
+        self.assertEqual(second.evolution_status()["seeds"]["seed"]["metrics"], {"phi": 1.618})
+        
+        # A checkpoint from another generation is not ours
+        self.assertFalse(phi_daemon.PhiDaemon(generation=1).restored)
+    
+    def test_warm_restart_publishes_restored_id(self):
+        """Test the board slot and work agent carry the restored daemon id."""
+        with open("config.json", "w") as f:
+            json.dump({"checkpoint": {"enabled": True, "path": "daemon.ckpt"},
+                       "status_board": {"enabled": True, "path": "phi_status.board", "slots": 8},
+                       "work": {"enabled": True}}, f)
+        first = phi_daemon.PhiDaemon(generation=0)
+        first.daemon_id = "PHI-0-restored"
+        first.checkpoint()
+        first.work_agent.stop()
+        
+        with patch.object(phi_daemon.PhiDaemon, "_generate_id", return_value="PHI-0-fresh"):
+            second = phi_daemon.PhiDaemon(generation=0)
+        try:
+            self.assertEqual(second.daemon_id, "PHI-0-restored")
+            self.assertEqual(second.work_agent.worker_id, "PHI-0-restored")
+            slots = {r["slot"]: r for r in second.status_board.read_all()}
+            self.assertEqual(slots[second.status_board.slot]["daemon_id"], "PHI-0-restored")
+        finally:
+            second.work_agent.stop()
+            first.status_board.close()
+            second.status_board.close()
+    
+    def test_warm_restart_rebuilds_in_process_tree(self):
+        """Test an in-process tree comes back after a restart, not just its ids."""
+        with open("config.json", "w") as f:
+            json.dump({"recursive_deploy": True, "max_generations": 2, "max_children_per_generation": 2,
+                       "checkpoint": {"enabled": True, "path": "daemon.ckpt"},
+                       "tree": {"in_process": True}}, f)
+        first = phi_daemon.PhiDaemon(generation=0)
+        self.assertTrue(first._deploy())
+        first.checkpoint()
+        
+        second = phi_daemon.PhiDaemon(generation=0)
+        self.assertTrue(second.restored)
+        with patch.object(second, "recursive_deploy") as recursive:
+            self.assertTrue(second._deploy())
+        recursive.assert_not_called()
+        self.assertIsNotNone(second.tree)
+        self.assertEqual(len(second.tree), len(first.tree))
+        self.assertEqual(second.children, first.children)
+    
+    def test_soul_shared_across_threads(self):
+        """Test soul jobs, checkpoints and pool callbacks can run at once."""
+        with open("config.json", "w") as f:
+            json.dump({"checkpoint": {"enabled": True, "path": "daemon.ckpt"}}, f)
+        daemon = phi_daemon.PhiDaemon(generation=0)
+        if not daemon.soul:
+            self.skipTest("requires soul.py")
+        errors = []
+        
+        def hammer(func, *args):
+            try:
+                for _ in range(100):
+                    func(*args)
+            except Exception as e:  # surfaced below
+                errors.append(e)
+        
+        failure = rosetta.RosettaError("boom")
+        threads = [threading.Thread(target=hammer, args=call) for call in (
+            (daemon.self_check,), (daemon._soul_job,), (daemon.checkpoint,),
+            (daemon._record_evolution, "seed.phi", None, failure))]
+        with self.assertLogs("phi_daemon", level="INFO"):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(errors, [])
+        daemon.checkpoint()
+        self.assertEqual(checkpoint.load("daemon.ckpt")["evolution"]["seed.phi"]["failures"], 100)
+
+
+class TestWorkspaceLayout(unittest.TestCase):
+    """Test cases for sharded, lineage-keyed child workspaces."""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.original_dir = os.getcwd()
+        os.chdir(self.test_dir)
+        self.config = {"max_generations": 3, "max_children_per_generation": 3, "recursive_deploy": True,
+                       "workspace": {"enabled": True, "root": "ws"}}
+    
+    def tearDown(self):
+        os.chdir(self.original_dir)
+        shutil.rmtree(self.test_dir)
+    
+    def test_lineage_keys_do_not_collide(self):
+        """Test children with the same index under different parents get their own workspace."""
+        layout = workspace.WorkspaceLayout("ws")
+        first = layout.path_for(workspace.child_lineage("0", 1))
+        second = layout.path_for(workspace.child_lineage("1", 1))
+        
+        self.assertNotEqual(first, second)
+        self.assertEqual(first.name, "phi_gen_2_0.1")
+        self.assertEqual(len(first.relative_to(layout.root).parts), 3)
+    
+    def test_config_is_shared_by_hardlink(self):
+        """Test every workspace links the same stored config."""
+        layout = workspace.WorkspaceLayout("ws")
+        paths = [layout.create(str(i), self.config) for i in range(3)]
+        
+        stored = list(layout.configs.iterdir())
+        self.assertEqual(len(stored), 1)
+        self.assertEqual(os.stat(stored[0]).st_nlink, 4)
+        with open(paths[2] / "config.json") as f:
+            self.assertEqual(json.load(f), self.config)
+    
+    def test_collect_removes_dead_subtrees(self):
+        """Test GC removes a dead child's workspace and its descendants only."""
+        layout = workspace.WorkspaceLayout("ws")
+        for lineage in ["0", "0.0", "0.0.0", "1", "1.0", "2"]:
+            layout.create(lineage, self.config)
+        
+        removed = layout.collect("", live=["1", "2"], config=self.config)
+        
+        self.assertEqual(removed, 3)
+        self.assertFalse(layout.path_for("0.0.0").exists())
+        self.assertTrue(layout.path_for("1.0").exists())
+        self.assertEqual(layout.prune_configs(min_age=0), 0)
+        layout.collect("", live=[], config=self.config)
+        self.assertEqual(layout.prune_configs(min_age=0), 1)
+    
+    def test_daemon_uses_sharded_layout(self):
+        """Test the daemon spawns into lineage workspaces and GCs given-up children."""
+        with open("config.json", "w") as f:
+            json.dump(self.config, f)
+        daemon = phi_daemon.PhiDaemon(generation=0)
+        daemon.recursive_deploy()
+        
+        self.assertFalse([name for name in os.listdir(".") if name.startswith("phi_gen_")])
+        for cid in daemon.children:
+            _, index, path = daemon.child_records[cid]
+            self.assertEqual(Path(path), daemon.workspaces.path_for(str(index)))
+            self.assertTrue(Path(path, "config.json").exists())
+        
+        self.assertEqual(daemon.collect_workspaces(), 0)
+        daemon.children.pop()
+        self.assertEqual(daemon.collect_workspaces(), 1)
+
+
+class TestSimulatedClock(unittest.TestCase):
+    """Test cases for the pluggable clock and fast-forward simulation."""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.original_dir = os.getcwd()
+        os.chdir(self.test_dir)
+    
+    def tearDown(self):
+        os.chdir(self.original_dir)
+        shutil.rmtree(self.test_dir)
+    
+    def test_simulated_time_moves_only_when_sleeping(self):
+        """Test virtual time stands still until something sleeps."""
+        sim = clock.SimulatedClock(start=datetime(2026, 1, 1, 10))
+        self.assertEqual(sim.now(), sim.now())
+        sim.sleep(3600)
+        self.assertEqual(sim.now(), datetime(2026, 1, 1, 11))
+        self.assertEqual(sim.monotonic(), 3600)
+    
+    def test_soul_follows_installed_clock(self):
+        """Test circadian phase and rest use the installed clock."""
+        with clock.use_clock(clock.SimulatedClock(start=datetime(2026, 1, 1, 10))) as sim:
+            self.assertEqual(soul.CircadianRhythm.current_phase()[0], "morning")
+            rest = soul.RestCycle()
+            sim.advance(13 * 3600)
+            self.assertEqual(soul.CircadianRhythm.current_phase()[0], "night")
+            self.assertTrue(rest.needs_rest())
+        self.assertIs(clock.get_clock().simulated, False)
+    
+    def test_scheduler_fast_forwards(self):
+        """Test an hour of a 10s job runs in a blink of real time."""
+        sim = clock.SimulatedClock()
+        sched = scheduler.Scheduler(clock=sim)
+        runs = []
+        sched.add("tick", lambda: runs.append(sim.monotonic()), 10.0)
+        sched.add("end", sched.stop, 3600.0, delay=3600.0)
+        
+        start = time.monotonic()
+        asyncio.run(sched.run())
+        elapsed = time.monotonic() - start
+        
+        self.assertEqual(runs[:3], [0.0, 10.0, 20.0])
+        self.assertGreaterEqual(len(runs), 360)
+        self.assertLess(elapsed, 5.0)
+    
+    def _simulate_day(self, seed: int):
+        with clock.use_clock(clock.SimulatedClock(seed=seed)):
+            daemon = phi_daemon.PhiDaemon(generation=0)
+            stats = daemon.simulate(24 * 3600)
+        return daemon, stats
+    
+    def test_daemon_day_is_reproducible(self):
+        """Test a simulated day replays identically for the same seed."""
+        with open("config.json", "w") as f:
+            json.dump({"deployment_interval": 60, "metrics": {"enabled": False}}, f)
+        
+        first, stats = self._simulate_day(seed=3)
+        second, _ = self._simulate_day(seed=3)
+        
+        self.assertAlmostEqual(stats["soul"]["runs"], 24 * 60, delta=100)
+        self.assertGreater(stats["self_check"]["runs"], 0)
+        self.assertEqual(first.soul.name, second.soul.name)
+        self.assertEqual(first.soul.emotions.history, second.soul.emotions.history)
+        self.assertEqual(first.soul.curiosity.explored, second.soul.curiosity.explored)
+    
+    def test_simulate_needs_simulated_clock(self):
+        """Test simulate() refuses to run on the real clock."""
+        daemon = phi_daemon.PhiDaemon(generation=0)
+        with self.assertRaises(RuntimeError):
+            daemon.simulate(60)
+
+
+@unittest.skipUnless(soul_population.HAS_NUMPY, "numpy not installed")
+class TestSoulPopulation(unittest.TestCase):
+    """Test cases for the vectorized soul population."""
+    
+    def setUp(self):
+        self.sim = clock.SimulatedClock(start=datetime(2026, 1, 1, 10), seed=5)
+        self.previous = clock.set_clock(self.sim)
+    
+    def tearDown(self):
+        clock.set_clock(self.previous)
+    
+    def test_tick_updates_every_soul(self):
+        """Test one tick decays intensity and adds fatigue for all souls."""
+        population = soul_population.SoulPopulation(10000, seed=1)
+        self.sim.advance(600)
+        population.tick()
+        
+        self.assertTrue((population.intensity < 0.5).all())
+        self.assertTrue((population.fatigue > 0).all())
+        self.assertEqual(sum(population.summary()["moods"].values()), 10000)
+    
+    def test_view_shares_state_with_arrays(self):
+        """Test a soul view reads and writes the population arrays."""
+        population = soul_population.SoulPopulation(5, seed=1)
+        view = population.soul(3)
+        view.emotions.feel("excited", 0.9)
+        population.fatigue[3] = 0.85
+        
+        self.assertEqual(soul.EmotionalState.EMOTIONS[population.emotion[3]], "excited")
+        self.assertAlmostEqual(population.intensity[3], 0.9)
+        self.assertTrue(view.rest.needs_rest())
+        self.assertIs(population.soul(3), view)
+        self.assertIn(view.name.split("-")[0], soul.Soul.NAME_PREFIXES)
+        self.assertEqual(view.to_state()["emotions"]["current"], "excited")
+    
+    def test_view_creates_reflection_and_curiosity_lazily(self):
+        """Test a view allocates per-soul objects only when they are used."""
+        population = soul_population.SoulPopulation(5, seed=1)
+        view = population.soul(2)
+        self.assertEqual((population._reflections, population._curiosities), ({}, {}))
+        view.reflection.record("self_check", True)
+        self.assertEqual(list(population._reflections), [2])
+        self.assertEqual(population._curiosities, {})
+    
+    def test_population_paces_the_tree(self):
+        """Test an in-process tree ticks at its souls' varied intervals."""
+        test_dir = tempfile.mkdtemp()
+        original_dir = os.getcwd()
+        os.chdir(test_dir)
+        try:
+            with open("config.json", "w") as f:
+                json.dump({"max_generations": 1, "max_children_per_generation": 2, "recursive_deploy": True,
+                           "tree": {"in_process": True, "souls": True, "interval": 10}}, f)
+            daemon = phi_daemon.PhiDaemon(generation=0)
+            daemon.deploy_in_process()
+        finally:
+            os.chdir(original_dir)
+            shutil.rmtree(test_dir)
+        
+        paces = [daemon.tree.pacing(node) for node in daemon.tree.nodes]
+        self.assertEqual(len(set(paces)), len(paces))  # noise and mood differ per soul
+        daemon.souls.emotion[:] = soul_population.EMOTION_INDEX["excited"]
+        daemon._souls_job()
+        self.assertNotEqual([daemon.tree.pacing(node) for node in daemon.tree.nodes], paces)
+    
+    def test_same_seed_same_population(self):
+        """Test populations with the same seed evolve identically."""
+        first = soul_population.SoulPopulation(1000, seed=9)
+        second = soul_population.SoulPopulation(1000, seed=9)
+        for _ in range(50):
+            self.sim.advance(60)
+            first.tick()
+            second.tick()
+        
+        self.assertTrue((first.emotion == second.emotion).all())
+        self.assertGreater(first.transitions.sum(), 0)
+        intervals = first.vary_intervals(5.0)
+        self.assertEqual(intervals.shape, (1000,))
+        self.assertTrue((intervals > 0).all())
+
+
+class TestBoundedSoulMemory(unittest.TestCase):
+    """Test cases for ring-buffered soul history and windowed reflection."""
+    
+    def setUp(self):
+        self.sim = clock.SimulatedClock(start=datetime(2026, 1, 1), seed=2)
+        self.previous = clock.set_clock(self.sim)
+    
+    def tearDown(self):
+        clock.set_clock(self.previous)
+    
+    def test_months_of_actions_stay_bounded(self):
+        """Test 100 days of actions keep a fixed ring plus hourly totals."""
+        reflection = soul.Reflection()
+        for _ in range(100 * 24 * 12):
+            self.sim.advance(300)
+            reflection.record("self_check", True)
+        
+        self.assertEqual(len(reflection.actions), soul.Reflection.ACTION_CAPACITY)
+        self.assertLessEqual(len(reflection.actions.totals), 24 * 90)
+        hour, counts = reflection.actions.totals.hours[-2]  # [-1] is still filling
+        self.assertEqual(counts, {"success": 12})
+        self.assertEqual(reflection.journal_entry().count("✓"), 10)
+    
+    def test_reflect_counts_only_the_last_hour(self):
+        """Test reflect() sees the last hour's outcomes without rescanning."""
+        reflection = soul.Reflection()
+        for _ in range(100):
+            reflection.record("old", True)
+        self.sim.advance(2 * 3600)
+        for _ in range(10):
+            reflection.record("deploy", False)
+        reflection.record("deploy", True)
+        
+        self.assertEqual(reflection.recent.totals(self.sim.time()), (1, 10))
+        self.assertEqual(reflection.reflect(), "Many failures lately. Should I change approach?")
+        self.sim.advance(3600)
+        self.assertIsNone(reflection.reflect())
+    
+    def test_emotion_history_and_state_roundtrip(self):
+        """Test emotional history is bounded and survives a checkpoint."""
+        original = soul.Soul(Path("."))
+        for i in range(soul.EmotionalState.HISTORY_CAPACITY + 50):
+            self.sim.advance(60)
+            original.emotions.feel(soul.EmotionalState.EMOTIONS[i % 10], 0.5)
+        original.reflection.record("self_check", False, "timeout")
+        
+        self.assertEqual(len(original.emotions.history), soul.EmotionalState.HISTORY_CAPACITY)
+        self.assertGreater(len(original.emotions.history.totals), 0)
+        
+        restored = soul.Soul(Path("."))
+        restored.restore(checkpoint.unpackb(checkpoint.packb(original.to_state())))
+        self.assertEqual(list(restored.emotions.history.totals.hours),
+                         [list(h) for h in original.emotions.history.totals.hours])
+        self.assertEqual(restored.reflection.actions[-1]["notes"], "timeout")
+        self.assertEqual(restored.reflection.recent.totals(self.sim.time()), (0, 1))
+
+
+class TestFileIndex(unittest.TestCase):
+    """Test cases for the indexed workspace scanner behind curiosity."""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        root = Path(self.test_dir)
+        for name in ["a.phi", "b.py", "docs/c.md", ".git/objects/d.py", "phi_gen_1_0/e.phi",
+                     "specs/phi-core/f.phi", "notes.txt"]:
+            (root / name).parent.mkdir(parents=True, exist_ok=True)
+            (root / name).write_text("x")
+        (root / ".gitmodules").write_text('[submodule "core"]\n\tpath = specs/phi-core\n')
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+    
+    def _path(self, name):
+        return str(Path(self.test_dir).resolve() / name)
+    
+    def test_ignore_rules(self):
+        """Test VCS dirs, child workspaces and submodules are not indexed."""
+        index = file_index.FileIndex(self.test_dir)
+        index.build()
+        self.assertEqual(len(index), 3)
+        for name in ["a.phi", "b.py", "docs/c.md"]:
+            self.assertIn(self._path(name), index)
+        self.assertNotIn(self._path("phi_gen_1_0/e.phi"), index)
+        self.assertNotIn(self._path("specs/phi-core/f.phi"), index)
+    
+    def test_pick_prefers_extension_order_and_skips_explored(self):
+        """Test picks follow extension priority and exclude explored files."""
+        index = file_index.FileIndex(self.test_dir)
+        rng = random.Random(0)
+        self.assertEqual(index.pick(rng), self._path("a.phi"))
+        self.assertEqual(index.pick(rng, exclude={self._path("a.phi")}), self._path("b.py"))
+        explored = {self._path(n) for n in ["a.phi", "b.py", "docs/c.md"]}
+        self.assertIsNone(index.pick(rng, exclude=explored))
+    
+    def test_refresh_and_updates_are_incremental(self):
+        """Test refresh re-lists only changed directories and updates apply."""
+        index = file_index.FileIndex(self.test_dir)
+        index.build()
+        self.assertEqual(index.refresh(), 0)
+        
+        new = Path(self.test_dir) / "docs" / "new.rs"
+        new.write_text("fn main() {}")
+        os.utime(new.parent, ns=(0, 1))
+        self.assertEqual(index.refresh(), 1)
+        self.assertIn(str(new.resolve()), index)
+        
+        new.unlink()
+        index.update([new.resolve()])
+        self.assertNotIn(str(new.resolve()), index)
+    
+    def test_poll_refreshes_without_watcher(self):
+        """Test poll falls back to periodic refreshes when nothing watches."""
+        with clock.use_clock(clock.SimulatedClock()) as sim:
+            index = file_index.FileIndex(self.test_dir, refresh_interval=30.0)
+            index.build()
+            new = Path(self.test_dir) / "docs" / "new.rs"
+            new.write_text("fn main() {}")
+            os.utime(new.parent, ns=(0, 1))
+            
+            index.poll()
+            self.assertNotIn(str(new.resolve()), index)
+            sim.sleep(30.0)
+            index.poll()
+            self.assertIn(str(new.resolve()), index)
+    
+    def test_unchanged_refresh_lists_nothing(self):
+        """Test a refresh with no changes only stats, even after a resume."""
+        index = file_index.FileIndex(self.test_dir, path=".phi_file_index")
+        index.build()
+        resumed = file_index.FileIndex(self.test_dir, path=".phi_file_index")
+        resumed.build()
+        for fresh in (index, resumed):
+            fresh.refresh()  # saving the index touched the root
+            with patch.object(file_index.os, "scandir", wraps=os.scandir) as scanned:
+                self.assertEqual(fresh.refresh(), 0)
+            self.assertEqual(scanned.call_count, 0)
+        
+        (Path(self.test_dir) / "docs" / "deep").mkdir()
+        (Path(self.test_dir) / "docs" / "deep" / "g.phi").write_text("x")
+        resumed.refresh()
+        self.assertIn(self._path("docs/deep/g.phi"), resumed)
+    
+    def test_refresh_touches_only_the_changed_directory(self):
+        """Test refresh drops vanished files through the per-directory map."""
+        index = file_index.FileIndex(self.test_dir)
+        index.build()
+        docs = str((Path(self.test_dir) / "docs").resolve())
+        self.assertEqual(index._files[docs], {self._path("docs/c.md")})
+        
+        shutil.rmtree(docs)
+        index.refresh()
+        self.assertNotIn(self._path("docs/c.md"), index)
+        self.assertNotIn(docs, index._files)
+        self.assertIn(self._path("a.phi"), index)
+    
+    def test_persisted_index_resumes(self):
+        """Test a saved index is loaded instead of walking the tree again."""
+        index = file_index.FileIndex(self.test_dir, path=".phi_file_index")
+        index.build()
+        self.assertTrue((Path(self.test_dir) / ".phi_file_index").exists())
+        
+        resumed = file_index.FileIndex(self.test_dir, path=".phi_file_index")
+        with patch.object(resumed, "_list_dir", wraps=resumed._list_dir) as listed:
+            resumed.build()
+        # Only the root is re-listed: saving the index itself touched it
+        self.assertEqual([c.args[0] for c in listed.call_args_list], [str(Path(self.test_dir).resolve())])
+        self.assertEqual(list(resumed._positions), list(index._positions))
+    
+    def test_curiosity_uses_index(self):
+        """Test curiosity explores indexed files and tracks them in a set."""
+        index = file_index.FileIndex(self.test_dir)
+        curiosity = soul.Curiosity(Path(self.test_dir), index=index)
+        first = curiosity.explore()
+        self.assertEqual(first, self._path("a.phi"))
+        self.assertEqual(curiosity.explore(), first)
+        self.assertIn(first, curiosity.seen)
+        curiosity.interests.clear()
+        self.assertEqual(curiosity.explore(), self._path("b.py"))
+
+
+class TestInterestQueue(unittest.TestCase):
+    """Test cases for the decaying interest heap behind curiosity."""
+    
+    def setUp(self):
+        self.sim = clock.SimulatedClock(start=datetime(2026, 1, 1), seed=5)
+        self.previous = clock.set_clock(self.sim)
+    
+    def tearDown(self):
+        clock.set_clock(self.previous)
+    
+    def test_scores_decay_with_half_life(self):
+        """Test interest halves every half-life without reordering."""
+        queue = soul.InterestQueue(half_life=3600)
+        queue["a"] = 1.0
+        queue["b"] = 0.5
+        self.sim.advance(3600)
+        self.assertAlmostEqual(queue["a"], 0.5)
+        self.assertAlmostEqual(queue["b"], 0.25)
+        queue.add("b", 0.5)
+        self.assertEqual(queue.peek(), "b")
+        self.assertAlmostEqual(queue["b"], 0.75)
+    
+    def test_matches_sorted_reference(self):
+        """Test top-k, scaling and removal agree with a plain dict."""
+        queue = soul.InterestQueue()
+        reference = {}
+        rand = random.Random(1)
+        for _ in range(2000):
+            name = f"f{rand.randrange(300)}"
+            op = rand.random()
+            if op < 0.6:
+                amount = rand.random()
+                queue.add(name, amount)
+                reference[name] = reference.get(name, 0) + amount
+            elif op < 0.8 and name in reference:
+                queue.scale(name, 0.5)
+                reference[name] *= 0.5
+            elif name in reference:
+                queue.pop(name)
+                del reference[name]
+        expected = sorted(reference.items(), key=lambda kv: -kv[1])[:10]
+        top = queue.top(10)
+        self.assertEqual([n for n, _ in top], [n for n, _ in expected])
+        for (_, got), (_, want) in zip(top, expected):
+            self.assertAlmostEqual(got, want)
+        self.assertEqual(len(queue), len(reference))
+    
+    def test_capacity_evicts_least_interesting(self):
+        """Test the queue stays bounded and keeps the strongest interests."""
+        queue = soul.InterestQueue(capacity=100)
+        for i in range(1000):
+            queue[f"f{i}"] = float(i + 1)
+        self.assertLessEqual(len(queue), 100 + 100 // 8)
+        self.assertIn("f999", queue)
+        self.assertNotIn("f0", queue)
+        self.assertEqual(queue.peek(), "f999")
+    
+    def test_curiosity_state_roundtrip(self):
+        """Test curiosity interests survive to_state/restore as a mapping."""
+        original = soul.Soul(Path("."))
+        original.curiosity.notice("spec.phi", 0.7)
+        original.curiosity.notice("other.md", 0.2)
+        restored = soul.Soul(Path("."))
+        restored.restore(original.to_state())
+        self.assertEqual(restored.curiosity.most_interesting(), "spec.phi")
+        self.assertAlmostEqual(restored.curiosity.interests["other.md"], 0.2)
+
+
+class TestMentionRuntime(unittest.TestCase):
+    """Test cases for concurrent per-platform mention polling."""
+    
+    class FakeMonitor:
+        def __init__(self, delay=0.0, fail=False):
+            self.delay = delay
+            self.fail = fail
+            self.checks = 0
+            self.replied = []
+        
+        def check_mentions(self):
+            self.checks += 1
+            time.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError("platform down")
+            return [{"id": str(self.checks), "author": f"user{self.checks}", "text": "what is phi?"}]
+        
+        def reply(self, mention, text):
+            self.replied.append(mention["id"])
+            return "ok"
+    
+    def _run(self, monitors, config, seconds):
+        runtime = mention_responder.MentionRuntime(mention_responder.PhiResponder(), monitors, config)
+        server = control.ControlServer(os.path.join(tempfile.mkdtemp(), "c.sock"), kill_switch=None)
+        threading.Timer(seconds, server.request_stop).start()
+        asyncio.run(runtime.run(server))
+        return runtime
+    
+    def test_slow_platform_does_not_delay_others(self):
+        """Test a hung and a failing platform leave a fast one replying."""
+        fast = self.FakeMonitor()
+        slow = self.FakeMonitor(delay=1.2)
+        broken = self.FakeMonitor(fail=True)
+        config = {"jobs": {"fast": {"interval": 0.1, "min_interval": 0.05, "jitter": 0},
+                           "slow": {"interval": 0.1, "timeout": 0.2, "jitter": 0},
+                           "broken": {"interval": 0.1, "jitter": 0}}}
+        runtime = self._run([("Fast", fast), ("Slow", slow), ("Broken", broken)], config, 1.0)
+        
+        self.assertGreaterEqual(len(fast.replied), 5)
+        self.assertEqual(slow.checks, 1)  # still busy, later runs skipped
+        stats = runtime.status()["jobs"]
+        self.assertGreater(stats["slow"]["timeouts"], 0)
+        self.assertGreater(stats["broken"]["failures"], 0)
+        self.assertEqual(runtime.status()["replies"]["Fast"], len(fast.replied))
+    
+    def _response(self, status=200, **headers):
+        return MagicMock(status_code=status, headers=headers)
+    
+    def test_rate_limit_headers(self):
+        """Test quota is read from Twitter, Mastodon and Bluesky headers."""
+        now = time.time()
+        twitter = mention_responder.RateLimitState.from_response(
+            self._response(**{"x-rate-limit-remaining": "7", "x-rate-limit-reset": str(int(now) + 300)}), "mentions")
+        self.assertEqual(twitter.remaining, 7)
+        self.assertAlmostEqual(twitter.reset_at, now + 300, delta=1)
+        
+        reset = datetime.utcfromtimestamp(now + 60).isoformat() + "Z"
+        mastodon = mention_responder.RateLimitState.from_response(
+            self._response(**{"X-RateLimit-Remaining": "2", "X-RateLimit-Reset": reset}), "notifications")
+        self.assertEqual(mastodon.remaining, 2)
+        self.assertAlmostEqual(mastodon.reset_at, now + 60, delta=1)
+        
+        limited = mention_responder.RateLimitState.from_response(self._response(429, **{"Retry-After": "30"}), "x")
+        self.assertEqual(limited.remaining, 0)
+        self.assertAlmostEqual(limited.reset_at, now + 30, delta=1)
+        self.assertIsNone(mention_responder.RateLimitState.from_response(self._response(), "x"))
+    
+    def test_adaptive_interval(self):
+        """Test polling speeds up with traffic, slows when quiet, obeys quota."""
+        poller = mention_responder.AdaptivePoller.from_config({"check_interval_seconds": 120})
+        poller.observe(3)
+        poller.observe(1)
+        self.assertEqual(poller.next_interval(), 30)
+        for _ in range(20):
+            poller.observe(0)
+        self.assertEqual(poller.next_interval(), 900)
+        
+        poller = mention_responder.AdaptivePoller(interval=20)
+        state = mention_responder.RateLimitState(11, time.time() + 600, "mentions")
+        poller.observe(5, state)
+        self.assertAlmostEqual(poller.next_interval(), 60, delta=1)  # 600s over 10 spare calls
+        state.remaining = 1
+        self.assertAlmostEqual(poller.next_interval(), 601, delta=1)  # wait for the reset
+        state.reset_at = time.time() - 1
+        self.assertEqual(poller.next_interval(), 15)
+
+
+class TestHttpClients(unittest.TestCase):
+    """Test cases for the shared HTTP and API client layer."""
+    
+    def tearDown(self):
+        http_clients.close_all()
+    
+    @unittest.skipUnless(http_clients.HAS_REQUESTS, "requires requests")
+    def test_one_pooled_session_per_host(self):
+        """Test calls to one host share a keep-alive session."""
+        first = http_clients.session_for("https://bsky.social/xrpc/a")
+        self.assertIs(http_clients.session_for("https://bsky.social/xrpc/b?x=1"), first)
+        self.assertIsNot(http_clients.session_for("https://fosstodon.org/api"), first)
+        adapter = first.get_adapter("https://bsky.social/")
+        self.assertEqual(adapter._pool_maxsize, http_clients.POOL_SIZE)
+    
+    def test_identity_fetched_once(self):
+        """Test our Twitter user id costs one get_me per client."""
+        client = MagicMock()
+        client.get_me.return_value = MagicMock(data=MagicMock(id="42"))
+        self.assertEqual(http_clients.twitter_user_id(client), "42")
+        self.assertEqual(http_clients.twitter_user_id(client), "42")
+        self.assertEqual(client.get_me.call_count, 1)
+
+
+def _jwt(exp):
+    """An unsigned JWT carrying only an ``exp`` claim."""
+    import base64
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).decode().rstrip("=")
+    return f"e30.{payload}.sig"
+
+
+def _response(status=200, body=None):
+    response = MagicMock(status_code=status, ok=200 <= status < 300, text="")
+    response.json.return_value = body or {}
+    return response
+
+
+class TestBlueskySession(unittest.TestCase):
+    """Test cases for the shared, self-renewing Bluesky session."""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = Path(self.test_dir) / ".bluesky_session"
+        self.now = time.time()
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def _tokens(self, access_in=7200, refresh_in=86400):
+        return {"accessJwt": _jwt(self.now + access_in), "refreshJwt": _jwt(self.now + refresh_in),
+                "did": "did:plc:phi", "handle": "phi.bsky.social"}
+    
+    def test_token_expiry(self):
+        """Test the exp claim is read from a JWT, and junk reads as expired."""
+        self.assertEqual(bluesky_session.token_expiry(_jwt(1234)), 1234)
+        self.assertEqual(bluesky_session.token_expiry("not-a-jwt"), 0)
+    
+    def test_logs_in_once_and_persists(self):
+        """Test one login serves every call, across instances sharing the file."""
+        with patch.object(http_clients, "post", return_value=_response(body=self._tokens())) as post:
+            session = bluesky_session.BlueskySession("phi", "pw", path=self.path)
+            first = session.get()
+            self.assertIs(session.get(), first)
+            other = bluesky_session.BlueskySession("phi", "pw", path=self.path)
+            self.assertEqual(other.get()["did"], "did:plc:phi")
+        self.assertEqual(post.call_count, 1)
+        self.assertEqual(self.path.stat().st_mode & 0o777, 0o600)
+    
+    def test_refreshes_before_expiry(self):
+        """Test a token close to expiry is refreshed rather than logged in again."""
+        self.path.write_text(json.dumps({**self._tokens(access_in=60), "handle_key": "phi"}))
+        with patch.object(http_clients, "post", return_value=_response(body=self._tokens())) as post:
+            session = bluesky_session.BlueskySession("phi", "pw", path=self.path)
+            session.get()
+        self.assertIn("refreshSession", post.call_args[0][0])
+        self.assertEqual((session.refreshes, session.logins), (1, 0))
+    
+    def test_expired_token_retried_once(self):
+        """Test a call rejected with ExpiredToken renews the session and retries."""
+        expired = _response(400, {"error": "ExpiredToken"})
+        with patch.object(http_clients, "post", return_value=_response(body=self._tokens())), \
+                patch.object(http_clients, "request", side_effect=[expired, _response()]) as request:
+            session = bluesky_session.BlueskySession("phi", "pw", path=None)
+            response = session.xrpc("GET", "app.bsky.notification.listNotifications")
+        self.assertTrue(response.ok)
+        self.assertEqual(request.call_count, 2)
+        self.assertEqual(session.refreshes, 1)
+    
+    def test_failed_login_raises(self):
+        """Test a rejected login surfaces as BlueskyAuthError."""
+        with patch.object(http_clients, "post", return_value=_response(401)):
+            session = bluesky_session.BlueskySession("phi", "wrong", path=None)
+            with self.assertRaises(bluesky_session.BlueskyAuthError):
+                session.get()
+
+
+class TestStateStore(unittest.TestCase):
+    """Test cases for the SQLite state store behind mention cursors."""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, "state.db")
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def test_keys_survive_reopen(self):
+        """Test values persist per scope and None deletes a key."""
+        store = state_store.StateStore(self.path)
+        store.set("twitter", "cursor", 1234)
+        store.set("bluesky", "cursor", "2026-01-01T00:00:00Z")
+        store.set("bluesky", "rate_limit", {"remaining": 3})
+        store.set("bluesky", "rate_limit", None)
+        store.close()
+        
+        store = state_store.StateStore(self.path)
+        self.assertEqual(store.get("twitter", "cursor"), 1234)
+        self.assertEqual(store.scope("bluesky"), {"cursor": "2026-01-01T00:00:00Z"})
+        self.assertEqual(store._db.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        store.close()
+    
+    def test_batch_is_one_commit(self):
+        """Test a batch commits once, even when the block raises."""
+        store = state_store.StateStore(self.path)
+        with self.assertRaises(RuntimeError):
+            with store.batch():
+                store.set("mastodon", "cursor", "9")
+                for i in range(10):
+                    store.mark_processed("mastodon", i)
+                self.assertTrue(store.processed("mastodon", 3))
+                raise RuntimeError("reply failed")
+        self.assertEqual(store.commits, 1)
+        self.assertTrue(store.processed("mastodon", 9))
+        self.assertFalse(store.processed("twitter", 9))
+        store.close()
+    
+    def test_processed_ids_bounded(self):
+        """Test only the newest processed ids are kept."""
+        store = state_store.StateStore()
+        with patch.object(state_store, "PROCESSED_CAPACITY", 10), patch.object(state_store, "PRUNE_EVERY", 5):
+            clock_value = [0.0]
+            with patch.object(clock.get_clock(), "time", side_effect=lambda: clock_value[0]):
+                for i in range(40):
+                    clock_value[0] = float(i)
+                    store.mark_processed("bluesky", i)
+        count = store._db.execute("SELECT COUNT(*) FROM processed").fetchone()[0]
+        self.assertLessEqual(count, 15)
+        self.assertTrue(store.processed("bluesky", 39))
+        self.assertFalse(store.processed("bluesky", 0))
+    
+    def test_migrates_json_state(self):
+        """Test the old .mention_state.json is imported once and set aside."""
+        legacy = Path(self.test_dir) / ".mention_state.json"
+        legacy.write_text(json.dumps({"twitter_last_id": 77, "bluesky_last_time": "t"}))
+        store = state_store.StateStore(self.path, legacy=str(legacy))
+        self.assertEqual(store.get("twitter", "cursor"), 77)
+        self.assertEqual(store.get("bluesky", "cursor"), "t")
+        self.assertFalse(legacy.exists())
+        self.assertTrue(legacy.with_name(".mention_state.json.migrated").exists())
+        store.close()
+    
+    def test_runtime_never_answers_twice(self):
+        """Test replied ids and quota outlive the runtime that recorded them."""
+        store = state_store.StateStore(self.path)
+        monitor = TestMentionRuntime.FakeMonitor()
+        monitor.rate_limit = mention_responder.RateLimitState(4, time.time() + 600, "mentions")
+        monitor.check_mentions = lambda: [{"id": "1", "author": "ada", "text": "hi"}]
+        runtime = mention_responder.MentionRuntime(mention_responder.PhiResponder(), [("Fake", monitor)],
+                                                   store=store)
+        self.assertEqual(runtime.poll("Fake", monitor), 1)
+        
+        restarted = mention_responder.MentionRuntime(mention_responder.PhiResponder(), [("Fake", monitor)],
+                                                     store=store)
+        self.assertEqual(restarted.pollers["Fake"].rate_limit.remaining, 4)
+        self.assertEqual(restarted.poll("Fake", monitor), 0)
+        self.assertEqual(monitor.replied, ["1"])
+        store.close()
+
+
 def run_tests():
     """Run all tests."""
     loader = unittest.TestLoader()
@@ -245,6 +2288,29 @@ def run_tests():
     # Add all test cases
     suite.addTests(loader.loadTestsFromTestCase(TestPhiDaemon))
     suite.addTests(loader.loadTestsFromTestCase(TestConfiguration))
+    suite.addTests(loader.loadTestsFromTestCase(TestChildSupervisor))
+    suite.addTests(loader.loadTestsFromTestCase(TestRosettaRunner))
+    suite.addTests(loader.loadTestsFromTestCase(TestRosettaPool))
+    suite.addTests(loader.loadTestsFromTestCase(TestSpecCache))
+    suite.addTests(loader.loadTestsFromTestCase(TestSpecWatching))
+    suite.addTests(loader.loadTestsFromTestCase(TestScheduler))
+    suite.addTests(loader.loadTestsFromTestCase(TestControlServer))
+    suite.addTests(loader.loadTestsFromTestCase(TestMetrics))
+    suite.addTests(loader.loadTestsFromTestCase(TestLogPipeline))
+    suite.addTests(loader.loadTestsFromTestCase(TestDaemonTree))
+    suite.addTests(loader.loadTestsFromTestCase(TestWorkDistribution))
+    suite.addTests(loader.loadTestsFromTestCase(TestStatusBoard))
+    suite.addTests(loader.loadTestsFromTestCase(TestCheckpoint))
+    suite.addTests(loader.loadTestsFromTestCase(TestWorkspaceLayout))
+    suite.addTests(loader.loadTestsFromTestCase(TestSimulatedClock))
+    suite.addTests(loader.loadTestsFromTestCase(TestSoulPopulation))
+    suite.addTests(loader.loadTestsFromTestCase(TestBoundedSoulMemory))
+    suite.addTests(loader.loadTestsFromTestCase(TestFileIndex))
+    suite.addTests(loader.loadTestsFromTestCase(TestInterestQueue))
+    suite.addTests(loader.loadTestsFromTestCase(TestMentionRuntime))
+    suite.addTests(loader.loadTestsFromTestCase(TestHttpClients))
+    suite.addTests(loader.loadTestsFromTestCase(TestBlueskySession))
+    suite.addTests(loader.loadTestsFromTestCase(TestStateStore))
     
     # Run tests
     runner = unittest.TextTestRunner(verbosity=2)
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+tree.py - A whole generational daemon tree inside one interpreter
+
+Process mode gives every daemon its own interpreter, cwd and workspace,
+which caps a node at a few hundred daemons. In-process mode keeps each
+logical daemon as a small ``__slots__`` record and drives all of them
+from a fixed pool of asyncio worker tasks:
+
+- One shared config dict; nothing is copied per instance.
+- Nodes are laid out breadth-first, so a node's children are a
+  contiguous index range (``first_child``, ``child_count``) rather than
+  a list.
+- Each worker owns a shard of nodes and a heap of their due times, so
+  10k daemons cost ``workers`` tasks, not 10k.
+- ``max_instances`` bounds memory no matter what the fan-out works out to.
+
+Usage:
+  python3 tree.py [--generations N] [--children N] [--seconds S] [--workers N]
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import sys
+import time
+import tracemalloc
+from typing import Awaitable, Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+Duty = Callable[["TreeNode"], Union[None, Awaitable[None]]]
+
+
+def children_for_generation(config: Dict, generation: int) -> int:
+    """
+    How many children a daemon of ``generation`` spawns.
+
+    Earlier generations spawn more, later generations spawn fewer.
+    """
+    max_children = config.get("max_children_per_generation", 2)
+    adjusted = int(max_children / (generation + 1))
+    return max(1, min(adjusted, max_children))
+
+
+class TreeNode:
+    """Compact state of one logical daemon."""
+
+    __slots__ = ("index", "generation", "parent", "first_child", "child_count",
+                 "ticks", "last_tick", "latency")
+
+    def __init__(self, index: int, generation: int, parent: int):
+        self.index = index
+        self.generation = generation
+        self.parent = parent
+        self.first_child = -1
+        self.child_count = 0
+        self.ticks = 0
+        self.last_tick = 0.0
+        self.latency = 0.0
+
+    @property
+    def children(self) -> range:
+        return range(self.first_child, self.first_child + self.child_count)
+
+    def daemon_id(self, root_id: str = "PHI") -> str:
+        return f"{root_id}-{self.generation}-{self.index}"
+
+
+class DaemonTree:
+    """
+    Every daemon of a generational tree, driven by a pool of worker tasks.
+
+    ``duty(node)`` runs once per node per ``interval`` seconds; it may be a
+    plain function or a coroutine function. The default duty is the
+    self-check bookkeeping (tick count, latency) and nothing else.
+    ``pacing(node)``, if set, gives each node's next interval instead
+    (e.g. varied by its soul's mood and energy).
+    """
+
+    def __init__(self, config: Dict, root_id: str = "PHI", duty: Optional[Duty] = None):
+        section = config.get("tree", {})
+        self.config = config
+        self.root_id = root_id
+        self.duty = duty
+        self.pacing: Optional[Callable[[TreeNode], float]] = None
+        self.interval = section.get("interval", config.get("deployment_interval", 5))
+        self.workers = max(1, section.get("workers", 64))
+        self.max_instances = section.get("max_instances", 100000)
+        self.nodes: List[TreeNode] = []
+        self.ticks = 0
+        self.failures = 0
+        self._started = 0.0
+        self._stopped = False
+        self._build()
+
+    def _build(self):
+        """Lay the tree out breadth-first following the spawn rules."""
+        max_generations = self.config.get("max_generations", 3)
+        recursive = self.config.get("recursive_deploy", True)
+        self.nodes.append(TreeNode(0, 0, -1))
+        frontier = 0
+        while frontier < len(self.nodes):
+            node = self.nodes[frontier]
+            frontier += 1
+            if not recursive or node.generation >= max_generations:
+                continue
+            count = children_for_generation(self.config, node.generation)
+            count = min(count, self.max_instances - len(self.nodes))
+            if count <= 0:
+                break
+            node.first_child = len(self.nodes)
+            node.child_count = count
+            for _ in range(count):
+                self.nodes.append(TreeNode(len(self.nodes), node.generation + 1, node.index))
+        logger.info(f"In-process tree: {len(self.nodes)} daemons across "
+                    f"{self.nodes[-1].generation + 1} generations")
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def generations(self) -> Dict[int, int]:
+        counts: Dict[int, int] = {}
+        for node in self.nodes:
+            counts[node.generation] = counts.get(node.generation, 0) + 1
+        return counts
+
+    async def _drive(self, shard: List[TreeNode]):
+        """Tick every node in ``shard`` on its own staggered schedule."""
+        loop = asyncio.get_running_loop()
+        seq = itertools.count()
+        now = loop.time()
+        # Spread first ticks over one interval so the tree does not pulse
+        spread = self.interval / max(1, len(shard))
+        heap = [(now + i * spread, next(seq), node) for i, node in enumerate(shard)]
+        is_async = asyncio.iscoroutinefunction(self.duty)
+        while heap and not self._stopped:
+            due, _, node = heap[0]
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            start = time.perf_counter()
+            try:
+                if self.duty:
+                    if is_async:
+                        await self.duty(node)
+                    else:
+                        self.duty(node)
+            except Exception as e:
+                self.failures += 1
+                logger.debug(f"Tree daemon {node.index} duty failed: {e}")
+            node.latency = time.perf_counter() - start
+            node.ticks += 1
+            node.last_tick = due
+            self.ticks += 1
+            interval = self.pacing(node) if self.pacing else self.interval
+            heapq.heapreplace(heap, (due + interval, next(seq), node))
+            # Yield between ticks so one shard cannot starve the others
+            await asyncio.sleep(0)
+
+    async def run(self, duration: Optional[float] = None):
+        """Run every daemon until ``stop()`` (or for ``duration`` seconds)."""
+        self._stopped = False
+        self._started = time.monotonic()
+        workers = min(self.workers, len(self.nodes))
+        tasks = [asyncio.create_task(self._drive(self.nodes[i::workers]), name=f"tree-{i}")
+                 for i in range(workers)]
+        try:
+            if duration is None:
+                await asyncio.gather(*tasks)
+            else:
+                await asyncio.wait(tasks, timeout=duration)
+        finally:
+            self._stopped = True
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stop(self):
+        self._stopped = True
+
+    def summary(self) -> Dict:
+        """Counters kept as the tree runs; cheap enough for every self-check."""
+        elapsed = time.monotonic() - self._started if self._started else 0.0
+        return {
+            "instances": len(self.nodes),
+            "workers": min(self.workers, len(self.nodes)),
+            "ticks": self.ticks,
+            "failures": self.failures,
+            "ticks_per_second": self.ticks / elapsed if elapsed else 0.0,
+        }
+
+
+def measure_footprint(config: Dict) -> Dict:
+    """Build a tree under tracemalloc and report bytes per logical daemon."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tree = DaemonTree(config)
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return {
+        "instances": len(tree),
+        "bytes_total": total,
+        "bytes_per_instance": total / len(tree),
+        "generations": tree.generations(),
+    }
+
+
+def main(argv: List[str]) -> int:
+    args = iter(argv)
+    config = {"max_generations": 3, "max_children_per_generation": 40,
+              "deployment_interval": 1.0, "tree": {"workers": 64}}
+    seconds = 5.0
+    for arg in args:
+        if arg == "--generations":
+            config["max_generations"] = int(next(args))
+        elif arg == "--children":
+            config["max_children_per_generation"] = int(next(args))
+        elif arg == "--seconds":
+            seconds = float(next(args))
+        elif arg == "--workers":
+            config["tree"]["workers"] = int(next(args))
+        else:
+            print(__doc__)
+            return 1
+
+    footprint = measure_footprint(config)
+    print(f"{footprint['instances']} daemons, generations {footprint['generations']}")
+    print(f"{footprint['bytes_per_instance']:.0f} bytes per daemon "
+          f"({footprint['bytes_total'] / 1024 / 1024:.1f} MiB total)")
+
+    tree = DaemonTree(config)
+    asyncio.run(tree.run(duration=seconds))
+    summary = tree.summary()
+    print(f"{summary['ticks']} ticks in {seconds:.0f}s on {summary['workers']} workers "
+          f"({summary['ticks_per_second']:.0f}/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -9,6 +9,8 @@ from pathlib import Path
 import time
 from datetime import datetime
 
+import http_clients
+
 # Load env
 env = {}
 for line in Path('/home/patrick/IdeaProjects/phi-autonomous/.env').read_text().splitlines():
@@ -17,7 +19,7 @@ for line in Path('/home/patrick/IdeaProjects/phi-autonomous/.env').read_text().s
         env[k] = v.strip('"\'')
 
 def get_client():
-    return tweepy.Client(
+    return http_clients.twitter_client(
         consumer_key=env['TWITTER_API_KEY'],
         consumer_secret=env['TWITTER_API_SECRET'],
         access_token=env['TWITTER_ACCESS_TOKEN'],
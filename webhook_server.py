@@ -5,12 +5,13 @@ Receives push events from eurisko-info-lab org and tweets them.
 """
 
 from flask import Flask, request, jsonify
-import tweepy
 import os
 import hmac
 import hashlib
 from pathlib import Path
 
+import http_clients
+
 app = Flask(__name__)
 
 def load_env():
@@ -24,12 +25,7 @@ def load_env():
 load_env()
 
 def get_twitter_client():
-    return tweepy.Client(
-        consumer_key=os.environ.get('TWITTER_API_KEY'),
-        consumer_secret=os.environ.get('TWITTER_API_SECRET'),
-        access_token=os.environ.get('TWITTER_ACCESS_TOKEN'),
-        access_token_secret=os.environ.get('TWITTER_ACCESS_SECRET')
-    )
+    return http_clients.twitter_client()
 
 def verify_signature(payload, signature):
     secret = os.environ.get('GITHUB_WEBHOOK_SECRET', '').encode()
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+work.py - Distribute units of work down the generational tree
+
+A parent owns a ``WorkBroker``. Work it wants done - spec evaluations,
+metrics aggregation, mention batches - is submitted as units and pushed
+onto the queue of its least-loaded child. Children pull from the broker
+over a Unix socket (``WorkServer``/``WorkClient``), run units on a small
+thread pool and report results back up:
+
+- A child that finds its own queue empty steals from the busiest sibling,
+  so one slow child never strands work.
+- Units handed out carry a lease; if no result arrives before it expires
+  (the child died), the unit goes back on the queue.
+- A child that has children of its own relays units to them instead of
+  running them, and forwards their results to its parent.
+
+The parent pulls from its own broker too, so work still completes with no
+children at all, and the in-process tree (tree.py) can pull from the same
+broker directly without any socket.
+
+Protocol: one JSON request line per connection, one JSON reply line.
+    {"op": "pull", "worker": "PHI-1-0", "max": 2}  -> {"ok": true, "units": [...]}
+    {"op": "report", "worker": "PHI-1-0", "results": [...]}  -> {"ok": true}
+"""
+
+import itertools
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional
+
+from control import bind_private, owned_elsewhere
+
+logger = logging.getLogger(__name__)
+
+PARENT_SOCKET_ENV = "PHI_WORK_PARENT"
+
+Handler = Callable[[Dict], Dict]
+ResultCallback = Callable[[Dict], None]
+
+
+class WorkBroker:
+    """
+    Queues of work units, one per worker, plus a shared backlog.
+
+    Workers register implicitly by pulling; one that has not pulled for
+    ``worker_ttl`` seconds stops receiving new units.
+    """
+
+    def __init__(self, lease: float = 600.0, worker_ttl: float = 30.0):
+        self.lease = lease
+        self.worker_ttl = worker_ttl
+        self.backlog: Deque[Dict] = deque()
+        self.queues: Dict[str, Deque[Dict]] = {}
+        self.inflight: Dict[str, tuple] = {}  # unit id -> (unit, worker, deadline)
+        self.last_seen: Dict[str, float] = {}
+        self._callbacks: Dict[str, ResultCallback] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.stolen = 0
+        self.requeued = 0
+
+    def live_workers(self, exclude: Optional[str] = None) -> List[str]:
+        cutoff = time.monotonic() - self.worker_ttl
+        return [w for w, seen in self.last_seen.items() if seen >= cutoff and w != exclude]
+
+    def _load(self, worker: str) -> int:
+        queued = len(self.queues.get(worker, ()))
+        return queued + sum(1 for _, w, _ in self.inflight.values() if w == worker)
+
+    def submit(self, kind: str, payload: Dict, callback: Optional[ResultCallback] = None) -> str:
+        """Queue a unit on the least-loaded live worker (or the backlog)."""
+        with self._lock:
+            unit = {"id": f"{os.getpid()}-{next(self._ids)}", "kind": kind, "payload": payload}
+            if callback:
+                self._callbacks[unit["id"]] = callback
+            workers = self.live_workers()
+            if workers:
+                target = min(workers, key=self._load)
+                self.queues.setdefault(target, deque()).append(unit)
+            else:
+                self.backlog.append(unit)
+            self.submitted += 1
+            return unit["id"]
+
+    def _requeue_expired(self, now: float):
+        for unit_id, (unit, worker, deadline) in list(self.inflight.items()):
+            if now >= deadline:
+                del self.inflight[unit_id]
+                self.backlog.appendleft(unit)
+                self.requeued += 1
+                logger.warning(f"Work unit {unit_id} lease expired on {worker}, requeued")
+
+    def pull(self, worker: str, max_units: int = 1) -> List[Dict]:
+        """Hand ``worker`` up to ``max_units`` units: its own, the backlog's, then a sibling's."""
+        now = time.monotonic()
+        units = []
+        with self._lock:
+            self.last_seen[worker] = now
+            self._requeue_expired(now)
+            own = self.queues.setdefault(worker, deque())
+            while len(units) < max_units:
+                if own:
+                    unit = own.popleft()
+                elif self.backlog:
+                    unit = self.backlog.popleft()
+                else:
+                    victim = max(self.queues.items(), key=lambda kv: len(kv[1]))[1]
+                    if not victim:
+                        break
+                    # Steal from the far end: the owner keeps its oldest work
+                    unit = victim.pop()
+                    self.stolen += 1
+                self.inflight[unit["id"]] = (unit, worker, now + self.lease)
+                units.append(unit)
+        return units
+
+    def report(self, worker: str, results: List[Dict]):
+        """Accept finished units and hand each result to its callback."""
+        callbacks = []
+        with self._lock:
+            self.last_seen[worker] = time.monotonic()
+            for result in results:
+                if self.inflight.pop(result.get("id"), None) is None:
+                    continue  # already requeued after its lease expired
+                if result.get("ok"):
+                    self.completed += 1
+                else:
+                    self.failed += 1
+                callback = self._callbacks.pop(result["id"], None)
+                if callback:
+                    callbacks.append((callback, result))
+        for callback, result in callbacks:
+            try:
+                callback(result)
+            except Exception as e:
+                logger.error(f"Work result callback failed for {result.get('id')}: {e}")
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self.backlog) + sum(len(q) for q in self.queues.values()) + len(self.inflight)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "stolen": self.stolen,
+                "requeued": self.requeued,
+                "queued": len(self.backlog) + sum(len(q) for q in self.queues.values()),
+                "inflight": len(self.inflight),
+                "workers": len(self.live_workers()),
+            }
+
+
+class WorkServer:
+    """Expose a broker to child processes on a Unix socket."""
+
+    def __init__(self, broker: WorkBroker, socket_path: str):
+        self.broker = broker
+        self.socket_path = Path(socket_path)
+        self._sock: Optional[socket.socket] = None
+
+    def start(self) -> bool:
+        """Bind and serve; False if it cannot bind or a live server owns the socket."""
+        try:
+            if owned_elsewhere(self.socket_path):
+                logger.warning(f"Work socket {self.socket_path} is served by another process")
+                return False
+            sock = bind_private(self.socket_path, backlog=64)
+        except OSError as e:
+            logger.warning(f"Work socket unavailable at {self.socket_path}: {e}")
+            return False
+        self._sock = sock
+        threading.Thread(target=self._serve, name="work-socket", daemon=True).start()
+        return True
+
+    def _serve(self):
+        while self._sock:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn: socket.socket):
+        with conn:
+            conn.settimeout(10.0)
+            try:
+                request = json.loads(conn.makefile("r").readline())
+                if request.get("op") == "pull":
+                    reply = {"ok": True, "units": self.broker.pull(request["worker"], int(request.get("max", 1)))}
+                elif request.get("op") == "report":
+                    self.broker.report(request["worker"], request.get("results", []))
+                    reply = {"ok": True}
+                else:
+                    reply = {"ok": False, "error": f"unknown op {request.get('op')!r}"}
+            except (OSError, ValueError, KeyError) as e:
+                reply = {"ok": False, "error": str(e)}
+            try:
+                conn.sendall((json.dumps(reply, default=str) + "\n").encode())
+            except OSError:
+                pass
+
+    def close(self):
+        sock, self._sock = self._sock, None
+        if sock:
+            sock.close()
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
+
+
+class WorkClient:
+    """A child's view of its parent's broker; same pull/report API."""
+
+    def __init__(self, socket_path: str, timeout: float = 10.0):
+        self.socket_path = str(socket_path)
+        self.timeout = timeout
+
+    def _call(self, request: Dict) -> Dict:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            sock.sendall((json.dumps(request) + "\n").encode())
+            reply = json.loads(sock.makefile("r").readline())
+        if not reply.get("ok"):
+            raise OSError(reply.get("error", "work request failed"))
+        return reply
+
+    def pull(self, worker: str, max_units: int = 1) -> List[Dict]:
+        return self._call({"op": "pull", "worker": worker, "max": max_units})["units"]
+
+    def report(self, worker: str, results: List[Dict]):
+        self._call({"op": "report", "worker": worker, "results": results})
+
+
+def execute(unit: Dict, handlers: Dict[str, Handler]) -> Dict:
+    """Run one unit and wrap the outcome as a result record."""
+    start = time.monotonic()
+    result = {"id": unit["id"], "kind": unit["kind"]}
+    handler = handlers.get(unit["kind"])
+    try:
+        if handler is None:
+            raise ValueError(f"no handler for work kind {unit['kind']!r}")
+        result.update(ok=True, result=handler(unit["payload"]))
+    except Exception as e:
+        result.update(ok=False, error=str(e))
+    result["elapsed"] = time.monotonic() - start
+    return result
+
+
+class WorkAgent:
+    """
+    Pull units from a source (a broker or a client), run or relay them,
+    and report results back to the source.
+    """
+
+    def __init__(self, source, worker_id: str, handlers: Dict[str, Handler],
+                 capacity: int = 2, relay: Optional[WorkBroker] = None):
+        self.source = source
+        self.worker_id = worker_id
+        self.handlers = handlers
+        self.capacity = max(1, capacity)
+        self.relay = relay
+        self.pool = ThreadPoolExecutor(max_workers=self.capacity, thread_name_prefix="work")
+        self.active = 0
+        self.done = 0
+        self._lock = threading.Lock()
+
+    def poll(self):
+        """Fill free slots from the source. Cheap enough to call every second."""
+        with self._lock:
+            free = self.capacity - self.active
+        if free <= 0:
+            return
+        try:
+            units = self.source.pull(self.worker_id, free)
+        except OSError as e:
+            logger.debug(f"Work pull failed: {e}")
+            return
+        for unit in units:
+            with self._lock:
+                self.active += 1
+            if self.relay is not None and self.relay.live_workers(exclude=self.worker_id):
+                # Pass it down; the result travels back up through _finish
+                self.relay.submit(unit["kind"], unit["payload"],
+                                  callback=lambda r, uid=unit["id"]: self._finish(dict(r, id=uid)))
+            else:
+                future = self.pool.submit(execute, unit, self.handlers)
+                future.add_done_callback(lambda f: self._finish(f.result()))
+
+    def _finish(self, result: Dict):
+        with self._lock:
+            self.active -= 1
+            self.done += 1
+        try:
+            self.source.report(self.worker_id, [result])
+        except OSError as e:
+            # The lease will expire and the parent will hand the unit out again
+            logger.warning(f"Could not report work unit {result.get('id')}: {e}")
+
+    def stop(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def tree_duty(broker: WorkBroker, handlers: Dict[str, Handler], root_id: str = "PHI"):
+    """
+    A ``DaemonTree`` duty: each logical daemon pulls one unit per tick
+    from an in-process broker and runs it off the event loop.
+    """
+    import asyncio
+
+    async def duty(node):
+        worker = node.daemon_id(root_id)
+        units = broker.pull(worker, 1)
+        for unit in units:
+            result = await asyncio.to_thread(execute, unit, handlers)
+            broker.report(worker, [result])
+
+    return duty
+
+
+# ─── Built-in work kinds ─────────────────────────────────────────────────────
+
+def spec_eval_handler(cache=None) -> Handler:
+    """
+    ``spec_eval``: {"spec": path, "flags": [...], "rosettavm": {...}}.
+
+    Each executor thread keeps its own warm RosettaRunner.
+    """
+    from rosetta import RosettaRunner
+    local = threading.local()
+
+    def handle(payload: Dict) -> Dict:
+        runner = getattr(local, "runner", None)
+        if runner is None:
+            runner = local.runner = RosettaRunner(payload.get("rosettavm", {}), cache=cache)
+        result = runner.evaluate(payload["spec"], payload.get("flags", []))
+        return {"stdout": result.stdout, "metrics": result.metrics,
+                "via": result.via, "elapsed": result.elapsed}
+
+    return handle
+
+
+def aggregate_metrics(payload: Dict) -> Dict:
+    """``metrics_aggregate``: {"values": [...]} -> count/sum/min/max/mean."""
+    values = [float(v) for v in payload.get("values", [])]
+    if not values:
+        return {"count": 0}
+    return {"count": len(values), "sum": sum(values), "min": min(values),
+            "max": max(values), "mean": sum(values) / len(values)}
+
+
+def mention_batch_handler() -> Handler:
+    """
+    ``mention_batch``: {"mentions": [{"text", "author"}...]} -> replies.
+
+    One PhiResponder serves every unit (it locks itself), so its mood and
+    anti-spam memory carry over between batches.
+    """
+    responder = None
+    lock = threading.Lock()
+
+    def handle(payload: Dict) -> Dict:
+        nonlocal responder
+        with lock:
+            if responder is None:
+                from mention_responder import PhiResponder
+                responder = PhiResponder()
+        return {"replies": [responder.generate_response(m.get("text", ""), m.get("author", "unknown"))
+                            for m in payload.get("mentions", [])]}
+
+    return handle
+
+
+def default_handlers(cache=None) -> Dict[str, Handler]:
+    return {
+        "spec_eval": spec_eval_handler(cache),
+        "metrics_aggregate": aggregate_metrics,
+        "mention_batch": mention_batch_handler(),
+    }
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+workspace.py - Sharded child workspaces with shared configs
+
+A flat ``phi_gen_{generation}_{index}`` directory per child does not
+scale: children of different parents collide on the same name, every
+child carries its own copy of the config, and nothing is removed when a
+child dies. Here:
+
+- A workspace is keyed by its full lineage - the child index at every
+  generation, e.g. ``0.1.3`` - so no two daemons of a tree share one.
+- Workspaces sit below hash-prefix shard directories
+  (``root/ab/cd/phi_gen_3_0.1.3``), so no single directory grows past a
+  few hundred entries however large the tree gets.
+- Configs are stored once under ``root/configs/`` by content hash and
+  hardlinked into each workspace (copied where links are unsupported).
+- ``collect()`` removes the workspaces of dead children together with
+  everything below them in the lineage. Subtrees are enumerated from the
+  spawn rules, so a pass never scans the whole store.
+
+Every daemon of a process tree shares one root: the seed resolves it
+from config and hands it (and each child's lineage) down through the
+environment.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+from clock import get_clock
+from tree import children_for_generation
+
+logger = logging.getLogger(__name__)
+
+ROOT_ENV = "PHI_WORKSPACE_ROOT"
+LINEAGE_ENV = "PHI_LINEAGE"
+
+
+def child_lineage(lineage: str, index: int) -> str:
+    """Lineage of child ``index`` of the daemon at ``lineage`` ("" is the seed)."""
+    return f"{lineage}.{index}" if lineage else str(index)
+
+
+def lineage_generation(lineage: str) -> int:
+    return lineage.count(".") + 1 if lineage else 0
+
+
+class WorkspaceLayout:
+    """Where child workspaces live and how they are created and removed."""
+
+    def __init__(self, root: str, shard_levels: int = 2):
+        self.root = Path(root).resolve()
+        self.shard_levels = shard_levels
+        self.configs = self.root / "configs"
+        self._config_digest: Optional[str] = None
+        self._config_path: Optional[Path] = None
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional["WorkspaceLayout"]:
+        """The layout for ``config``, or None to keep flat per-child directories."""
+        section = config.get("workspace", {})
+        if not section.get("enabled", False):
+            return None
+        root = os.environ.get(ROOT_ENV) or section.get("root", "phi_workspaces")
+        return cls(root, shard_levels=section.get("shard_levels", 2))
+
+    def path_for(self, lineage: str) -> Path:
+        digest = hashlib.sha1(lineage.encode()).hexdigest()
+        shards = [digest[2 * i:2 * i + 2] for i in range(self.shard_levels)]
+        return self.root.joinpath(*shards, f"phi_gen_{lineage_generation(lineage)}_{lineage}")
+
+    def store_config(self, config: Dict) -> Path:
+        """Write ``config`` once under its content hash; return its path."""
+        data = json.dumps(config, indent=2, sort_keys=True).encode()
+        digest = hashlib.sha256(data).hexdigest()[:16]
+        if digest == self._config_digest and self._config_path.exists():
+            return self._config_path
+        path = self.configs / f"{digest}.json"
+        if not path.exists():
+            self.configs.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(data)
+            # Shared by every workspace that links it, so never edited in place
+            os.chmod(tmp, 0o444)
+            os.replace(tmp, path)
+        self._config_digest, self._config_path = digest, path
+        return path
+
+    def create(self, lineage: str, config: Dict) -> Path:
+        """Create the workspace for ``lineage`` with ``config`` linked into it."""
+        workspace = self.path_for(lineage)
+        workspace.mkdir(parents=True, exist_ok=True)
+        source = self.store_config(config)
+        target = workspace / "config.json"
+        try:
+            if target.exists() and os.path.samefile(source, target):
+                return workspace
+            target.unlink(missing_ok=True)
+            os.link(source, target)
+        except OSError:
+            shutil.copyfile(source, target)
+        return workspace
+
+    def subtree(self, lineage: str, config: Dict) -> Iterator[str]:
+        """``lineage`` and every lineage its spawn rules can produce below it."""
+        max_generations = config.get("max_generations", 3)
+        stack = [lineage]
+        while stack:
+            current = stack.pop()
+            yield current
+            generation = lineage_generation(current)
+            if generation < max_generations:
+                count = children_for_generation(config, generation)
+                stack.extend(child_lineage(current, i) for i in range(count))
+
+    def remove(self, lineage: str, config: Dict) -> int:
+        """Delete the workspace of ``lineage`` and of everything below it."""
+        removed = 0
+        for current in self.subtree(lineage, config):
+            path = self.path_for(current)
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+        return removed
+
+    def collect(self, lineage: str, live: Iterable[str], config: Dict) -> int:
+        """
+        Remove the workspaces of dead children of the daemon at ``lineage``.
+
+        ``live`` holds the lineages of children that are running (or will
+        be restarted). Returns the number of workspaces removed.
+        """
+        live = set(live)
+        generation = lineage_generation(lineage)
+        if generation >= config.get("max_generations", 3):
+            return 0
+        removed = 0
+        for index in range(children_for_generation(config, generation)):
+            child = child_lineage(lineage, index)
+            if child not in live and self.path_for(child).is_dir():
+                removed += self.remove(child, config)
+        if removed:
+            logger.info(f"Workspace GC removed {removed} workspace(s) below {lineage or 'seed'}")
+        return removed
+
+    def prune_configs(self, min_age: float = 3600.0) -> int:
+        """Delete stored configs that no workspace links to any more."""
+        removed = 0
+        cutoff = get_clock().time() - min_age
+        try:
+            entries = list(os.scandir(self.configs))
+        except FileNotFoundError:
+            return 0
+        for entry in entries:
+            stat = entry.stat()
+            # Only the store's own link is left; workspaces holding a copy do not need it
+            if stat.st_nlink == 1 and stat.st_mtime < cutoff:
+                try:
+                    os.unlink(entry.path)
+                    removed += 1
+                except OSError:
+                    pass
+        if removed:
+            self._config_digest = None
+        return removed
@@ -4,13 +4,14 @@ X Growth & Monetization Engine for @eurekainfolab
 Auto-posts engaging content about Phi to build followers and revenue.
 """
 
-import tweepy
 import os
 import random
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import http_clients
+
 def load_env():
     env_path = Path(__file__).parent / '.env'
     if env_path.exists():
@@ -22,12 +23,7 @@ def load_env():
 load_env()
 
 def get_client():
-    return tweepy.Client(
-        consumer_key=os.environ.get('TWITTER_API_KEY'),
-        consumer_secret=os.environ.get('TWITTER_API_SECRET'),
-        access_token=os.environ.get('TWITTER_ACCESS_TOKEN'),
-        access_token_secret=os.environ.get('TWITTER_ACCESS_SECRET')
-    )
+    return http_clients.twitter_client()
 
 # Content library - engaging tweets about Phi
 TWEETS = [